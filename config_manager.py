@@ -4,15 +4,22 @@
 """
 import json
 from pathlib import Path
-from typing import Dict
+from typing import Dict, List, Optional
+from hotkey import Hotkey
+from workspace import BINDING_TYPE_WORKSPACE
 from logger import Logger
 
 
 class ConfigManager:
+    # 打开快速启动面板的默认快捷键
+    DEFAULT_PALETTE_HOTKEY = "ctrl+alt+space"
+
     def __init__(self, config_file: str = "config.json"):
         self.config_file = Path(config_file)
         self.logger = Logger()
         self.config: Dict = {}
+        # 规范化快捷键 -> 配置文件中的原始写法
+        self._hotkey_keys: Dict[Hotkey, str] = {}
         self.default_config = {
             "hotkeys": {},
             "protection_level": "medium"
@@ -32,6 +39,17 @@ class ConfigManager:
         except Exception as e:
             self.logger.error(f"加载配置失败: {e}")
             self.config = self.default_config.copy()
+        self._index_hotkeys()
+
+    def _index_hotkeys(self):
+        """建立规范化快捷键到原始写法的索引"""
+        hotkeys = self.config.get("hotkeys", {})
+        self._hotkey_keys = {}
+        if isinstance(hotkeys, dict):
+            for text in hotkeys:
+                hotkey = Hotkey.try_parse(text)
+                if hotkey is not None:
+                    self._hotkey_keys[hotkey] = text
 
     def save(self):
         """保存配置文件"""
@@ -42,27 +60,211 @@ class ConfigManager:
         except Exception as e:
             self.logger.error(f"保存配置失败: {e}")
 
-    def get_hotkeys(self) -> Dict[str, str]:
-        """获取所有快捷键配置"""
+    def get_hotkeys(self) -> Dict[Hotkey, str]:
+        """获取所有单目标快捷键配置（快捷键 -> 目标路径）"""
+        return {hotkey: binding["path"] for hotkey, binding in self.get_bindings().items()
+                if "path" in binding}
+
+    def get_bindings(self) -> Dict[Hotkey, Dict]:
+        """
+        获取所有公共快捷键绑定（含选项，不属于任何方案，始终生效）
+        配置中的值可以是目标路径字符串、{"path": ..., 其他选项} 字典，
+        或 {"type": "workspace", "targets": [...]} 工作区字典；
+        键按规范化快捷键去重，写法不同但组合相同的只保留最后一个
+        """
         hotkeys = self.config.get("hotkeys", {})
         # 确保返回的是字典类型
         if not isinstance(hotkeys, dict):
             self.logger.warning(f"配置中的hotkeys不是字典类型: {type(hotkeys)}，返回空字典")
             return {}
-        return hotkeys
+        return self._parse_bindings(hotkeys)
+
+    def _parse_bindings(self, hotkeys: Dict, scope: str = "") -> Dict[Hotkey, Dict]:
+        """把配置中的 {快捷键写法: 值} 解析为 {规范化快捷键: 绑定字典}"""
+        bindings = {}
+        for text, value in hotkeys.items():
+            hotkey = Hotkey.try_parse(text)
+            if hotkey is None:
+                self.logger.warning(f"忽略{scope}无效的快捷键: {text}")
+                continue
+            if isinstance(value, str):
+                binding = {"path": value}
+            elif isinstance(value, dict) and isinstance(value.get("path"), str):
+                binding = dict(value)
+            elif (isinstance(value, dict) and value.get("type") == BINDING_TYPE_WORKSPACE
+                  and isinstance(value.get("targets"), list)):
+                binding = dict(value)
+            else:
+                self.logger.warning(f"忽略{scope}无效的快捷键配置: {text}")
+                continue
+            if hotkey in bindings:
+                self.logger.warning(f"{scope}快捷键重复，使用后出现的配置: {text}")
+            bindings[hotkey] = binding
+        return bindings
+
+    def get_profiles(self) -> Dict[str, Dict]:
+        """
+        获取绑定方案
+        配置格式: "profiles": {"工作": {"switch_hotkey": "ctrl+alt+1", "hotkeys": {...}}}
+        返回: 名称 -> {"bindings": {快捷键: 绑定字典}, "switch_hotkey": 快捷键或 None}
+        """
+        profiles = self.config.get("profiles", {})
+        if not isinstance(profiles, dict):
+            self.logger.warning(f"配置中的profiles不是字典类型: {type(profiles)}，忽略")
+            return {}
 
-    def add_hotkey(self, hotkey: str, program_path: str):
-        """添加快捷键"""
+        result = {}
+        for name, profile in profiles.items():
+            if not isinstance(profile, dict):
+                self.logger.warning(f"忽略无效的绑定方案: {name}")
+                continue
+            hotkeys = profile.get("hotkeys", {})
+            if not isinstance(hotkeys, dict):
+                self.logger.warning(f"方案 {name} 的hotkeys不是字典类型，按空方案处理")
+                hotkeys = {}
+            switch_text = profile.get("switch_hotkey")
+            switch_hotkey = Hotkey.try_parse(switch_text) if switch_text else None
+            if switch_text and switch_hotkey is None:
+                self.logger.warning(f"方案 {name} 的切换快捷键无效: {switch_text}")
+            result[str(name)] = {
+                "bindings": self._parse_bindings(hotkeys, f"方案 {name} 中"),
+                "switch_hotkey": switch_hotkey,
+            }
+        return result
+
+    def get_active_profile(self) -> str:
+        """获取上次使用的绑定方案名称（没有时为空字符串）"""
+        name = self.config.get("active_profile", "")
+        return name if isinstance(name, str) else ""
+
+    def set_active_profile(self, name: str):
+        """保存当前绑定方案"""
+        if self.config.get("active_profile", "") == name:
+            return
+        if name:
+            self.config["active_profile"] = name
+        else:
+            self.config.pop("active_profile", None)
+        self.save()
+
+    def get_palette_hotkey(self) -> Optional[Hotkey]:
+        """获取打开快速启动面板的快捷键（配置为空字符串时表示关闭，返回 None）"""
+        text = self.config.get("palette_hotkey", self.DEFAULT_PALETTE_HOTKEY)
+        if not text or not isinstance(text, str):
+            return None
+        hotkey = Hotkey.try_parse(text)
+        if hotkey is None:
+            self.logger.warning(f"快速启动快捷键无效: {text}")
+        return hotkey
+
+    def add_hotkey(self, hotkey, program_path: str, options: Dict = None):
+        """添加快捷键（没有额外选项时仍按字符串保存，兼容旧版本）"""
+        hotkey = Hotkey.parse(hotkey)
         if "hotkeys" not in self.config or not isinstance(self.config.get("hotkeys"), dict):
             self.config["hotkeys"] = {}
-        self.config["hotkeys"][hotkey] = program_path
+        # 同一组合的旧写法（如大写或不同顺序）先移除，避免重复
+        existing = self._hotkey_keys.get(hotkey)
+        if existing is not None:
+            self.config["hotkeys"].pop(existing, None)
+        options = {key: value for key, value in (options or {}).items() if value}
+        if options:
+            self.config["hotkeys"][str(hotkey)] = {"path": program_path, **options}
+        else:
+            self.config["hotkeys"][str(hotkey)] = program_path
+        self._hotkey_keys[hotkey] = str(hotkey)
         self.save()
 
-    def remove_hotkey(self, hotkey: str):
-        """移除快捷键"""
-        if "hotkeys" in self.config and hotkey in self.config["hotkeys"]:
-            del self.config["hotkeys"][hotkey]
+    def remove_hotkey(self, hotkey, profile: str = None):
+        """
+        移除快捷键
+        profile: 绑定所属的方案，为空时从公共绑定中移除；
+        不是普通绑定时再按方案切换快捷键、快速启动快捷键查找并移除
+        """
+        hotkey = Hotkey.try_parse(hotkey)
+        if hotkey is None:
+            return
+        if profile:
+            self._remove_profile_hotkey(hotkey, profile)
+            return
+        existing = self._hotkey_keys.pop(hotkey, None)
+        if existing is not None and isinstance(self.config.get("hotkeys"), dict):
+            self.config["hotkeys"].pop(existing, None)
+            self.save()
+            return
+
+        if self.get_palette_hotkey() == hotkey:
+            # 保存为空字符串，不再回落到默认快捷键
+            self.config["palette_hotkey"] = ""
             self.save()
+            return
+
+        profiles = self.config.get("profiles", {})
+        if not isinstance(profiles, dict):
+            return
+        for data in profiles.values():
+            if isinstance(data, dict) and Hotkey.try_parse(data.get("switch_hotkey") or "") == hotkey:
+                del data["switch_hotkey"]
+                self.save()
+                return
+
+    def _remove_profile_hotkey(self, hotkey: Hotkey, profile: str):
+        profiles = self.config.get("profiles")
+        data = profiles.get(profile) if isinstance(profiles, dict) else None
+        if not isinstance(data, dict) or not isinstance(data.get("hotkeys"), dict):
+            return
+        keys = [text for text in data["hotkeys"] if Hotkey.try_parse(text) == hotkey]
+        for text in keys:
+            del data["hotkeys"][text]
+        if keys:
+            self.save()
+
+    def get_update_mirrors(self) -> List[Dict]:
+        """获取额外的更新镜像列表"""
+        mirrors = self.config.get("update_mirrors", [])
+        if not isinstance(mirrors, list):
+            self.logger.warning(f"配置中的update_mirrors不是列表类型: {type(mirrors)}，忽略")
+            return []
+        return [m for m in mirrors if isinstance(m, dict)]
+
+    def get_prefetch_settings(self) -> Dict:
+        """获取后台预读设置"""
+        settings = self.config.get("prefetch", {})
+        if not isinstance(settings, dict):
+            self.logger.warning(f"配置中的prefetch不是字典类型: {type(settings)}，使用默认设置")
+            return {}
+        return settings
+
+    def get_target_index_settings(self) -> Dict:
+        """获取目标文件索引设置"""
+        settings = self.config.get("target_index", {})
+        if not isinstance(settings, dict):
+            self.logger.warning(f"配置中的target_index不是字典类型: {type(settings)}，使用默认设置")
+            return {}
+        return settings
+
+    def get_leak_watchdog_settings(self) -> Dict:
+        """获取泄漏监视设置"""
+        settings = self.config.get("leak_watchdog", {})
+        if not isinstance(settings, dict):
+            self.logger.warning(f"配置中的leak_watchdog不是字典类型: {type(settings)}，使用默认设置")
+            return {}
+        return settings
+
+    def get_hook_health_settings(self) -> Dict:
+        """获取键盘钩子监视设置"""
+        settings = self.config.get("hook_health", {})
+        if not isinstance(settings, dict):
+            self.logger.warning(f"配置中的hook_health不是字典类型: {type(settings)}，使用默认设置")
+            return {}
+        return settings
+
+    def get_launcher_helper_settings(self) -> Dict:
+        """获取启动器辅助进程设置（仅 Linux，默认关闭）"""
+        settings = self.config.get("launcher_helper", {})
+        if not isinstance(settings, dict):
+            self.logger.warning(f"配置中的launcher_helper不是字典类型: {type(settings)}，使用默认设置")
+            return {}
+        return settings
 
     def get_protection_level(self) -> str:
         """获取防护强度"""
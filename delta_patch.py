@@ -0,0 +1,287 @@
+"""
+增量补丁模块
+生成和流式应用 exe 二进制差分补丁
+"""
+import hashlib
+import struct
+import sys
+import zlib
+from itertools import accumulate
+from pathlib import Path
+from typing import BinaryIO, Dict, Optional
+
+# 补丁格式（整体经 zlib 压缩）:
+#   MAGIC
+#   'C' + offset(u64) + length(u32)   从旧文件复制
+#   'I' + length(u32) + data          插入新数据
+#   'E'                               结束
+MAGIC = b"PQSDIFF1"
+OP_COPY = b"C"
+OP_INSERT = b"I"
+OP_END = b"E"
+
+_COPY_STRUCT = struct.Struct("<QI")
+_LEN_STRUCT = struct.Struct("<I")
+
+DEFAULT_BLOCK_SIZE = 4096
+MAX_INSERT_SIZE = 1024 * 1024
+
+
+class PatchError(Exception):
+    """补丁格式错误或校验失败"""
+
+
+class DeltaPatcher:
+    """
+    流式补丁应用器
+
+    下载到的补丁数据分块调用 feed()，边解压边生成新文件，
+    不需要先把完整补丁落盘。finish() 时校验补丁和输出文件的 SHA256。
+    """
+
+    def __init__(self, old_file: BinaryIO, out_file: BinaryIO):
+        self._old = old_file
+        self._out = out_file
+        self._decompressor = zlib.decompressobj()
+        self._buffer = bytearray()
+        self._header_checked = False
+        self._ended = False
+        self._pending_insert = 0
+        self.patch_hash = hashlib.sha256()
+        self.output_hash = hashlib.sha256()
+        self.patch_bytes = 0
+        self.output_bytes = 0
+
+    def feed(self, chunk: bytes):
+        """输入一块原始（压缩的）补丁数据"""
+        # 结束标记之后仍可能收到 zlib 流尾部，照常哈希和解压
+        self.patch_hash.update(chunk)
+        self.patch_bytes += len(chunk)
+        try:
+            self._buffer += self._decompressor.decompress(chunk)
+        except zlib.error as e:
+            raise PatchError(f"补丁数据损坏: {e}") from e
+        if self._ended:
+            if self._buffer:
+                raise PatchError("补丁结束标记之后仍有数据")
+            return
+        self._process()
+
+    def finish(self, expected_patch_sha256: Optional[str] = None,
+               expected_output_sha256: Optional[str] = None,
+               expected_output_size: Optional[int] = None):
+        """补丁数据输入完毕，校验结果"""
+        try:
+            self._buffer += self._decompressor.flush()
+        except zlib.error as e:
+            raise PatchError(f"补丁数据损坏: {e}") from e
+        self._process()
+        if not self._ended:
+            raise PatchError("补丁数据不完整（缺少结束标记）")
+        if self._buffer or self._decompressor.unused_data:
+            raise PatchError("补丁结束标记之后仍有数据")
+
+        if expected_patch_sha256 and self.patch_hash.hexdigest() != expected_patch_sha256.lower():
+            raise PatchError("补丁文件 SHA256 校验失败")
+        if expected_output_size is not None and self.output_bytes != expected_output_size:
+            raise PatchError(f"输出文件大小不符: {self.output_bytes} != {expected_output_size}")
+        if expected_output_sha256 and self.output_hash.hexdigest() != expected_output_sha256.lower():
+            raise PatchError("输出文件 SHA256 校验失败")
+
+    def _write(self, data: bytes):
+        self._out.write(data)
+        self.output_hash.update(data)
+        self.output_bytes += len(data)
+
+    def _process(self):
+        buf = self._buffer
+        pos = 0
+
+        if not self._header_checked:
+            if len(buf) < len(MAGIC):
+                return
+            if bytes(buf[:len(MAGIC)]) != MAGIC:
+                raise PatchError("不是有效的补丁文件")
+            pos = len(MAGIC)
+            self._header_checked = True
+
+        while pos < len(buf) and not self._ended:
+            # 上一个插入操作的数据可能跨越多个数据块
+            if self._pending_insert:
+                take = min(self._pending_insert, len(buf) - pos)
+                self._write(bytes(buf[pos:pos + take]))
+                self._pending_insert -= take
+                pos += take
+                continue
+
+            op = bytes(buf[pos:pos + 1])
+            if op == OP_END:
+                self._ended = True
+                pos += 1
+            elif op == OP_COPY:
+                if len(buf) - pos - 1 < _COPY_STRUCT.size:
+                    break
+                offset, length = _COPY_STRUCT.unpack_from(buf, pos + 1)
+                pos += 1 + _COPY_STRUCT.size
+                self._copy_from_old(offset, length)
+            elif op == OP_INSERT:
+                if len(buf) - pos - 1 < _LEN_STRUCT.size:
+                    break
+                (length,) = _LEN_STRUCT.unpack_from(buf, pos + 1)
+                pos += 1 + _LEN_STRUCT.size
+                self._pending_insert = length
+            else:
+                raise PatchError(f"未知的补丁操作: {op!r}")
+
+        del buf[:pos]
+
+    def _copy_from_old(self, offset: int, length: int):
+        self._old.seek(offset)
+        remaining = length
+        while remaining > 0:
+            data = self._old.read(min(remaining, 1024 * 1024))
+            if not data:
+                raise PatchError(f"旧文件长度不足: 需要读取偏移 {offset} 起 {length} 字节")
+            self._write(data)
+            remaining -= len(data)
+
+
+_WEAK_MASK = 0xFFFF
+
+
+def _weak_checksum(block) -> tuple:
+    """rsync 式弱校验和 (a, b)：a 为字节和，b 为按位置加权的和，都取低 16 位"""
+    return sum(block) & _WEAK_MASK, sum(accumulate(block)) & _WEAK_MASK
+
+
+def _weak_key(a: int, b: int) -> int:
+    return a | (b << 16)
+
+
+def _match_length(old_data: bytes, new_data: bytes, old_pos: int, new_pos: int, block_size: int) -> int:
+    """从已匹配的一块起尽量向后延长匹配：先整块比较，再逐字节比较剩余部分"""
+    length = block_size
+    limit = min(len(new_data) - new_pos, len(old_data) - old_pos)
+    while (length + block_size <= limit and
+           new_data[new_pos + length:new_pos + length + block_size] ==
+           old_data[old_pos + length:old_pos + length + block_size]):
+        length += block_size
+    while length < limit and new_data[new_pos + length] == old_data[old_pos + length]:
+        length += 1
+    return length
+
+
+def create_patch(old_path: str, new_path: str, patch_path: str,
+                 block_size: int = DEFAULT_BLOCK_SIZE) -> Dict:
+    """
+    生成从 old_path 到 new_path 的补丁（发布时使用）
+
+    旧文件按块建立弱校验和索引；新文件上用滚动校验和逐字节滑动窗口，
+    每移动一个字节只做 O(1) 的更新，命中后再比较块内容确认。
+    未匹配的区间整段作为插入数据输出。
+
+    Returns:
+        补丁信息字典，可直接写入 version.json 的 patches 列表
+    """
+    old_data = Path(old_path).read_bytes()
+    new_data = Path(new_path).read_bytes()
+
+    # 旧文件按块建立索引：弱校验和 -> 偏移列表
+    index: Dict[int, list] = {}
+    for offset in range(0, len(old_data) - block_size + 1, block_size):
+        a, b = _weak_checksum(memoryview(old_data)[offset:offset + block_size])
+        index.setdefault(_weak_key(a, b), []).append(offset)
+
+    compressor = zlib.compressobj(9)
+    patch_hash = hashlib.sha256()
+    patch_size = 0
+
+    with open(patch_path, "wb") as out:
+        def emit(data: bytes):
+            nonlocal patch_size
+            compressed = compressor.compress(data)
+            if compressed:
+                out.write(compressed)
+                patch_hash.update(compressed)
+                patch_size += len(compressed)
+
+        def emit_insert(start: int, end: int):
+            for part_start in range(start, end, MAX_INSERT_SIZE):
+                part = new_data[part_start:min(end, part_start + MAX_INSERT_SIZE)]
+                emit(OP_INSERT + _LEN_STRUCT.pack(len(part)) + part)
+
+        def find_match(pos: int) -> int:
+            offsets = index.get(_weak_key(a, b))
+            if offsets:
+                block = new_data[pos:pos + block_size]
+                for candidate in offsets:
+                    if old_data[candidate:candidate + block_size] == block:
+                        return candidate
+            return -1
+
+        emit(MAGIC)
+        new_len = len(new_data)
+        last_window = new_len - block_size
+        literal_start = 0
+        pos = 0
+        view = memoryview(new_data)
+        while pos <= last_window:
+            a, b = _weak_checksum(view[pos:pos + block_size])
+            match_offset = find_match(pos)
+            if match_offset < 0:
+                # 滚动窗口直到命中或到达末尾
+                # 热循环：局部变量、内联的键计算
+                mask = _WEAK_MASK
+                for outgoing, incoming in zip(view[pos:last_window], view[pos + block_size:new_len]):
+                    a = (a - outgoing + incoming) & mask
+                    b = (b - block_size * outgoing + a) & mask
+                    pos += 1
+                    if a | (b << 16) in index:
+                        match_offset = find_match(pos)
+                        if match_offset >= 0:
+                            break
+            if match_offset < 0:
+                break
+
+            length = _match_length(old_data, new_data, match_offset, pos, block_size)
+            if literal_start < pos:
+                emit_insert(literal_start, pos)
+            emit(OP_COPY + _COPY_STRUCT.pack(match_offset, length))
+            pos += length
+            literal_start = pos
+
+        if literal_start < new_len:
+            emit_insert(literal_start, new_len)
+        emit(OP_END)
+
+        tail = compressor.flush()
+        out.write(tail)
+        patch_hash.update(tail)
+        patch_size += len(tail)
+
+    return {
+        "size": patch_size,
+        "sha256": patch_hash.hexdigest(),
+        "target_size": len(new_data),
+        "target_sha256": hashlib.sha256(new_data).hexdigest(),
+    }
+
+
+def file_sha256(path: str) -> str:
+    """计算文件 SHA256"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+if __name__ == "__main__":
+    # 发布时生成补丁: python delta_patch.py 旧版.exe 新版.exe 输出.patch
+    if len(sys.argv) != 4:
+        print("用法: python delta_patch.py <旧版exe> <新版exe> <输出补丁>")
+        sys.exit(1)
+    info = create_patch(sys.argv[1], sys.argv[2], sys.argv[3])
+    print(f"补丁大小: {info['size']} 字节")
+    print(f"补丁 SHA256: {info['sha256']}")
+    print(f"新版 SHA256: {info['target_sha256']}")
@@ -5,16 +5,27 @@ PyQt5 图形界面
 import os
 import sys
 from PyQt5.QtWidgets import (QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, 
-                             QLabel, QLineEdit, QPushButton, QTableWidget, 
-                             QTableWidgetItem, QFileDialog, QMessageBox, QHeaderView,
-                             QSystemTrayIcon, QMenu, QAction, QProgressDialog, QComboBox)
-from PyQt5.QtCore import Qt, QTimer, pyqtSignal, QThread, pyqtSignal as Signal
+                             QLabel, QLineEdit, QPushButton, QTableView,
+                             QAbstractItemView, QFileDialog, QMessageBox, QHeaderView,
+                             QSystemTrayIcon, QMenu, QAction, QProgressDialog, QComboBox,
+                             QCheckBox, QActionGroup, QCompleter)
+from PyQt5.QtCore import Qt, QEvent, QTimer, QStringListModel, pyqtSignal, QThread, pyqtSignal as Signal
 from PyQt5.QtGui import QKeySequence, QIcon, QPixmap
 from hotkey_manager import HotkeyManager
 from power_manager import PowerManager
 from config_manager import ConfigManager
 from logger import Logger
 from updater import Updater
+from resource_monitor import describe_groups, format_bytes
+from hotkey_table import (HotkeyTableModel, HotkeyFilterProxy, DeleteButtonDelegate,
+                          COLUMN_ACTION, COLUMN_HOTKEY, COLUMN_PATH, ROW_HEIGHT,
+                          MODE_FOCUS, MODE_LAUNCH, MODE_PALETTE, MODE_PROFILE, MODE_WORKSPACE)
+from workspace import BINDING_TYPE_WORKSPACE, Workspace
+from log_viewer import LogViewerDialog
+from launch_palette import LaunchPaletteDialog
+from target_index import TargetIndex
+from leak_watchdog import LeakWatchdog
+from hook_health import HOOK_LOST, HOOK_RECOVERED
 import keyboard as kb
 
 
@@ -142,6 +153,13 @@ class UpdateCheckThread(QThread):
 
 class HotkeyManagerQt(QMainWindow):
     """PyQt5 主窗口"""
+
+    # 后台更新检查在工作线程中回调，通过信号切回界面线程
+    background_update_found = Signal(dict)
+    # 绑定方案可能由快捷键在后台线程中切换
+    profile_switched = Signal(str)
+    # 快速启动快捷键在启动线程中触发，切回界面线程弹出面板
+    palette_requested = Signal()
     
     def __init__(self):
         super().__init__()
@@ -149,7 +167,11 @@ class HotkeyManagerQt(QMainWindow):
         self.power_manager = PowerManager()
         self.config_manager = ConfigManager()
         self.logger = Logger()
-        self.updater = Updater()
+        self.updater = Updater(mirrors=self.config_manager.get_update_mirrors())
+        # 可启动文件的后台索引，用于路径输入框的补全
+        self.target_index = TargetIndex(settings=self.config_manager.get_target_index_settings())
+        # 长时间驻留时定期检查自身的内存、线程和句柄是否持续增长
+        self.leak_watchdog = LeakWatchdog(self.config_manager.get_leak_watchdog_settings())
         self.is_monitoring = False
         self.sleep_prevention_enabled = False  # 防休眠独立状态
         
@@ -162,21 +184,39 @@ class HotkeyManagerQt(QMainWindow):
             self.setWindowIcon(QIcon(icon_file))
 
         self._is_quitting = False
+        # 为安装更新而退出时保留防休眠状态，重启后恢复
+        self._restarting_for_update = False
         self.tray_icon = None
         self.tray_menu = None
         self.tray_action_toggle = None
         self.tray_action_quit = None
+        self.tray_profile_menu = None
+        self.tray_profile_group = None
+        # 表格中来自当前方案的快捷键
+        self._profile_row_keys = set()
+        self.log_viewer = None
+        self.launch_palette = None
         
         self.init_ui()
         self.init_tray()
+        self.profile_switched.connect(self.on_profile_switched)
+        self.palette_requested.connect(self.show_launch_palette)
+        self.hotkey_manager.on_palette_requested = self.palette_requested.emit
         self.load_config()
+        self.restore_session()
+        self.target_index.start()
+        self.leak_watchdog.start()
         
         # 定时更新状态
+        self._status_ticks = 0
+        self._prefetch_latency_lines = []
         self.timer = QTimer()
         self.timer.timeout.connect(self.update_status)
         self.timer.start(2000)
         
-        # 不再自动检查更新，改为用户手动点击
+        # 后台定时检查更新（带缓存和退避），只在托盘提示，不弹窗打扰
+        self.background_update_found.connect(self._on_background_update_found)
+        self.updater.start_background_checks(self.background_update_found.emit)
 
     def build_stylesheet(self):
         return """
@@ -234,6 +274,10 @@ class HotkeyManagerQt(QMainWindow):
                 font-weight: 600;
                 color: #0F172A;
             }
+            QLabel[role="statDetail"] {
+                font-size: 12px;
+                color: #64748B;
+            }
             QLabel[role="statValue"][state="on"] {
                 color: #10B981;
             }
@@ -257,6 +301,9 @@ class HotkeyManagerQt(QMainWindow):
             QLabel[role="statusDot"][state="stopped"] {
                 color: #EF4444;
             }
+            QLabel[role="statusDot"][state="degraded"] {
+                color: #F59E0B;
+            }
             QLabel[role="statusText"] {
                 font-weight: 600;
                 font-size: 14px;
@@ -267,6 +314,9 @@ class HotkeyManagerQt(QMainWindow):
             QLabel[role="statusText"][state="stopped"] {
                 color: #475569;
             }
+            QLabel[role="statusText"][state="degraded"] {
+                color: #B45309;
+            }
             QLineEdit {
                 background-color: #FFFFFF;
                 border: 1px solid #E2E8F0;
@@ -393,7 +443,7 @@ class HotkeyManagerQt(QMainWindow):
                 color: #475569;
                 border-color: #CBD5E1;
             }
-            QTableWidget {
+            QTableView {
                 background-color: #FFFFFF;
                 border: 1px solid #E2E8F0;
                 border-radius: 12px;
@@ -401,13 +451,13 @@ class HotkeyManagerQt(QMainWindow):
                 color: #334155;
                 font-size: 14px;
             }
-            QTableWidget::item {
+            QTableView::item {
                 padding: 16px 12px;
                 border: none;
                 border-bottom: 1px solid #F1F5F9;
                 background-color: #FFFFFF;
             }
-            QTableWidget::item:selected {
+            QTableView::item:selected {
                 background-color: #F8FAFC;
             }
             QTableCornerButton::section {
@@ -470,6 +520,9 @@ class HotkeyManagerQt(QMainWindow):
         tray_action_toggle.triggered.connect(self.toggle_window_visibility)
         tray_menu.addAction(tray_action_toggle)
 
+        tray_profile_menu = tray_menu.addMenu("绑定方案")
+        tray_profile_menu.menuAction().setVisible(False)
+
         tray_action_quit = QAction("退出任务", self)
         tray_action_quit.triggered.connect(self.exit_app)
         tray_menu.addAction(tray_action_quit)
@@ -483,6 +536,68 @@ class HotkeyManagerQt(QMainWindow):
         self.tray_menu = tray_menu
         self.tray_action_toggle = tray_action_toggle
         self.tray_action_quit = tray_action_quit
+        self.tray_profile_menu = tray_profile_menu
+
+    def rebuild_profile_menu(self):
+        """按配置中的方案重建托盘的"绑定方案"子菜单"""
+        if self.tray_profile_menu is None:
+            return
+        self.tray_profile_menu.clear()
+        names = list(self.hotkey_manager.profiles)
+        self.tray_profile_menu.menuAction().setVisible(bool(names))
+        group = QActionGroup(self)
+        group.setExclusive(True)
+        for name in [""] + names:
+            action = QAction(name or "无（仅公共绑定）", self, checkable=True)
+            action.setData(name)
+            action.setChecked(name == self.hotkey_manager.active_profile)
+            action.triggered.connect(lambda checked, n=name: self.switch_profile(n))
+            group.addAction(action)
+            self.tray_profile_menu.addAction(action)
+        self.tray_profile_group = group
+
+    def switch_profile(self, name):
+        """从托盘切换绑定方案"""
+        success, msg = self.hotkey_manager.switch_profile(name)
+        if not success:
+            QMessageBox.warning(self, "切换失败", msg)
+
+    def on_profile_switched(self, name):
+        """方案切换后（界面线程）：只增删差异行，保存当前方案并同步托盘勾选"""
+        rows = self.profile_rows()
+        keys = {row[0] for row in rows}
+        self.table_model.remove_hotkeys(self._profile_row_keys - keys)
+        for hotkey, path, mode in rows:
+            self.table_model.add_binding(hotkey, path, mode)
+        self._profile_row_keys = keys
+        self.hotkey_count_label.setText(str(self.table_model.rowCount()))
+
+        self.config_manager.set_active_profile(name)
+        if self.tray_profile_group is not None:
+            for action in self.tray_profile_group.actions():
+                action.setChecked(action.data() == name)
+        if self.tray_icon is not None:
+            self.tray_icon.setToolTip(f"快捷键启动工具 - 方案: {name}" if name else "快捷键启动工具")
+            if not self.isVisible():
+                self.tray_icon.showMessage("绑定方案", f"已切换到: {name or '无（仅公共绑定）'}",
+                                           QSystemTrayIcon.Information, 2000)
+
+    def profile_rows(self) -> list:
+        """当前方案中已生效的绑定对应的表格行"""
+        manager = self.hotkey_manager
+        rows = []
+        for hotkey in manager.active_profile_hotkeys():
+            path = manager.describe_binding(hotkey)
+            if path is None:
+                continue
+            if hotkey in manager.workspaces:
+                mode = MODE_WORKSPACE
+            elif manager.binding_options.get(hotkey, {}).get('focus_existing'):
+                mode = MODE_FOCUS
+            else:
+                mode = MODE_LAUNCH
+            rows.append((hotkey, path, mode))
+        return rows
 
     def update_tray_menu_text(self):
         if self.tray_action_toggle is None:
@@ -509,22 +624,33 @@ class HotkeyManagerQt(QMainWindow):
         """完全退出应用程序"""
         self._is_quitting = True
         self.logger.info("用户退出应用程序")
-        
-        # 停止快捷键监听
-        if self.is_monitoring:
-            try:
-                self.hotkey_manager.stop()
-                self.logger.info("已停止快捷键监听")
-            except Exception as e:
-                self.logger.error(f"停止快捷键监听失败: {e}")
+
+        self.updater.stop_background_checks()
         
         # 关闭防休眠
         if self.sleep_prevention_enabled:
             try:
                 self.power_manager.allow_sleep()
                 self.logger.info("已关闭防休眠")
+                if not self._restarting_for_update:
+                    self.hotkey_manager.state_journal.record_keep_awake(False)
             except Exception as e:
                 self.logger.error(f"关闭防休眠失败: {e}")
+
+        # 停止快捷键监听，关闭启动线程池，写完尚未落盘的启动历史和状态日志
+        try:
+            self.hotkey_manager.shutdown()
+            self.logger.info("已停止快捷键监听")
+        except Exception as e:
+            self.logger.error(f"停止快捷键监听失败: {e}")
+
+        # 释放日志文件映射
+        if self.log_viewer is not None:
+            self.log_viewer.shutdown()
+        if self.launch_palette is not None:
+            self.launch_palette.close()
+        self.target_index.stop()
+        self.leak_watchdog.stop()
         
         # 隐藏托盘图标
         if self.tray_icon is not None:
@@ -540,8 +666,8 @@ class HotkeyManagerQt(QMainWindow):
         import sys
         sys.exit(0)
     
-    def create_stat_card(self, title, value, bg_color, icon_color):
-        """创建统计卡片"""
+    def create_stat_card(self, title, value, bg_color, icon_color, detail=None):
+        """创建统计卡片（detail 不为 None 时在数值下方显示一行说明）"""
         card = QWidget()
         card.setProperty("role", "card")
         card.setMinimumHeight(100)
@@ -561,6 +687,13 @@ class HotkeyManagerQt(QMainWindow):
         value_label.setObjectName("value_label")
         value_label.setProperty("role", "statValue")
         text_layout.addWidget(value_label)
+
+        if detail is not None:
+            detail_label = QLabel(detail)
+            detail_label.setObjectName("detail_label")
+            detail_label.setProperty("role", "statDetail")
+            text_layout.addWidget(detail_label)
+            self.refresh_widget_style(detail_label)
         
         card_layout.addLayout(text_layout)
         card_layout.addStretch()
@@ -628,6 +761,7 @@ class HotkeyManagerQt(QMainWindow):
         
         # 状态指示器
         status_container = QWidget()
+        self.status_container = status_container
         status_container.setProperty("role", "chip")
         status_layout = QHBoxLayout(status_container)
         status_layout.setContentsMargins(8, 6, 8, 6)
@@ -719,15 +853,19 @@ class HotkeyManagerQt(QMainWindow):
         # 卡片1: 配置快捷键
         card1 = self.create_stat_card("配置快捷键", "0", "#DBEAFE", "#3B82F6")
         self.hotkey_count_label = card1.findChild(QLabel, "value_label")
+        self.hotkey_card = card1
         stats_layout.addWidget(card1)
         
         # 卡片2: 运行中程序
-        card2 = self.create_stat_card("运行中程序", "0", "#D1FAE5", "#10B981")
+        card2 = self.create_stat_card("运行中程序", "0", "#D1FAE5", "#10B981", detail="CPU 0%  内存 0 MB")
         self.process_count_label = card2.findChild(QLabel, "value_label")
+        self.process_usage_label = card2.findChild(QLabel, "detail_label")
+        self.process_card = card2
         stats_layout.addWidget(card2)
         
         # 卡片3: 防休眠状态
         card3 = self.create_stat_card("防休眠状态", "关闭", "#FED7AA", "#F97316")
+        self.sleep_card = card3
         self.sleep_status_label = card3.findChild(QLabel, "value_label")
         self.sleep_status_label.setProperty("state", "off")
         stats_layout.addWidget(card3)
@@ -775,6 +913,13 @@ class HotkeyManagerQt(QMainWindow):
         self.path_input = QLineEdit()
         self.path_input.setPlaceholderText("程序路径、网页URL、文件夹路径...")
         self.path_input.setMinimumHeight(44)
+        # 输入名称即可从目标索引中查找（补全列表由查询结果直接给出，不再按前缀过滤）
+        self.path_completion_model = QStringListModel(self)
+        path_completer = QCompleter(self.path_completion_model, self)
+        path_completer.setCompletionMode(QCompleter.UnfilteredPopupCompletion)
+        path_completer.setMaxVisibleItems(12)
+        self.path_input.setCompleter(path_completer)
+        self.path_input.textEdited.connect(self.update_path_completions)
         path_layout.addWidget(self.path_input)
         
         browse_file_btn = QPushButton("📁 浏览文件")
@@ -794,6 +939,11 @@ class HotkeyManagerQt(QMainWindow):
         path_layout.addWidget(browse_folder_btn)
         
         add_layout.addLayout(path_layout)
+
+        # 启动方式
+        self.focus_existing_checkbox = QCheckBox("程序已运行时切换到其窗口，不重复启动")
+        self.focus_existing_checkbox.setToolTip("适合 IDE 等大型程序：再次按下快捷键只激活已打开的窗口（找不到可激活的窗口时照常启动）")
+        add_layout.addWidget(self.focus_existing_checkbox)
         
         # 操作按钮
         btn_layout = QHBoxLayout()
@@ -819,18 +969,44 @@ class HotkeyManagerQt(QMainWindow):
         main_layout.addWidget(add_container)
         
         # 快捷键列表
+        list_header_layout = QHBoxLayout()
         list_label = QLabel("快捷键列表")
         list_label.setProperty("role", "sectionTitle")
-        main_layout.addWidget(list_label)
-        
-        self.table = QTableWidget()
-        self.table.setColumnCount(3)
-        self.table.setHorizontalHeaderLabels(["快捷键", "目标路径", "操作"])
-        self.table.horizontalHeader().setSectionResizeMode(1, QHeaderView.Stretch)
-        self.table.setSelectionBehavior(QTableWidget.SelectRows)
+        list_header_layout.addWidget(list_label)
+        list_header_layout.addStretch()
+
+        self.search_input = QLineEdit()
+        self.search_input.setPlaceholderText("搜索快捷键或路径")
+        self.search_input.setClearButtonEnabled(True)
+        self.search_input.setMaximumWidth(280)
+        list_header_layout.addWidget(self.search_input)
+        main_layout.addLayout(list_header_layout)
+        
+        # 模型 / 视图：数据只存一份，删除按钮由委托绘制
+        self.table_model = HotkeyTableModel(self)
+        self.table_proxy = HotkeyFilterProxy(self)
+        self.table_proxy.setSourceModel(self.table_model)
+        self.search_input.textChanged.connect(self.table_proxy.set_search_text)
+
+        self.table = QTableView()
+        self.table.setModel(self.table_proxy)
+        self.table.horizontalHeader().setSectionResizeMode(COLUMN_PATH, QHeaderView.Stretch)
+        self.table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.table.setEditTriggers(QAbstractItemView.NoEditTriggers)
         self.table.setShowGrid(False)
+        self.table.setWordWrap(False)
         self.table.verticalHeader().setVisible(False)
+        # 固定行高，避免按内容逐行计算尺寸
+        self.table.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+        self.table.verticalHeader().setDefaultSectionSize(ROW_HEIGHT)
         self.table.setAlternatingRowColors(False)
+        self.table.setMouseTracking(True)
+        self.table.setSortingEnabled(True)
+        self.table.sortByColumn(-1, Qt.AscendingOrder)
+
+        self.delete_delegate = DeleteButtonDelegate(self.table)
+        self.delete_delegate.delete_requested.connect(self.delete_hotkey)
+        self.table.setItemDelegateForColumn(COLUMN_ACTION, self.delete_delegate)
         main_layout.addWidget(self.table)
         
         # 底部信息栏
@@ -849,6 +1025,25 @@ class HotkeyManagerQt(QMainWindow):
         footer_layout.addWidget(version_label)
         
         footer_layout.addStretch()
+
+        # 运行日志按钮
+        log_btn = QPushButton("运行日志")
+        log_btn.clicked.connect(self.show_log_viewer)
+        log_btn.setCursor(Qt.PointingHandCursor)
+        log_btn.setStyleSheet("""
+            QPushButton {
+                color: #3B82F6;
+                font-size: 12px;
+                background-color: transparent;
+                border: none;
+                text-decoration: underline;
+                padding: 0px 12px 0px 0px;
+            }
+            QPushButton:hover {
+                color: #2563EB;
+            }
+        """)
+        footer_layout.addWidget(log_btn)
         
         # 发布者信息按钮
         publisher_btn = QPushButton("发布者信息")
@@ -873,10 +1068,53 @@ class HotkeyManagerQt(QMainWindow):
         
     def load_config(self):
         """加载配置"""
-        hotkeys = self.config_manager.get_hotkeys()
-        for hotkey, path in hotkeys.items():
-            self.hotkey_manager.add_hotkey(hotkey, path)
-            self.add_table_row(hotkey, path)
+        bindings = self.config_manager.get_bindings()
+        rows = []
+        for hotkey, binding in bindings.items():
+            if binding.get("type") == BINDING_TYPE_WORKSPACE:
+                try:
+                    workspace = Workspace.from_config(binding)
+                except ValueError as e:
+                    self.logger.error(f"工作区配置无效 {hotkey}: {e}")
+                    continue
+                self.hotkey_manager.add_workspace(hotkey, workspace, binding.get("cooldown_ms"))
+                rows.append((hotkey, workspace.describe(), MODE_WORKSPACE))
+                continue
+            path = binding["path"]
+            focus_existing = bool(binding.get("focus_existing"))
+            self.hotkey_manager.add_hotkey(hotkey, path, focus_existing, binding.get("cooldown_ms"))
+            rows.append((hotkey, path, MODE_FOCUS if focus_existing else MODE_LAUNCH))
+
+        # 绑定方案：只有当前方案的绑定会注册，切换快捷键始终注册
+        profiles = self.config_manager.get_profiles()
+        self.hotkey_manager.on_profile_switched = None
+        self.hotkey_manager.set_profiles(profiles)
+        active = self.config_manager.get_active_profile()
+        if active in profiles:
+            self.hotkey_manager.switch_profile(active)
+        self.hotkey_manager.on_profile_switched = self.profile_switched.emit
+        for name, profile in profiles.items():
+            if profile["switch_hotkey"] in self.hotkey_manager.binding_options:
+                rows.append((profile["switch_hotkey"], f"切换到方案: {name}", MODE_PROFILE))
+        profile_rows = self.profile_rows()
+        self._profile_row_keys = {row[0] for row in profile_rows}
+        rows.extend(profile_rows)
+        self.rebuild_profile_menu()
+
+        # 快速启动面板快捷键（与已有绑定冲突时不生效）
+        palette_hotkey = self.config_manager.get_palette_hotkey()
+        if palette_hotkey is not None:
+            success, _ = self.hotkey_manager.add_palette_hotkey(palette_hotkey)
+            if success:
+                rows.append((palette_hotkey, "打开快速启动面板", MODE_PALETTE))
+
+        # 一次性填充表格，只触发一次模型重置
+        self.table_model.set_bindings(rows)
+        
+        # 加载后台预读设置
+        self.hotkey_manager.prefetcher.apply_settings(self.config_manager.get_prefetch_settings())
+        self.hotkey_manager.hook_health.apply_settings(self.config_manager.get_hook_health_settings())
+        self.hotkey_manager.apply_launcher_settings(self.config_manager.get_launcher_helper_settings())
         
         # 加载防护强度（默认使用custom）
         protection_level = self.config_manager.get_protection_level()
@@ -887,38 +1125,35 @@ class HotkeyManagerQt(QMainWindow):
         self.power_manager.set_protection_level(protection_level)
         self.logger.info(f"已加载防护强度配置: {protection_level}")
     
-    def add_table_row(self, hotkey, path):
+    def restore_session(self):
+        """恢复崩溃或更新重启前的绑定方案和防休眠状态（来自状态日志）"""
+        state = self.hotkey_manager.restored_state
+        profile = state.get("profile")
+        if (profile and profile in self.hotkey_manager.profiles
+                and profile != self.hotkey_manager.active_profile):
+            self.hotkey_manager.switch_profile(profile)
+        if state.get("keep_awake") and not self.sleep_prevention_enabled:
+            self.logger.info("恢复重启前的防休眠状态")
+            self.toggle_sleep_prevention()
+
+    def add_table_row(self, hotkey, path, focus_existing=False):
         """添加表格行"""
-        row = self.table.rowCount()
-        self.table.insertRow(row)
-        self.table.setRowHeight(row, 60)  # 设置行高
-        
-        hotkey_item = QTableWidgetItem(hotkey)
-        # 设置快捷键列为大写加粗
-        from PyQt5.QtGui import QFont
-        font = QFont()
-        font.setBold(True)
-        hotkey_item.setFont(font)
-        self.table.setItem(row, 0, hotkey_item)
-        
-        path_item = QTableWidgetItem(path)
-        self.table.setItem(row, 1, path_item)
-        
-        delete_btn = QPushButton("删除")
-        delete_btn.clicked.connect(lambda: self.delete_row(row))
-        delete_btn.setMinimumHeight(36)
-        delete_btn.setProperty("variant", "danger")
-        delete_btn.setProperty("size", "sm")
-        self.table.setCellWidget(row, 2, delete_btn)
+        self.table_model.add_binding(hotkey, path, MODE_FOCUS if focus_existing else MODE_LAUNCH)
     
     def add_hotkey(self):
         """添加快捷键"""
         hotkey = self.hotkey_input.text().strip()
         path = self.path_input.text().strip()
+        focus_existing = self.focus_existing_checkbox.isChecked()
         
         if not hotkey or not path:
             QMessageBox.warning(self, "输入不完整", "请填写快捷键和目标路径")
             return
+
+        profile = self.hotkey_manager.binding_profile(hotkey)
+        if profile:
+            QMessageBox.warning(self, "快捷键冲突", f"'{hotkey}' 属于当前方案 {profile}，请先删除后再添加")
+            return
         
         # 检查冲突
         has_conflict, conflict_msg = self.hotkey_manager.check_system_conflict(hotkey)
@@ -931,10 +1166,10 @@ class HotkeyManagerQt(QMainWindow):
             if reply == QMessageBox.No:
                 return
         
-        success, msg = self.hotkey_manager.add_hotkey(hotkey, path)
+        success, msg = self.hotkey_manager.add_hotkey(hotkey, path, focus_existing)
         if success:
-            self.config_manager.add_hotkey(hotkey, path)
-            self.add_table_row(hotkey, path)
+            self.config_manager.add_hotkey(hotkey, path, {"focus_existing": focus_existing})
+            self.add_table_row(hotkey, path, focus_existing)
             
             if self.is_monitoring:
                 self.hotkey_manager.stop()
@@ -944,6 +1179,7 @@ class HotkeyManagerQt(QMainWindow):
             
             self.hotkey_input.clear()
             self.path_input.clear()
+            self.focus_existing_checkbox.setChecked(False)
             
             if has_conflict:
                 QMessageBox.information(self, "添加成功（有警告）", f"快捷键 '{hotkey}' 已添加\n\n警告: {conflict_msg}")
@@ -953,35 +1189,53 @@ class HotkeyManagerQt(QMainWindow):
         else:
             QMessageBox.critical(self, "失败", msg)
     
-    def delete_row(self, row):
-        """删除指定行"""
-        hotkey = self.table.item(row, 0).text()
+    def delete_hotkey(self, hotkey):
+        """删除指定快捷键"""
         reply = QMessageBox.question(self, "确认删除", 
-                                     f"确定要删除快捷键 '{hotkey}' 吗？",
+                                     f"确定要删除快捷键 '{hotkey.display()}' 吗？",
                                      QMessageBox.Yes | QMessageBox.No)
         if reply == QMessageBox.Yes:
-            self.hotkey_manager.remove_hotkey(hotkey)
-            self.config_manager.remove_hotkey(hotkey)
-            self.table.removeRow(row)
+            self.remove_binding(hotkey)
+            self.table_model.remove_hotkeys([hotkey])
             self.logger.info(f"删除快捷键: {hotkey}")
     
     def delete_selected(self):
         """删除选中的行"""
-        selected_rows = set(item.row() for item in self.table.selectedItems())
-        if not selected_rows:
+        hotkeys = [
+            self.table_model.hotkey_at(self.table_proxy.mapToSource(index).row())
+            for index in self.table.selectionModel().selectedRows(COLUMN_HOTKEY)
+        ]
+        hotkeys = [hotkey for hotkey in hotkeys if hotkey]
+        if not hotkeys:
             QMessageBox.warning(self, "未选择", "请先选择要删除的快捷键")
             return
         
         reply = QMessageBox.question(self, "确认删除",
-                                     f"确定要删除选中的 {len(selected_rows)} 个快捷键吗？",
+                                     f"确定要删除选中的 {len(hotkeys)} 个快捷键吗？",
                                      QMessageBox.Yes | QMessageBox.No)
         if reply == QMessageBox.Yes:
-            for row in sorted(selected_rows, reverse=True):
-                hotkey = self.table.item(row, 0).text()
-                self.hotkey_manager.remove_hotkey(hotkey)
-                self.config_manager.remove_hotkey(hotkey)
-                self.table.removeRow(row)
+            for hotkey in hotkeys:
+                self.remove_binding(hotkey)
+            self.table_model.remove_hotkeys(hotkeys)
+
+    def remove_binding(self, hotkey):
+        """从监听和配置中移除绑定（公共绑定、当前方案的绑定或切换快捷键）"""
+        profile = self.hotkey_manager.binding_profile(hotkey)
+        self.hotkey_manager.remove_hotkey(hotkey)
+        self.config_manager.remove_hotkey(hotkey, profile)
+        self._profile_row_keys.discard(hotkey)
     
+    def update_path_completions(self, text):
+        """按输入的关键词查找可启动目标（输入的是路径或网址时不查找）"""
+        text = text.strip()
+        if len(text) < 2 or '\\' in text or '/' in text or text.startswith('www.'):
+            self.path_completion_model.setStringList([])
+            return
+        paths = [path for path, _ in self.target_index.search(text)]
+        self.path_completion_model.setStringList(paths)
+        if paths:
+            self.path_input.completer().complete()
+
     def browse_file(self):
         """浏览文件"""
         filename, _ = QFileDialog.getOpenFileName(self, "选择文件", "", "所有文件 (*.*)")
@@ -998,6 +1252,7 @@ class HotkeyManagerQt(QMainWindow):
         """清空输入"""
         self.hotkey_input.clear()
         self.path_input.clear()
+        self.focus_existing_checkbox.setChecked(False)
     
     def toggle_sleep_prevention(self):
         """切换防休眠状态"""
@@ -1022,6 +1277,7 @@ class HotkeyManagerQt(QMainWindow):
             self.sleep_status_label.setText("开启")
             self.sleep_status_label.setProperty("state", "on")
             self.refresh_widget_style(self.sleep_status_label)
+            self.hotkey_manager.state_journal.record_keep_awake(True)
             self.logger.info("手动开启防休眠")
         else:
             ok = self.power_manager.allow_sleep()
@@ -1042,6 +1298,7 @@ class HotkeyManagerQt(QMainWindow):
             self.sleep_status_label.setText("关闭")
             self.sleep_status_label.setProperty("state", "off")
             self.refresh_widget_style(self.sleep_status_label)
+            self.hotkey_manager.state_journal.record_keep_awake(False)
             self.logger.info("手动关闭防休眠")
     
     def on_protection_level_changed(self, index):
@@ -1080,7 +1337,7 @@ class HotkeyManagerQt(QMainWindow):
             return
         
         # 执行一次防护刷新
-        self.power_manager._simulate_key_press()
+        self.power_manager._simulate_key_press(probe=True)
         
         # 检查锁屏状态
         is_locked = self.power_manager.check_lock_state()
@@ -1107,7 +1364,7 @@ class HotkeyManagerQt(QMainWindow):
     def toggle_monitoring(self):
         """切换监听状态"""
         if not self.is_monitoring:
-            if len(self.config_manager.get_hotkeys()) == 0:
+            if len(self.hotkey_manager.binding_options) == 0:
                 QMessageBox.warning(self, "无快捷键", "请先添加至少一个快捷键")
                 return
             
@@ -1158,13 +1415,118 @@ class HotkeyManagerQt(QMainWindow):
         """更新状态"""
         count = self.hotkey_manager.get_running_count()
         self.process_count_label.setText(str(count))
+        self.update_resource_usage()
+        self.update_hook_health()
+        self.sleep_card.setToolTip("\n".join(self.power_manager.get_keep_awake_statistics())
+                                   or "防锁屏刷新尚未执行")
         
         # 更新快捷键数量
-        hotkey_count = len(self.config_manager.get_hotkeys())
+        hotkey_count = self.table_model.rowCount()
         self.hotkey_count_label.setText(str(hotkey_count))
+
+        # 重复触发统计
+        trigger_stats = self.hotkey_manager.get_trigger_stats()
+        self.hotkey_card.setToolTip(
+            f"已执行 {trigger_stats['accepted']} 次\n"
+            f"并入进行中的启动 {trigger_stats['coalesced']} 次\n"
+            f"冷却期内忽略 {trigger_stats['cooldown']} 次"
+            + "".join(f"\n{line}" for line in self._prefetch_latency_lines)
+        )
+
+        # 启动耗时统计查询数据库，降低刷新频率（每 30 秒）
+        if self._status_ticks % 15 == 0:
+            self.update_launch_latency()
+        self._status_ticks += 1
         
         # 防休眠状态由用户手动控制，不再自动切换
     
+    def update_hook_health(self):
+        """监听状态旁显示键盘钩子健康状况，悬停查看钩子处理耗时分布和自动恢复记录"""
+        health = self.hotkey_manager.hook_health
+        self.status_container.setToolTip("\n".join(health.describe()))
+        if not self.is_monitoring:
+            return
+        if health.status == HOOK_LOST:
+            text, state = "钩子失效", "degraded"
+        elif health.status == HOOK_RECOVERED:
+            text, state = "运行中（已自动恢复）", "running"
+        else:
+            text, state = "运行中", "running"
+        if self.status_label.text() != text or self.status_label.property("state") != state:
+            self.status_label.setText(text)
+            self.status_label.setProperty("state", state)
+            self.status_indicator.setProperty("state", state)
+            self.refresh_widget_style(self.status_label)
+            self.refresh_widget_style(self.status_indicator)
+
+    def update_resource_usage(self):
+        """显示被跟踪程序组的资源占用汇总，悬停查看各程序明细"""
+        monitor = self.hotkey_manager.resource_monitor
+        snapshot = monitor.snapshot()
+        total = snapshot['total']
+        self.process_usage_label.setText(
+            f"CPU {total['cpu_percent']:.0f}%  内存 {format_bytes(total['rss'])}  线程 {total['threads']}"
+        )
+        lines = describe_groups(snapshot) or ["暂无运行中的程序"]
+        lines.append("")
+        lines.append(
+            f"采样间隔 {snapshot['interval']:.1f} 秒，单次耗时 {snapshot['avg_cost_ms']:.1f} ms，"
+            f"累计 CPU {snapshot['total_cost_cpu_seconds']:.2f} 秒（{snapshot['sample_count']} 次）"
+        )
+        if monitor.paused:
+            lines.append("窗口隐藏时暂停采样")
+        own = self.leak_watchdog.status()
+        if own['latest'] is not None:
+            latest = own['latest']
+            lines.append(f"本程序: 内存 {format_bytes(latest['rss'])}，线程 {latest['threads']}，"
+                         f"句柄 {latest['handles']}")
+            if own['growing']:
+                lines.append("⚠ 检测到持续增长，详见运行日志")
+        self.process_card.setToolTip("\n".join(lines))
+
+    def showEvent(self, event):
+        """窗口显示时恢复资源采样"""
+        super().showEvent(event)
+        self.hotkey_manager.resource_monitor.set_paused(False)
+
+    def hideEvent(self, event):
+        """窗口隐藏时暂停资源采样"""
+        super().hideEvent(event)
+        self.hotkey_manager.resource_monitor.set_paused(True)
+
+    def changeEvent(self, event):
+        """最小化时同样暂停资源采样"""
+        super().changeEvent(event)
+        if event.type() == QEvent.WindowStateChange:
+            self.hotkey_manager.resource_monitor.set_paused(self.isMinimized())
+
+    def update_launch_latency(self):
+        """刷新列表中各目标的启动耗时百分位"""
+        history = self.hotkey_manager.launch_history
+        self.table_model.set_latency(history.percentiles_by_target())
+        # 预读效果：触发时已预读 / 未预读的程序启动耗时对比
+        by_prefetch = history.percentiles_by_prefetch()
+        self._prefetch_latency_lines = [
+            f"{'已预读' if prefetched else '未预读'}启动 p50 {stats[50]:.0f} ms / p95 {stats[95]:.0f} ms"
+            f"（{stats['count']} 次）"
+            for prefetched, stats in sorted(by_prefetch.items(), reverse=True)
+        ]
+
+    def show_log_viewer(self):
+        """打开日志面板（只创建一次，关闭后再打开继续使用已有索引）"""
+        if self.log_viewer is None:
+            self.log_viewer = LogViewerDialog(self)
+        self.log_viewer.show()
+        self.log_viewer.raise_()
+        self.log_viewer.activateWindow()
+
+    def show_launch_palette(self):
+        """弹出快速启动面板（只创建一次）"""
+        if self.launch_palette is None:
+            self.launch_palette = LaunchPaletteDialog(self.hotkey_manager.search_palette,
+                                                      self.hotkey_manager.launch_from_palette)
+        self.launch_palette.popup()
+
     def show_publisher_info(self):
         """显示发布者信息"""
         from PyQt5.QtWidgets import QDialog, QVBoxLayout, QHBoxLayout, QLabel, QPushButton
@@ -1359,6 +1721,18 @@ class HotkeyManagerQt(QMainWindow):
         if reply == QMessageBox.Yes:
             self._download_and_install(version_info)
     
+    def _on_background_update_found(self, version_info: dict):
+        """后台检查发现新版本"""
+        version = version_info.get('version', 'Unknown')
+        self.logger.info(f"后台检查发现新版本: v{version}")
+        if self.tray_icon is not None:
+            self.tray_icon.showMessage(
+                "发现新版本",
+                f"pyQuickStart v{version} 已发布，点击 🔄 按钮进行更新",
+                QSystemTrayIcon.Information,
+                5000
+            )
+    
     def _on_no_update(self, progress_dialog):
         """没有更新"""
         if self.update_cancelled:
@@ -1423,6 +1797,7 @@ class HotkeyManagerQt(QMainWindow):
                 "更新将在程序重启后生效\n\n程序即将自动重启..."
             )
             # 退出程序，更新脚本会自动重启
+            self._restarting_for_update = True
             self.exit_app()
         else:
             QMessageBox.critical(self, "更新失败", f"应用更新失败\n\n{msg}")
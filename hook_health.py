@@ -0,0 +1,378 @@
+"""
+键盘钩子健康监视模块
+记录系统键盘钩子过程中每个事件的处理耗时，发现系统静默移除钩子（回调超时、事件缺失）时
+自动重新安装系统钩子
+"""
+import bisect
+import sys
+import threading
+import time
+from typing import Callable, List, Optional
+from logger import Logger
+
+# 钩子状态
+HOOK_IDLE = "idle"           # 未启动监听
+HOOK_OK = "ok"
+HOOK_PROBING = "probing"     # 怀疑钩子失效，已发送探测按键，等待确认
+HOOK_RECOVERED = "recovered" # 发现失效并已重新安装
+HOOK_LOST = "lost"           # 无法重新安装，或重新安装后仍收不到事件
+
+STATUS_LABELS = {
+    HOOK_IDLE: "未启动",
+    HOOK_OK: "正常",
+    HOOK_PROBING: "检测中",
+    HOOK_RECOVERED: "已自动恢复",
+    HOOK_LOST: "失效",
+}
+
+
+def last_input_age_seconds() -> Optional[float]:
+    """系统最近一次键盘/鼠标输入距今的秒数（GetLastInputInfo，仅 Windows，其他平台返回 None）"""
+    if sys.platform != 'win32':
+        return None
+    try:
+        import ctypes
+
+        class LASTINPUTINFO(ctypes.Structure):
+            _fields_ = [("cbSize", ctypes.c_uint), ("dwTime", ctypes.c_uint)]
+
+        info = LASTINPUTINFO()
+        info.cbSize = ctypes.sizeof(LASTINPUTINFO)
+        if not ctypes.windll.user32.GetLastInputInfo(ctypes.byref(info)):
+            return None
+        # 两者都是 32 位毫秒计数，按无符号差值处理 49.7 天回绕
+        elapsed = (ctypes.windll.kernel32.GetTickCount() - info.dwTime) & 0xFFFFFFFF
+        return elapsed / 1000
+    except Exception:
+        return None
+
+
+WM_NULL = 0x0000
+
+
+def _stop_listening_thread(thread: threading.Thread, timeout: float) -> bool:
+    """
+    结束 keyboard 库在 Windows 上的钩子线程：它的消息循环在 GetMessage 收到任何
+    非 WM_QUIT 的消息时退出，线程结束后系统一并释放它安装的钩子（若仍存在）
+    """
+    import ctypes
+    if not ctypes.windll.user32.PostThreadMessageW(thread.native_id, WM_NULL, 0, 0):
+        return False
+    thread.join(timeout)
+    return not thread.is_alive()
+
+
+def restart_os_hook(keyboard_backend, timeout: float = 2.0) -> tuple[bool, str]:
+    """
+    重新安装 keyboard 库的系统键盘钩子（仅 Windows）
+
+    keyboard 库只在第一次注册时由监听线程调用 SetWindowsHookEx，之后注册、注销快捷键
+    只修改 Python 中的表，钩子被系统移除后不会因此重新安装。这里结束旧的监听线程，
+    再用同一个 listen 方法启动新线程重新安装钩子；已注册的快捷键和事件处理线程不变。
+    返回: (是否成功, 消息)
+    """
+    if sys.platform != 'win32':
+        return False, "只有 Windows 支持重新安装系统键盘钩子"
+    listener = getattr(keyboard_backend, '_listener', None)
+    thread = getattr(listener, 'listening_thread', None)
+    if thread is None or not getattr(listener, 'listening', False):
+        return False, "键盘监听尚未启动"
+
+    with listener.lock:
+        if thread.is_alive() and not _stop_listening_thread(thread, timeout):
+            # 旧线程仍在时再安装一个钩子，每个按键会被处理两次
+            return False, "旧的键盘钩子线程没有退出"
+        # 钩子失效期间漏掉的松开事件会让按键一直处于按下状态，快捷键无法匹配
+        with keyboard_backend._pressed_events_lock:
+            keyboard_backend._pressed_events.clear()
+        keyboard_backend._logically_pressed_keys.clear()
+        listener.active_modifiers.clear()
+        listener.modifier_states.clear()
+        listener.listening_thread = threading.Thread(target=listener.listen, daemon=True)
+        listener.listening_thread.start()
+    return True, "已重新安装系统键盘钩子"
+
+
+class LatencyHistogram:
+    """固定分桶的耗时直方图（毫秒），记录为 O(log 桶数)，不保存原始样本"""
+
+    BOUNDS_MS = (1, 2, 5, 10, 20, 50, 100, 200, 300, 500, 1000)
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.counts = [0] * (len(self.BOUNDS_MS) + 1)
+        self.total = 0
+        self.max_ms = 0.0
+
+    def record(self, elapsed_ms: float):
+        index = bisect.bisect_left(self.BOUNDS_MS, elapsed_ms)
+        with self._lock:
+            self.counts[index] += 1
+            self.total += 1
+            if elapsed_ms > self.max_ms:
+                self.max_ms = elapsed_ms
+
+    def percentile(self, p: float) -> float:
+        """p 百分位所在桶的上界（不超过记录到的最大值）"""
+        with self._lock:
+            counts = list(self.counts)
+            total = self.total
+            max_ms = self.max_ms
+        if total == 0:
+            return 0.0
+        rank = total * p / 100
+        seen = 0
+        for index, count in enumerate(counts):
+            seen += count
+            if count and seen >= rank:
+                return min(float(self.BOUNDS_MS[index]), max_ms) if index < len(self.BOUNDS_MS) else max_ms
+        return max_ms
+
+    def count_over(self, threshold_ms: float) -> int:
+        """耗时超过 threshold_ms 所在桶的次数"""
+        index = bisect.bisect_left(self.BOUNDS_MS, threshold_ms)
+        with self._lock:
+            return sum(self.counts[index + 1:]) if index < len(self.BOUNDS_MS) else 0
+
+    def describe(self) -> str:
+        if self.total == 0:
+            return "暂无事件"
+        return (f"p50 ≤ {self.percentile(50):g} ms，p99 ≤ {self.percentile(99):g} ms，"
+                f"最大 {self.max_ms:.1f} ms（{self.total} 次）")
+
+
+class HookHealthMonitor:
+    """
+    键盘钩子健康监视线程
+
+    计时的是 keyboard 库的 direct_callback：系统钩子过程对每个按键事件同步调用它
+    （决定是否拦截、把事件放入处理队列），钩子过程耗时超过 LowLevelHooksTimeout
+    系统就会移除钩子。快捷键回调在 keyboard 的处理线程中执行，不计入。
+    超过 slow_callback_ms 的事件记入日志，并立即怀疑钩子已被移除。
+    另外注册一个只记录时刻的全局按键钩子作为心跳：每 CHECK_INTERVAL_SECONDS
+    检查一次，系统仍有输入（Windows 上由 GetLastInputInfo 得知）而钩子
+    超过 silence_seconds 没有收到任何事件，或出现过慢事件时，发送一次
+    探测按键（默认 F24，几乎没有程序使用）。探测按键在 PROBE_TIMEOUT_SECONDS
+    内没有经过钩子即判定钩子失效，调用 on_lost 重新安装系统钩子，再探测一次确认。
+
+    鼠标输入也会更新 GetLastInputInfo，因此“有输入但没有按键”只作为
+    发送探测的理由，是否失效只以探测结果为准；探测最多每
+    PROBE_MIN_INTERVAL_SECONDS 发送一次，用户空闲时从不发送（不影响锁屏）。
+    """
+
+    CHECK_INTERVAL_SECONDS = 5.0
+    PROBE_TIMEOUT_SECONDS = 2.0
+    PROBE_MIN_INTERVAL_SECONDS = 60.0
+    # 连续重新安装后仍收不到探测按键该次数后不再自动重试
+    MAX_RECOVERIES_IN_A_ROW = 3
+
+    def __init__(self, keyboard_backend, on_lost: Optional[Callable[[], tuple]] = None,
+                 settings: Optional[dict] = None):
+        """
+        on_lost: 判定钩子失效时调用，返回 (是否已重新安装, 消息)
+        需在 keyboard 库开始监听之前创建，direct_callback 的计时才会生效
+        （已在监听时从下一次重新安装钩子开始生效）
+        """
+        self.logger = Logger()
+        self.keyboard = keyboard_backend
+        self.on_lost = on_lost
+        self.enabled = True
+        self.slow_callback_ms = 200.0
+        self.silence_seconds = 30.0
+        self.probe_key = "f24"
+        self.apply_settings(settings or {})
+
+        self.histogram = LatencyHistogram()
+        self.status = HOOK_IDLE
+        self.recoveries = 0
+        self.last_recovery_at = 0.0  # time.time()
+        self._failed_recoveries = 0
+        self._last_event = 0.0       # time.monotonic()
+        self._slow_pending = False
+        self._reinstalled = False    # 刚重新安装钩子，下一次检查发送探测确认
+        self._probe_sent_at = 0.0
+        self._last_probe_at = 0.0
+        self._hook_handle = None
+
+        self._thread = None
+        self._stop_event = threading.Event()
+        self._wrap_os_callback()
+
+    def apply_settings(self, settings: dict):
+        """应用配置: enabled / slow_callback_ms / silence_seconds / probe_key"""
+        try:
+            self.enabled = bool(settings.get('enabled', self.enabled))
+            self.slow_callback_ms = max(10.0, float(settings.get('slow_callback_ms', self.slow_callback_ms)))
+            self.silence_seconds = max(5.0, float(settings.get('silence_seconds', self.silence_seconds)))
+            self.probe_key = str(settings.get('probe_key', self.probe_key)) or self.probe_key
+        except (TypeError, ValueError) as e:
+            self.logger.warning(f"钩子监视配置无效，使用默认值: {e}")
+
+    def _wrap_os_callback(self):
+        """
+        用计时包装替换 keyboard 监听器的 direct_callback（实例属性）。监听线程启动时
+        读取该属性传给系统钩子，之后每个按键事件都在钩子过程中经过包装。
+        后端没有该监听器（如延迟测试的假后端）时不计时
+        """
+        listener = getattr(self.keyboard, '_listener', None)
+        callback = getattr(listener, 'direct_callback', None)
+        if callback is None:
+            return
+        # 只包装原始方法，多个监视器先后创建时由最后一个计时
+        callback = getattr(callback, '__wrapped__', callback)
+
+        def timed_callback(event):
+            started = time.perf_counter()
+            try:
+                return callback(event)
+            finally:
+                self._record(started)
+        timed_callback.__wrapped__ = callback
+        listener.direct_callback = timed_callback
+
+    def _record(self, started: float):
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        self.histogram.record(elapsed_ms)
+        self._last_event = time.monotonic()
+        if elapsed_ms >= self.slow_callback_ms:
+            self._slow_pending = True
+            self.logger.warning(f"键盘钩子处理一个事件耗时 {elapsed_ms:.0f} ms，超过 {self.slow_callback_ms:g} ms，"
+                                f"系统可能会移除钩子")
+
+    def _on_key_event(self, event):
+        """心跳钩子：只记录时刻（在钩子线程中执行，不做任何其他工作）"""
+        self._last_event = time.monotonic()
+
+    def hook(self):
+        """安装心跳钩子（后端不支持全局钩子时跳过，只统计回调耗时）"""
+        if self._hook_handle is not None or not hasattr(self.keyboard, 'hook'):
+            return
+        try:
+            self._hook_handle = self.keyboard.hook(self._on_key_event)
+        except Exception as e:
+            self.logger.warning(f"安装键盘心跳钩子失败: {e}")
+
+    def unhook(self):
+        if self._hook_handle is None:
+            return
+        handle, self._hook_handle = self._hook_handle, None
+        try:
+            self.keyboard.unhook(handle)
+        except Exception as e:
+            self.logger.debug(f"移除键盘心跳钩子失败: {e}")
+
+    def start(self):
+        """启动监视（重复调用无副作用）"""
+        if not self.enabled:
+            return
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self.hook()
+        self.status = HOOK_OK
+        self._last_event = time.monotonic()
+        self._probe_sent_at = 0.0
+        self._failed_recoveries = 0
+        self._stop_event = threading.Event()
+        self._thread = threading.Thread(target=self._run, args=(self._stop_event,), daemon=True,
+                                        name="HookHealth")
+        self._thread.start()
+
+    def stop(self):
+        self._stop_event.set()
+        self._thread = None
+        self.unhook()
+        self.status = HOOK_IDLE
+
+    def _run(self, stop_event: threading.Event):
+        while not stop_event.wait(self.CHECK_INTERVAL_SECONDS):
+            try:
+                self.check_once()
+            except Exception as e:
+                self.logger.error(f"检查键盘钩子失败: {e}")
+
+    def check_once(self):
+        """一次健康检查：确认进行中的探测，或在可疑时发送新的探测"""
+        now = time.monotonic()
+        if self._probe_sent_at:
+            if self._last_event >= self._probe_sent_at:
+                self._probe_sent_at = 0.0
+                self._failed_recoveries = 0
+                if self.status in (HOOK_PROBING, HOOK_LOST):
+                    self.status = HOOK_RECOVERED if self.recoveries else HOOK_OK
+            elif now - self._probe_sent_at >= self.PROBE_TIMEOUT_SECONDS:
+                self._probe_sent_at = 0.0
+                self._hook_lost()
+            return
+
+        reason = self._suspect_reason(now)
+        if reason and now - self._last_probe_at >= self.PROBE_MIN_INTERVAL_SECONDS:
+            self._send_probe(reason)
+
+    def _suspect_reason(self, now: float) -> str:
+        if self._reinstalled:
+            self._reinstalled = False
+            return "刚重新安装钩子，确认是否生效"
+        if self._slow_pending:
+            self._slow_pending = False
+            return "出现超时事件"
+        silent = now - self._last_event
+        if silent < self.silence_seconds:
+            return ""
+        input_age = last_input_age_seconds()
+        if input_age is not None and input_age < self.CHECK_INTERVAL_SECONDS:
+            return f"系统有输入但钩子 {silent:.0f} 秒没有收到按键"
+        return ""
+
+    def _send_probe(self, reason: str):
+        if not hasattr(self.keyboard, 'send') or self._hook_handle is None:
+            return
+        self.logger.info(f"键盘钩子可能失效（{reason}），发送探测按键 {self.probe_key}")
+        self.status = HOOK_PROBING
+        self._last_probe_at = self._probe_sent_at = time.monotonic()
+        try:
+            self.keyboard.send(self.probe_key)
+        except Exception as e:
+            self._probe_sent_at = 0.0
+            self.status = HOOK_OK
+            self.logger.warning(f"发送探测按键失败: {e}")
+
+    def _hook_lost(self):
+        if self._failed_recoveries >= self.MAX_RECOVERIES_IN_A_ROW:
+            self.status = HOOK_LOST
+            return
+        self._failed_recoveries += 1
+        self.logger.warning("探测按键没有经过键盘钩子，判定钩子已被系统移除，重新安装系统钩子")
+        self.status = HOOK_LOST
+        if self.on_lost is None:
+            return
+        try:
+            success, msg = self.on_lost()
+        except Exception as e:
+            success, msg = False, str(e)
+        if not success:
+            self.logger.error(f"重新安装键盘钩子失败: {msg}")
+            self._failed_recoveries = self.MAX_RECOVERIES_IN_A_ROW
+            return
+        self.recoveries += 1
+        self.last_recovery_at = time.time()
+        self.logger.info(f"{msg}（第 {self.recoveries} 次）")
+        # 新线程安装钩子需要一点时间，下一次检查时再探测，确认新钩子能收到按键
+        self.status = HOOK_PROBING
+        self._reinstalled = True
+        self._last_probe_at = 0.0
+
+    def describe(self) -> List[str]:
+        """GUI 显示用的状态说明"""
+        lines = [f"键盘钩子: {STATUS_LABELS[self.status]}"]
+        lines.append(f"钩子处理耗时: {self.histogram.describe()}")
+        slow = self.histogram.count_over(self.slow_callback_ms)
+        if slow:
+            lines.append(f"超过 {self.slow_callback_ms:g} ms 的事件: {slow} 次")
+        if self.status != HOOK_IDLE and self._last_event:
+            lines.append(f"最近一次按键事件: {time.monotonic() - self._last_event:.0f} 秒前")
+        if self.recoveries:
+            when = time.strftime("%H:%M:%S", time.localtime(self.last_recovery_at))
+            lines.append(f"已自动重新安装 {self.recoveries} 次（最近 {when}）")
+        if self.status == HOOK_LOST:
+            lines.append("无法自动恢复键盘钩子，请重新启动程序")
+        return lines
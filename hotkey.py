@@ -0,0 +1,153 @@
+"""
+快捷键表示模块
+把 "Ctrl+Alt+A"、"alt+ctrl+a" 等写法统一成同一个规范化的快捷键对象
+"""
+from typing import Dict, Optional, Tuple
+
+# 修饰键位掩码（同时决定规范化字符串中的顺序）
+MOD_CTRL = 1
+MOD_ALT = 2
+MOD_SHIFT = 4
+MOD_WIN = 8
+
+MODIFIER_NAMES: Tuple[Tuple[int, str], ...] = (
+    (MOD_CTRL, 'ctrl'),
+    (MOD_ALT, 'alt'),
+    (MOD_SHIFT, 'shift'),
+    (MOD_WIN, 'win'),
+)
+
+MODIFIER_ALIASES: Dict[str, int] = {
+    'ctrl': MOD_CTRL, 'control': MOD_CTRL, 'ctl': MOD_CTRL,
+    'lctrl': MOD_CTRL, 'rctrl': MOD_CTRL, 'left ctrl': MOD_CTRL, 'right ctrl': MOD_CTRL,
+    'alt': MOD_ALT, 'option': MOD_ALT, 'lalt': MOD_ALT, 'ralt': MOD_ALT, 'altgr': MOD_ALT,
+    'left alt': MOD_ALT, 'right alt': MOD_ALT,
+    'shift': MOD_SHIFT, 'lshift': MOD_SHIFT, 'rshift': MOD_SHIFT,
+    'left shift': MOD_SHIFT, 'right shift': MOD_SHIFT,
+    'win': MOD_WIN, 'windows': MOD_WIN, 'meta': MOD_WIN, 'super': MOD_WIN,
+    'cmd': MOD_WIN, 'command': MOD_WIN, 'lwin': MOD_WIN, 'rwin': MOD_WIN,
+    'left windows': MOD_WIN, 'right windows': MOD_WIN,
+}
+
+# 普通按键别名 -> 规范名称（规范名称与录制框产生的名称一致）
+KEY_ALIASES: Dict[str, str] = {
+    'del': 'delete',
+    'escape': 'esc',
+    'return': 'enter',
+    'spacebar': 'space',
+    'ins': 'insert',
+    'pgup': 'page_up', 'pageup': 'page_up', 'page up': 'page_up', 'prior': 'page_up',
+    'pgdn': 'page_down', 'pagedown': 'page_down', 'page down': 'page_down', 'next': 'page_down',
+    'bksp': 'backspace', 'back': 'backspace',
+    'arrow up': 'up', 'arrow down': 'down', 'arrow left': 'left', 'arrow right': 'right',
+    'prtsc': 'print_screen', 'print screen': 'print_screen', 'printscreen': 'print_screen',
+    '+': 'plus',
+}
+
+
+class Hotkey:
+    """
+    规范化快捷键：修饰键位掩码 + 按键名称
+
+    相同组合只会有一个实例（驻留），可以直接作为字典键使用，
+    比较和哈希都是 O(1)。str() 得到 keyboard 库可用的规范写法，
+    display() 得到界面显示用的大写写法。
+    """
+
+    __slots__ = ('modifiers', 'key', '_text', '_hash')
+
+    _interned: Dict[Tuple[int, str], 'Hotkey'] = {}
+    _parse_cache: Dict[str, 'Hotkey'] = {}
+
+    def __new__(cls, modifiers: int, key: str):
+        identity = (modifiers, key)
+        existing = cls._interned.get(identity)
+        if existing is not None:
+            return existing
+        instance = super().__new__(cls)
+        object.__setattr__(instance, 'modifiers', modifiers)
+        object.__setattr__(instance, 'key', key)
+        names = [name for bit, name in MODIFIER_NAMES if modifiers & bit]
+        object.__setattr__(instance, '_text', '+'.join(names + [key]))
+        object.__setattr__(instance, '_hash', hash(identity))
+        return cls._interned.setdefault(identity, instance)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("Hotkey 是不可变对象")
+
+    def __reduce__(self):
+        return Hotkey, (self.modifiers, self.key)
+
+    def __eq__(self, other):
+        if isinstance(other, Hotkey):
+            return self.modifiers == other.modifiers and self.key == other.key
+        return NotImplemented
+
+    def __hash__(self):
+        return self._hash
+
+    def __str__(self):
+        return self._text
+
+    def __repr__(self):
+        return f"Hotkey({self._text!r})"
+
+    @property
+    def has_modifier(self) -> bool:
+        return self.modifiers != 0
+
+    def display(self) -> str:
+        """界面显示用的写法，例如 CTRL+ALT+A"""
+        return self._text.upper()
+
+    @classmethod
+    def parse(cls, text) -> 'Hotkey':
+        """
+        解析快捷键字符串（不区分大小写和修饰键顺序）
+
+        已经是 Hotkey 时原样返回。格式无效时抛出 ValueError。
+        """
+        if isinstance(text, Hotkey):
+            return text
+        if not isinstance(text, str):
+            raise ValueError(f"快捷键必须是字符串: {text!r}")
+
+        cached = cls._parse_cache.get(text)
+        if cached is not None:
+            return cached
+
+        normalized = text.strip().lower()
+        if normalized.endswith('++'):
+            # "ctrl++" 中最后一个加号是按键本身
+            parts = normalized[:-2].split('+') + ['+']
+        else:
+            parts = normalized.split('+')
+
+        modifiers = 0
+        key = None
+        for part in parts:
+            part = ' '.join(part.split())
+            if not part:
+                raise ValueError(f"快捷键格式无效: {text}")
+            bit = MODIFIER_ALIASES.get(part)
+            if bit is not None:
+                modifiers |= bit
+                continue
+            if key is not None:
+                raise ValueError(f"快捷键只能包含一个非修饰键: {text}")
+            key = KEY_ALIASES.get(part, part).replace(' ', '_')
+
+        if key is None:
+            raise ValueError(f"快捷键缺少非修饰键: {text}")
+
+        hotkey = cls(modifiers, key)
+        cls._parse_cache[text] = hotkey
+        return hotkey
+
+    @classmethod
+    def try_parse(cls, text) -> Optional['Hotkey']:
+        """解析快捷键，格式无效时返回 None"""
+        try:
+            return cls.parse(text)
+        except ValueError:
+            return None
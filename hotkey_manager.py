@@ -3,55 +3,142 @@
 负责全局快捷键监听和程序启动
 """
 import keyboard
+import os
 import subprocess
 import psutil
 import threading
 import time
 import ctypes
+import webbrowser
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, List, Set
+from typing import Callable, Dict, Optional, Set
 from logger import Logger
+from process_tracker import ProcessGroup, normalize_exe_path, spawn_tracked
+from process_registry import ProcessRegistry
+from launcher_helper import LauncherHelper
+from prefetcher import Prefetcher, UsageStats
+from hotkey import Hotkey
+from workspace import BINDING_TYPE_WORKSPACE, Workspace, WorkspaceLauncher, WorkspaceTarget
+from resource_monitor import ResourceMonitor
+from state_journal import StateJournal
+from launch_plan import (LaunchPlan, LaunchPlanCache, PLAN_EXE, PLAN_FOLDER, PLAN_MISSING, PLAN_SHELL,
+                         PLAN_URL)
+from hook_health import HookHealthMonitor, restart_os_hook
+from quick_launch import KIND_WORKSPACE, QuickLaunchEntry, QuickLaunchIndex
+from launch_history import (LaunchHistory, OUTCOME_ERROR, OUTCOME_FOCUSED, OUTCOME_MISSING,
+                            OUTCOME_NOT_FOUND, OUTCOME_OK)
+
+# 绑定类型（binding_options[快捷键]['kind']）
+BINDING_TARGET = "target"                    # 启动一个目标，路径保存在 hotkeys 中
+BINDING_WORKSPACE = BINDING_TYPE_WORKSPACE   # 并发启动工作区，保存在 workspaces 中
+BINDING_PROFILE = "profile"                  # 切换绑定方案
+BINDING_PALETTE = "palette"                  # 打开快速启动面板
 
 
 class HotkeyManager:
     # 支持的修饰键
     MODIFIERS = {'ctrl', 'alt', 'shift', 'win'}
 
-    def __init__(self):
-        self.hotkeys: Dict[str, str] = {}  # 快捷键 -> 程序路径
-        self.running_processes: List[psutil.Process] = []
+    # 同一绑定两次触发之间的默认冷却时间（过滤按键自动重复和误双击）
+    DEFAULT_COOLDOWN_MS = 500
+    LAUNCH_WORKERS = 4
+
+    def __init__(self, keyboard_backend=None):
+        """
+        keyboard_backend: 提供 add_hotkey(文本, 回调) / remove_hotkey(文本) 的键盘钩子后端，
+        默认为 keyboard 库（延迟测试中替换为注入合成按键的假后端）
+        """
+        self.keyboard = keyboard_backend or keyboard
+        self.hotkeys: Dict[Hotkey, str] = {}  # 规范化快捷键 -> 程序路径（只含目标绑定）
+        # 规范化快捷键 -> 绑定选项，包含全部绑定，'kind' 为绑定类型
+        self.binding_options: Dict[Hotkey, dict] = {}
+        self.workspaces: Dict[Hotkey, Workspace] = {}  # 规范化快捷键 -> 工作区
+        # 已注册到 keyboard 钩子的快捷键
+        self._registered: Set[Hotkey] = set()
+        # 钩子处理耗时统计与失效检测（系统静默移除钩子后自动重新安装），需在注册任何快捷键之前创建
+        self.hook_health = HookHealthMonitor(self.keyboard, on_lost=self.reinstall_hooks)
+
+        # 绑定方案：公共绑定始终生效，方案中的绑定只有该方案激活时才注册
+        self.profiles: Dict[str, Dict[Hotkey, dict]] = {}  # 方案名 -> {快捷键: 绑定字典}
+        self.active_profile = ""
+        self._profile_bindings: Dict[Hotkey, dict] = {}  # 当前方案中已生效的绑定
+        self._profile_lock = threading.RLock()
+        # 切换方案后的回调（在切换所在线程中调用，参数为新方案名）
+        self.on_profile_switched: Optional[Callable[[str], None]] = None
+        # 按下快速启动面板快捷键后的回调（在启动线程中调用）
+        self.on_palette_requested: Optional[Callable[[], None]] = None
+        # 被跟踪的程序组（线程安全，按根进程和成员 PID、程序路径索引）
+        self.process_registry = ProcessRegistry()
         self.logger = Logger()
         self.is_running = False
+        # 程序组监控线程（每次 start 使用新的停止事件，stop 后旧线程立即退出）
+        self._monitor_thread = None
+        self._monitor_stop = threading.Event()
+
+        # 使用统计与后台预读
+        self.usage_stats = UsageStats()
+        self.prefetcher = Prefetcher(self.usage_stats)
+
+        # 快速启动面板的索引：所有绑定的目标、工作区和启动过的目标，按使用次数加权
+        self.palette_index = QuickLaunchIndex(
+            lambda target: self.usage_stats.targets.get(target, {}).get('count', 0))
+        for target in list(self.usage_stats.targets):
+            self.palette_index.add_target(target, from_history=True)
+
+        # 启动历史（SQLite，后台批量写入）
+        self.launch_history = LaunchHistory()
+
+        # 程序组资源占用采样
+        self.resource_monitor = ResourceMonitor(self.process_registry.snapshot)
+
+        # Linux 上可改由预先启动的小进程创建子进程（默认关闭，见 apply_launcher_settings）
+        self.launcher: Optional[LauncherHelper] = None
+
+        # 状态日志：崩溃或更新重启后恢复被跟踪的程序组、防休眠状态和当前方案
+        self.state_journal = StateJournal()
+        self.restored_state = self.restore_state()
+
+        # 启动计划：绑定时预先分类目标，触发时按计划直接分派，不再探测文件系统
+        self.launch_plans = LaunchPlanCache(self._bound_target_paths)
+        self._plan_handlers = {
+            PLAN_URL: self._launch_url,
+            PLAN_FOLDER: self._launch_folder,
+            PLAN_EXE: self._launch_exe,
+            PLAN_SHELL: self._launch_shell,
+            PLAN_MISSING: self._launch_missing,
+        }
+
+        # 工作区并发启动
+        self._workspace_launcher = WorkspaceLauncher(self._launch_workspace_target)
+
+        # 触发去重：快捷键回调只做查表，启动交给后台线程
+        self._launch_executor = ThreadPoolExecutor(max_workers=self.LAUNCH_WORKERS,
+                                                   thread_name_prefix="Launch")
+        self._trigger_lock = threading.Lock()
+        self._in_flight: Dict[object, float] = {}  # 正在启动的目标 -> 开始时刻
+        self._cooldown_until: Dict[Hotkey, float] = {}
+        # 快捷键 -> {'accepted': 执行次数, 'coalesced': 并入进行中启动的次数, 'cooldown': 冷却期内忽略的次数}
+        self.trigger_stats: Dict[Hotkey, Dict[str, int]] = {}
         
-        # 常见的系统保留快捷键
-        self.system_hotkeys: Set[str] = {
-            'ctrl+alt+delete', 'ctrl+alt+del',
+        # 常见的系统保留快捷键（规范化后 del / delete 等别名是同一个键）
+        self.system_hotkeys: Set[Hotkey] = {Hotkey.parse(text) for text in (
+            'ctrl+alt+delete',
             'ctrl+shift+esc',
             'win+l', 'win+d', 'win+e', 'win+r', 'win+tab',
             'win+i', 'win+s', 'win+a', 'win+x',
             'alt+tab', 'alt+f4',
             'ctrl+alt+tab',
-        }
+        )}
 
-    def _validate_hotkey_format(self, hotkey: str) -> bool:
+    def _validate_hotkey_format(self, hotkey) -> bool:
         """
         验证快捷键格式
         - 必须包含至少一个修饰键（ctrl/alt/shift/win）
-        - 使用加号(+)连接
+        - 使用加号(+)连接，只有一个非修饰键
         """
-        if not hotkey or not isinstance(hotkey, str):
-            return False
-
-        # 转换为小写进行验证
-        hotkey_lower = hotkey.lower()
-        keys = hotkey_lower.split('+')
-
-        if len(keys) < 2:
-            return False
-
-        # 检查是否包含至少一个修饰键
-        has_modifier = any(key in self.MODIFIERS for key in keys)
-        return has_modifier
+        parsed = Hotkey.try_parse(hotkey)
+        return parsed is not None and parsed.has_modifier
 
     def _validate_target(self, target_path: str) -> bool:
         """
@@ -72,22 +159,39 @@ class HotkeyManager:
         path = Path(target_path)
         return path.exists()  # 文件或文件夹存在即可
 
-    def check_system_conflict(self, hotkey: str) -> tuple[bool, str]:
+    def check_system_conflict(self, hotkey) -> tuple[bool, str]:
         """
-        检查快捷键是否与系统快捷键冲突
+        检查快捷键是否与系统快捷键冲突（不区分大小写和修饰键顺序）
         返回: (是否冲突, 冲突说明)
         """
-        hotkey_lower = hotkey.lower()
+        parsed = Hotkey.try_parse(hotkey)
+        if parsed is None:
+            return False, ""
         
         # 检查是否是系统保留快捷键
-        if hotkey_lower in self.system_hotkeys:
+        if parsed in self.system_hotkeys:
             return True, f"'{hotkey}' 是系统保留快捷键，可能无法正常工作"
         
         # 检查是否与已有快捷键冲突
-        if hotkey in self.hotkeys:
-            return True, f"'{hotkey}' 已被绑定到: {self.hotkeys[hotkey]}"
+        if parsed in self.binding_options:
+            return True, f"'{hotkey}' 已被绑定到: {self.describe_binding(parsed)}"
         
         return False, ""
+
+    def describe_binding(self, hotkey) -> Optional[str]:
+        """绑定的显示文字：目标路径、工作区摘要或动作说明，未绑定时返回 None"""
+        hotkey = Hotkey.try_parse(hotkey)
+        options = self.binding_options.get(hotkey)
+        if options is None:
+            return None
+        kind = options['kind']
+        if kind == BINDING_WORKSPACE:
+            return self.workspaces[hotkey].describe()
+        if kind == BINDING_PROFILE:
+            return f"切换到方案: {options['profile']}"
+        if kind == BINDING_PALETTE:
+            return "打开快速启动面板"
+        return self.hotkeys.get(hotkey)
     
     def is_admin(self) -> bool:
         """检查是否以管理员权限运行"""
@@ -96,9 +200,12 @@ class HotkeyManager:
         except:
             return False
 
-    def add_hotkey(self, hotkey: str, target_path: str) -> tuple[bool, str]:
+    def add_hotkey(self, hotkey, target_path: str, focus_existing: bool = False,
+                   cooldown_ms: float = None) -> tuple[bool, str]:
         """
         添加快捷键绑定
+        focus_existing: 目标已在运行时切换到它的窗口，而不是再启动一个实例
+        cooldown_ms: 两次触发之间的最短间隔，默认 DEFAULT_COOLDOWN_MS
         返回: (是否成功, 消息)
         """
         try:
@@ -107,6 +214,7 @@ class HotkeyManager:
                 msg = f"快捷键格式无效: {hotkey}，必须包含至少一个修饰键（ctrl/alt/shift/win）"
                 self.logger.error(msg)
                 return False, msg
+            hotkey = Hotkey.parse(hotkey)
 
             # 验证目标路径
             if not self._validate_target(target_path):
@@ -119,10 +227,26 @@ class HotkeyManager:
             if has_conflict:
                 self.logger.warning(conflict_msg)
                 # 如果是已存在的快捷键，允许覆盖
-                if hotkey not in self.hotkeys:
+                if hotkey not in self.binding_options:
                     return False, conflict_msg
 
+            previous = self.hotkeys.get(hotkey)
+            if previous is not None and previous != target_path:
+                self.palette_index.remove_target_hotkey(previous, hotkey)
+            if self.workspaces.pop(hotkey, None) is not None:
+                self.palette_index.remove_workspace(hotkey)
             self.hotkeys[hotkey] = target_path
+            self.binding_options[hotkey] = {
+                'kind': BINDING_TARGET,
+                'focus_existing': focus_existing,
+                'exe_key': normalize_exe_path(target_path) if focus_existing else None,
+                # 同一目标的启动互相合并，不论由哪个快捷键触发
+                'flight_key': target_path,
+                'cooldown': self._cooldown_seconds(cooldown_ms),
+            }
+            self.trigger_stats.setdefault(hotkey, {'accepted': 0, 'coalesced': 0, 'cooldown': 0})
+            self.palette_index.add_target(target_path, hotkey)
+            self.launch_plans.compile(target_path)
             self.logger.info(f"添加快捷键: {hotkey} -> {target_path}")
             return True, "添加成功"
         except Exception as e:
@@ -130,152 +254,595 @@ class HotkeyManager:
             self.logger.error(msg)
             return False, msg
 
-    def remove_hotkey(self, hotkey: str) -> bool:
-        """移除快捷键绑定"""
-        if hotkey in self.hotkeys:
-            del self.hotkeys[hotkey]
-            # 只在监听运行时才从keyboard移除
-            if self.is_running:
-                try:
-                    keyboard.remove_hotkey(hotkey)
-                except KeyError:
-                    pass  # 快捷键可能未注册
-            self.logger.info(f"移除快捷键: {hotkey}")
+    def add_workspace(self, hotkey, workspace: Workspace, cooldown_ms: float = None) -> tuple[bool, str]:
+        """
+        添加工作区绑定：一个快捷键并发启动多个目标
+        返回: (是否成功, 消息)
+        """
+        if not self._validate_hotkey_format(hotkey):
+            msg = f"快捷键格式无效: {hotkey}，必须包含至少一个修饰键（ctrl/alt/shift/win）"
+            self.logger.error(msg)
+            return False, msg
+        hotkey = Hotkey.parse(hotkey)
+
+        invalid = [t.path for t in workspace.targets if not self._validate_target(t.path)]
+        if invalid:
+            msg = f"工作区目标路径无效: {', '.join(invalid)}"
+            self.logger.error(msg)
+            return False, msg
+
+        has_conflict, conflict_msg = self.check_system_conflict(hotkey)
+        if has_conflict and hotkey not in self.binding_options:
+            self.logger.warning(conflict_msg)
+            return False, conflict_msg
+
+        previous = self.hotkeys.pop(hotkey, None)
+        if previous is not None:
+            self.palette_index.remove_target_hotkey(previous, hotkey)
+
+        self.binding_options[hotkey] = {
+            'kind': BINDING_WORKSPACE,
+            'flight_key': ('workspace', hotkey),
+            'cooldown': self._cooldown_seconds(cooldown_ms),
+        }
+        self.trigger_stats.setdefault(hotkey, {'accepted': 0, 'coalesced': 0, 'cooldown': 0})
+        self.workspaces[hotkey] = workspace
+        self.palette_index.add_workspace(hotkey, workspace.describe())
+        for target in workspace.targets:
+            self.launch_plans.compile(target.path)
+        self.logger.info(f"添加工作区快捷键: {hotkey} -> {workspace.describe()}")
+        return True, "添加成功"
+
+    def remove_hotkey(self, hotkey) -> bool:
+        """移除快捷键绑定（属于当前方案时同时从方案中删除）"""
+        hotkey = Hotkey.try_parse(hotkey)
+        if hotkey is None or hotkey not in self.binding_options:
+            return False
+        with self._profile_lock:
+            if self._profile_bindings.pop(hotkey, None) is not None:
+                self.profiles.get(self.active_profile, {}).pop(hotkey, None)
+            self._drop_binding(hotkey)
+        self.logger.info(f"移除快捷键: {hotkey}")
+        return True
+
+    def _drop_binding(self, hotkey: Hotkey):
+        """清除一个绑定的全部状态，已注册时从 keyboard 注销"""
+        self.binding_options.pop(hotkey, None)
+        target_path = self.hotkeys.pop(hotkey, None)
+        if target_path is not None:
+            self.palette_index.remove_target_hotkey(target_path, hotkey)
+        if self.workspaces.pop(hotkey, None) is not None:
+            self.palette_index.remove_workspace(hotkey)
+        self.trigger_stats.pop(hotkey, None)
+        self._cooldown_until.pop(hotkey, None)
+        self._unregister(hotkey)
+
+    def _register(self, hotkey: Hotkey) -> bool:
+        """注册到 keyboard 钩子（已注册时无操作）"""
+        if hotkey in self._registered:
             return True
-        return False
+        try:
+            self.keyboard.add_hotkey(str(hotkey), lambda h=hotkey: self._on_hotkey(h))
+        except Exception as e:
+            self.logger.error(f"注册快捷键失败 {hotkey}: {e}")
+            return False
+        self._registered.add(hotkey)
+        self.logger.debug(f"注册快捷键: {hotkey}")
+        return True
 
-    def launch_program(self, target_path: str):
-        """启动程序、打开网页或文件夹"""
+    def _unregister(self, hotkey: Hotkey) -> bool:
+        """从 keyboard 钩子注销（未注册时无操作）"""
+        if hotkey not in self._registered:
+            return False
+        self._registered.discard(hotkey)
         try:
-            # 检查是否是 URL
-            if target_path.startswith(('http://', 'https://', 'www.')):
-                # 打开网页
-                import webbrowser
-                webbrowser.open(target_path)
-                self.logger.info(f"打开网页: {target_path}")
-                return
-            
-            path = Path(target_path)
-            
-            # 检查是否是文件夹
-            if path.is_dir():
-                # 打开文件夹
-                import os
-                os.startfile(target_path)
-                self.logger.info(f"打开文件夹: {target_path}")
+            self.keyboard.remove_hotkey(str(hotkey))
+        except Exception as e:
+            self.logger.warning(f"注销快捷键失败 {hotkey}: {e}")
+            return False
+        self.logger.debug(f"已注销快捷键: {hotkey}")
+        return True
+
+    def reinstall_hooks(self) -> tuple[bool, str]:
+        """
+        重新安装系统键盘钩子（钩子被系统移除后调用）
+
+        注销再注册快捷键只修改 keyboard 库中的表，不会重新安装系统钩子；
+        这里重启 keyboard 的钩子线程，已注册的快捷键保持不变
+        返回: (是否成功, 消息)
+        """
+        return restart_os_hook(self.keyboard)
+
+    def apply_binding(self, hotkey, binding: dict) -> tuple[bool, str]:
+        """
+        按配置格式添加绑定：{"path": ..., 选项} 或 {"type": "workspace", ...}
+        返回: (是否成功, 消息)
+        """
+        if binding.get("type") == BINDING_TYPE_WORKSPACE:
+            try:
+                workspace = Workspace.from_config(binding)
+            except ValueError as e:
+                msg = f"工作区配置无效 {hotkey}: {e}"
+                self.logger.error(msg)
+                return False, msg
+            return self.add_workspace(hotkey, workspace, binding.get("cooldown_ms"))
+        return self.add_hotkey(hotkey, binding["path"], bool(binding.get("focus_existing")),
+                               binding.get("cooldown_ms"))
+
+    def set_profiles(self, profiles: Dict[str, Dict]):
+        """
+        设置全部绑定方案
+        profiles: 名称 -> {"bindings": {快捷键: 绑定字典}, "switch_hotkey": 快捷键或 None}
+        当前方案仍存在时按新内容重新应用（只处理有变化的绑定），否则退回到无方案
+        """
+        with self._profile_lock:
+            for hotkey in [h for h, options in self.binding_options.items() if options['kind'] == BINDING_PROFILE]:
+                self._drop_binding(hotkey)
+            self.profiles = {name: dict(profile.get("bindings", {})) for name, profile in profiles.items()}
+            for name, profile in profiles.items():
+                if profile.get("switch_hotkey") is not None:
+                    self.add_profile_switch(profile["switch_hotkey"], name)
+            self.switch_profile(self.active_profile if self.active_profile in self.profiles else "")
+
+    def add_profile_switch(self, hotkey, profile: str) -> tuple[bool, str]:
+        """
+        添加切换方案的快捷键（不属于任何方案，始终注册）
+        返回: (是否成功, 消息)
+        """
+        if not self._validate_hotkey_format(hotkey):
+            msg = f"方案 {profile} 的切换快捷键格式无效: {hotkey}"
+            self.logger.error(msg)
+            return False, msg
+        hotkey = Hotkey.parse(hotkey)
+        has_conflict, conflict_msg = self.check_system_conflict(hotkey)
+        if has_conflict:
+            self.logger.warning(conflict_msg)
+            return False, conflict_msg
+
+        self.binding_options[hotkey] = {
+            'kind': BINDING_PROFILE,
+            'flight_key': ('profile', hotkey),
+            'cooldown': self._cooldown_seconds(None),
+            'profile': profile,
+        }
+        self.trigger_stats.setdefault(hotkey, {'accepted': 0, 'coalesced': 0, 'cooldown': 0})
+        if self.is_running:
+            self._register(hotkey)
+        self.logger.info(f"添加方案切换快捷键: {hotkey} -> {profile}")
+        return True, "添加成功"
+
+    def add_palette_hotkey(self, hotkey) -> tuple[bool, str]:
+        """
+        添加打开快速启动面板的快捷键（不属于任何方案，始终注册）
+        返回: (是否成功, 消息)
+        """
+        if not self._validate_hotkey_format(hotkey):
+            msg = f"快速启动快捷键格式无效: {hotkey}"
+            self.logger.error(msg)
+            return False, msg
+        hotkey = Hotkey.parse(hotkey)
+        has_conflict, conflict_msg = self.check_system_conflict(hotkey)
+        if has_conflict:
+            self.logger.warning(conflict_msg)
+            return False, conflict_msg
+
+        self.binding_options[hotkey] = {
+            'kind': BINDING_PALETTE,
+            'flight_key': ('palette',),
+            'cooldown': self._cooldown_seconds(None),
+        }
+        self.trigger_stats.setdefault(hotkey, {'accepted': 0, 'coalesced': 0, 'cooldown': 0})
+        if self.is_running:
+            self._register(hotkey)
+        self.logger.info(f"添加快速启动快捷键: {hotkey}")
+        return True, "添加成功"
+
+    def search_palette(self, query: str, limit: int = QuickLaunchIndex.MAX_RESULTS) -> list:
+        """在快速启动索引中查询（可在界面线程中调用，不做任何 IO）"""
+        return self.palette_index.search(query, limit)
+
+    def launch_from_palette(self, entry: QuickLaunchEntry):
+        """在后台线程中启动面板选中的条目：目标走 launch_program，工作区按其快捷键执行"""
+        def run():
+            try:
+                if entry.kind == KIND_WORKSPACE:
+                    self.trigger_binding(entry.target)
+                else:
+                    self._activate_target(entry.target, "")
+            except Exception as e:
+                self.logger.error(f"快速启动失败 {entry.title}: {e}")
+        try:
+            self._launch_executor.submit(run)
+        except RuntimeError:
+            # 线程池已关闭（shutdown 之后）
+            self.logger.warning(f"程序正在退出，忽略快速启动: {entry.title}")
+
+    def binding_profile(self, hotkey) -> Optional[str]:
+        """绑定属于当前方案时返回方案名，公共绑定返回 None"""
+        hotkey = Hotkey.try_parse(hotkey)
+        return self.active_profile if hotkey in self._profile_bindings else None
+
+    def active_profile_hotkeys(self) -> list:
+        """当前方案中已生效的快捷键"""
+        return list(self._profile_bindings)
+
+    def switch_profile(self, name: str) -> tuple[bool, str]:
+        """
+        切换绑定方案（空字符串表示只保留公共绑定）
+
+        只比较新旧两个方案的差异：离开的绑定注销，新增的绑定注册，内容变化的
+        绑定只更新选项（回调按快捷键查表，不需要重新注册），未变化的不处理。
+        与公共绑定或切换快捷键冲突的方案绑定被跳过。
+        返回: (是否成功, 消息)
+        """
+        with self._profile_lock:
+            if name and name not in self.profiles:
+                msg = f"绑定方案不存在: {name}"
+                self.logger.error(msg)
+                return False, msg
+
+            current = self._profile_bindings
+            target = self.profiles.get(name, {})
+            removed = [hotkey for hotkey in current if hotkey not in target]
+            for hotkey in removed:
+                self._drop_binding(hotkey)
+
+            applied: Dict[Hotkey, dict] = {}
+            added = changed = skipped = 0
+            for hotkey, binding in target.items():
+                previous = current.get(hotkey)
+                if previous == binding:
+                    applied[hotkey] = binding
+                    continue
+                if previous is None and hotkey in self.binding_options:
+                    self.logger.warning(f"方案 {name} 的快捷键 {hotkey} 与已有绑定冲突，已跳过")
+                    skipped += 1
+                    continue
+                success, _ = self.apply_binding(hotkey, binding)
+                if not success:
+                    if previous is not None:
+                        self._drop_binding(hotkey)
+                    skipped += 1
+                    continue
+                applied[hotkey] = binding
+                if previous is None:
+                    added += 1
+                    if self.is_running:
+                        self._register(hotkey)
+                else:
+                    changed += 1
+
+            self._profile_bindings = applied
+            self.active_profile = name
+            self.state_journal.record_profile(name)
+            msg = (f"已切换到方案: {name or '无'}（注册 {added} 个，注销 {len(removed)} 个，"
+                   f"更新 {changed} 个，跳过 {skipped} 个）")
+            self.logger.info(msg)
+
+        if self.on_profile_switched is not None:
+            try:
+                self.on_profile_switched(name)
+            except Exception as e:
+                self.logger.error(f"方案切换回调失败: {e}")
+        return True, msg
+
+    def _bound_target_paths(self) -> Set[str]:
+        """所有绑定（含工作区）引用的目标路径"""
+        paths = set(list(self.hotkeys.values()))
+        for workspace in list(self.workspaces.values()):
+            paths.update(target.path for target in workspace.targets)
+        return paths
+
+    def _cooldown_seconds(self, cooldown_ms) -> float:
+        try:
+            value = self.DEFAULT_COOLDOWN_MS if cooldown_ms is None else float(cooldown_ms)
+        except (TypeError, ValueError):
+            value = self.DEFAULT_COOLDOWN_MS
+        return max(0.0, value) / 1000
+
+    def _on_hotkey(self, hotkey: Hotkey):
+        """
+        快捷键回调（在 keyboard 的监听线程中执行）
+
+        只做查表：目标正在启动时并入该次启动，冷却期内的重复触发直接忽略，
+        其余交给后台线程启动，按键自动重复不会阻塞监听线程。
+        """
+        # 绑定可能正被其他线程移除，两张表分别查找
+        options = self.binding_options.get(hotkey)
+        stats = self.trigger_stats.get(hotkey)
+        if options is None or stats is None:
+            return
+        flight_key = options['flight_key']
+        now = time.monotonic()
+        with self._trigger_lock:
+            if flight_key in self._in_flight:
+                stats['coalesced'] += 1
                 return
-            
-            # 检查是否是可执行文件
-            if not path.is_file():
-                self.logger.error(f"目标不存在: {target_path}")
+            if now < self._cooldown_until.get(hotkey, 0.0):
+                stats['cooldown'] += 1
                 return
+            self._in_flight[flight_key] = now
+            self._cooldown_until[hotkey] = now + options['cooldown']
+            stats['accepted'] += 1
+        try:
+            self._launch_executor.submit(self._run_binding, hotkey, flight_key)
+        except RuntimeError:
+            # 线程池已关闭（shutdown 之后仍有按键）
+            with self._trigger_lock:
+                self._in_flight.pop(flight_key, None)
+
+    def _run_binding(self, hotkey: Hotkey, flight_key):
+        """执行一次绑定，结束后解除进行中标记"""
+        try:
+            self.trigger_binding(hotkey)
+        except Exception as e:
+            self.logger.error(f"执行快捷键失败 {hotkey}: {e}")
+        finally:
+            with self._trigger_lock:
+                self._in_flight.pop(flight_key, None)
+
+    def get_trigger_stats(self) -> Dict[str, int]:
+        """所有快捷键的触发计数合计"""
+        totals = {'accepted': 0, 'coalesced': 0, 'cooldown': 0}
+        for stats in list(self.trigger_stats.values()):
+            for name in totals:
+                totals[name] += stats[name]
+        return totals
+
+    def trigger_binding(self, hotkey: Hotkey):
+        """立即执行一个绑定（同步，不经过去重）"""
+        options = self.binding_options.get(hotkey)
+        if options is None:
+            return
+        kind = options['kind']
+        if kind == BINDING_PROFILE:
+            self.switch_profile(options['profile'])
+            return
+        if kind == BINDING_PALETTE:
+            if self.on_palette_requested is not None:
+                self.on_palette_requested()
+            return
+
+        if kind == BINDING_WORKSPACE:
+            workspace = self.workspaces.get(hotkey)
+            if workspace is not None:
+                self.run_workspace(workspace, hotkey)
+            return
+
+        target_path = self.hotkeys.get(hotkey)
+        if target_path is None:
+            return
+
+        self._activate_target(target_path, hotkey, options.get('focus_existing', False),
+                              options.get('exe_key'))
+
+    def _activate_target(self, target_path: str, hotkey, focus_existing: bool = False,
+                         exe_key: str = None) -> str:
+        """
+        启动目标；focus_existing 时目标已在运行则切换到其窗口。返回启动结果
+
+        没有可激活的窗口时（非 Windows 平台、只有托盘图标或没有窗口的实例）照常启动，
+        由目标程序自己决定是否只保留一个实例
+        """
+        self.usage_stats.record(target_path)
+        self.palette_index.record_use(target_path)
+
+        if focus_existing:
+            group = self.find_running(exe_key or normalize_exe_path(target_path))
+            if group is not None:
+                started = time.perf_counter()
+                if group.focus_window():
+                    self.logger.info(f"目标已在运行，已切换到窗口: {group.name} (PID: {group.root_pid})")
+                    self.launch_history.record(hotkey, target_path, "exe",
+                                               (time.perf_counter() - started) * 1000, 0, OUTCOME_FOCUSED)
+                    return OUTCOME_FOCUSED
+                self.logger.info(f"目标已在运行但没有可激活的窗口，照常启动: {group.name}")
+
+        return self.launch_program(target_path, hotkey)
+
+    def run_workspace(self, workspace: Workspace, hotkey="") -> dict:
+        """并发启动工作区中的所有目标，返回耗时报告"""
+        return self._workspace_launcher.run(workspace, hotkey)
+
+    def _launch_workspace_target(self, target: WorkspaceTarget, hotkey) -> str:
+        return self._activate_target(target.path, hotkey, target.focus_existing)
+
+    @property
+    def process_groups(self) -> tuple:
+        """被跟踪程序组的只读快照"""
+        return self.process_registry.snapshot()
+
+    def restore_state(self) -> dict:
+        """
+        重放状态日志：恢复仍在运行的程序组（只按记录的 PID 逐个检查），
+        之后的程序组变更写入日志。返回 {"keep_awake": bool, "profile": 名称或 None}
+        """
+        started = time.perf_counter()
+        state = self.state_journal.load()
+        restored = 0
+        for entry in state["groups"]:
+            try:
+                root_pid, root_create_time = entry["key"]
+                members = {int(pid): float(ct) for pid, ct in entry.get("members", [])}
+                group = ProcessGroup.restore(int(root_pid), entry["path"], float(root_create_time),
+                                             members, entry.get("pgid"))
+            except (KeyError, TypeError, ValueError) as e:
+                self.logger.debug(f"忽略无效的程序组记录: {e}")
+                continue
+            if group is not None and self.process_registry.add(group):
+                restored += 1
+
+        self.process_registry.on_group_changed = self.state_journal.record_group
+        self.process_registry.on_group_removed = self.state_journal.record_drop
+        # 只保留仍在运行的程序组
+        self.state_journal.compact(self.process_registry.snapshot())
+        if state["groups"] or state["keep_awake"] or state["profile"]:
+            self.logger.info(
+                f"已从状态日志恢复 {restored}/{len(state['groups'])} 个程序组"
+                f"（耗时 {(time.perf_counter() - started) * 1000:.1f} ms）"
+            )
+        return {"keep_awake": state["keep_awake"], "profile": state["profile"]}
+
+    def find_running(self, exe_key: str) -> ProcessGroup:
+        """按规范化路径查找运行中的程序组（只查索引，不探测进程），没有则返回 None"""
+        return self.process_registry.find_running(exe_key)
+
+    def _add_group(self, group: ProcessGroup):
+        """加入跟踪登记表"""
+        self.process_registry.add(group)
+
+    def launch_program(self, target_path: str, hotkey="") -> str:
+        """启动程序、打开网页或文件夹，并记录启动耗时。返回启动结果（OUTCOME_*）"""
+        plan = self.launch_plans.get(target_path)
+        target_type = plan.kind
+        # 触发时目标是否已预读，与耗时一起记入历史，便于比较预读前后的启动耗时
+        # （与计划中的文件签名比较，不访问文件系统）
+        prefetched = None
+        if plan.kind in (PLAN_EXE, PLAN_SHELL):
+            prefetched = self.prefetcher.is_warm(target_path, plan.signature)
+        outcome = OUTCOME_ERROR
+        spawn_ms = 0.0
+        discovery_ms = 0.0
+        try:
+            target_type, spawn_ms, discovery_ms, outcome = self._plan_handlers[plan.kind](plan)
+        except Exception as e:
+            self.logger.error(f"启动失败: {e}")
+        finally:
+            self.launch_history.record(hotkey, target_path, target_type, spawn_ms, discovery_ms, outcome,
+                                       prefetched)
+        return outcome
+
+    def _launch_url(self, plan: LaunchPlan) -> tuple:
+        started = time.perf_counter()
+        webbrowser.open(plan.target_path)
+        spawn_ms = (time.perf_counter() - started) * 1000
+        self.logger.info(f"打开网页: {plan.target_path}")
+        return PLAN_URL, spawn_ms, 0.0, OUTCOME_OK
+
+    def _launch_folder(self, plan: LaunchPlan) -> tuple:
+        started = time.perf_counter()
+        os.startfile(plan.target_path)
+        spawn_ms = (time.perf_counter() - started) * 1000
+        self.logger.info(f"打开文件夹: {plan.target_path}")
+        return PLAN_FOLDER, spawn_ms, 0.0, OUTCOME_OK
+
+    def _launch_missing(self, plan: LaunchPlan) -> tuple:
+        self.logger.error(f"目标不存在: {plan.target_path}")
+        return PLAN_MISSING, 0.0, 0.0, OUTCOME_MISSING
+
+    def _launch_exe(self, plan: LaunchPlan) -> tuple:
+        try:
+            started = time.perf_counter()
+            group = spawn_tracked(plan.path, self.logger, self.launcher, plan.exe_key)
+            spawn_ms = (time.perf_counter() - started) * 1000
+            self._add_group(group)
+            self.logger.info(f"启动程序: {plan.target_path} (PID: {group.root_pid}, 启动耗时 {spawn_ms:.1f} ms)")
+            return PLAN_EXE, spawn_ms, 0.0, OUTCOME_OK
+        except FileNotFoundError:
+            # 计划编译后目标被删除，下次按新状态重新编译
+            self.launch_plans.invalidate(plan.target_path)
+            return self._launch_missing(plan)
+        except OSError as e:
+            # 例如需要提权的程序，交给 Shell 启动
+            self.logger.warning(f"直接启动失败，改用系统方式打开: {e}")
+        return self._launch_shell(plan)
+
+    def _launch_shell(self, plan: LaunchPlan) -> tuple:
+        spawn_ms, discovery_ms, found = self._launch_via_shell(plan)
+        return PLAN_SHELL, spawn_ms, discovery_ms, OUTCOME_OK if found else OUTCOME_NOT_FOUND
+
+    def _track_process(self, pid: int, target_path: str) -> bool:
+        """把 Shell 启动后找到的进程加入跟踪，已在某个程序组中则跳过"""
+        if self.process_registry.find_by_pid(pid) is not None:
+            return False
+        return self.process_registry.add(ProcessGroup(pid, target_path))
+
+    def _launch_via_shell(self, plan: LaunchPlan) -> tuple[float, float, bool]:
+        """
+        通过系统关联打开目标，再根据进程快照推测启动的进程
+        返回: (启动耗时ms, 进程发现耗时ms, 是否找到进程)
+        """
+        # 记录启动前的进程快照
+        before_pids = set(p.pid for p in psutil.process_iter())
+        
+        # 直接启动程序
+        target_path = plan.target_path
+        started = time.perf_counter()
+        os.startfile(target_path)
+        spawn_ms = (time.perf_counter() - started) * 1000
+        self.logger.info(f"启动程序: {target_path}")
+        started = time.perf_counter()
+        
+        # 等待进程启动
+        time.sleep(1.5)
+        
+        # 尝试找到新启动的进程并添加到监控列表（匹配条件在编译计划时已准备好）
+        program_name = plan.program_name
+
+        # 查找新启动的进程
+        new_processes_found = 0
+        candidate_processes = []  # 候选进程列表
+        
+        for proc in psutil.process_iter(['name', 'exe', 'create_time', 'pid', 'ppid']):
+            try:
+                # 跳过启动前就存在的进程
+                if proc.pid in before_pids:
+                    continue
+                
+                # 检查进程名称或完整路径
+                proc_name = proc.info.get('name', '').lower()
+                proc_exe = proc.info.get('exe', '')
+                
+                if plan.matches_process(proc_name, proc_exe):
+                    # 检查进程是否是最近启动的（15秒内）
+                    if time.time() - proc.create_time() < 15:
+                        candidate_processes.append((proc.info['create_time'], proc.pid, proc_name))
+            except (psutil.NoSuchProcess, psutil.AccessDenied, OSError, AttributeError):
+                continue
+        
+        # 对于多进程程序（浏览器等），只添加最早启动的进程（主进程）
+        if candidate_processes:
+            # 按创建时间排序，取最早的那个
+            candidate_processes.sort(key=lambda x: x[0])
+            earliest_pid = candidate_processes[0][1]
+            earliest_name = candidate_processes[0][2]
             
-            # 记录启动前的进程快照
-            before_pids = set(p.pid for p in psutil.process_iter())
-            
-            # 直接启动程序
-            import os
-            os.startfile(target_path)
-            self.logger.info(f"启动程序: {target_path}")
-            
-            # 等待进程启动
-            time.sleep(1.5)
-            
-            # 尝试找到新启动的进程并添加到监控列表
-            normalized_path = path.resolve()
-            program_name = normalized_path.name.lower()
-            program_name_without_ext = normalized_path.stem.lower()
-            
-            # 查找新启动的进程
-            new_processes_found = 0
-            candidate_processes = []  # 候选进程列表
+            if self._track_process(earliest_pid, target_path):
+                self.logger.info(f"已添加到监控列表: {earliest_name} (PID: {earliest_pid}, 主进程)")
+                new_processes_found = 1
+        else:
+            # 没有找到新进程，可能是浏览器已经在运行，只是打开了新窗口
+            # 尝试找到现有的匹配进程并添加到监控列表
+            self.logger.debug(f"未找到新进程，尝试查找现有的 {program_name} 进程")
+            existing_candidates = []
             
-            for proc in psutil.process_iter(['name', 'exe', 'create_time', 'pid', 'ppid']):
+            for proc in psutil.process_iter(['name', 'exe', 'create_time', 'pid']):
                 try:
-                    # 跳过启动前就存在的进程
-                    if proc.pid in before_pids:
-                        continue
-                    
-                    # 检查进程名称或完整路径
                     proc_name = proc.info.get('name', '').lower()
                     proc_exe = proc.info.get('exe', '')
                     
-                    # 匹配条件：
-                    # 1. 进程名完全匹配
-                    # 2. 进程路径匹配
-                    # 3. 进程名包含程序名（不含扩展名）- 用于 Chrome/Edge 等
-                    name_match = (proc_name == program_name or 
-                                 program_name_without_ext in proc_name or
-                                 proc_name.startswith(program_name_without_ext))
-                    path_match = proc_exe and Path(proc_exe).resolve() == normalized_path
-                    
-                    if name_match or path_match:
-                        # 检查进程是否是最近启动的（15秒内）
-                        if time.time() - proc.create_time() < 15:
-                            candidate_processes.append((proc.info['create_time'], proc.pid, proc_name))
+                    if plan.matches_process(proc_name, proc_exe):
+                        existing_candidates.append((proc.info['create_time'], proc.pid, proc_name))
                 except (psutil.NoSuchProcess, psutil.AccessDenied, OSError, AttributeError):
                     continue
             
-            # 对于多进程程序（浏览器等），只添加最早启动的进程（主进程）
-            if candidate_processes:
-                # 按创建时间排序，取最早的那个
-                candidate_processes.sort(key=lambda x: x[0])
-                earliest_pid = candidate_processes[0][1]
-                earliest_name = candidate_processes[0][2]
+            if existing_candidates:
+                # 找到现有进程，选择最早启动的（主进程）
+                existing_candidates.sort(key=lambda x: x[0])
+                earliest_pid = existing_candidates[0][1]
+                earliest_name = existing_candidates[0][2]
                 
-                try:
-                    ps_process = psutil.Process(earliest_pid)
-                    if ps_process not in self.running_processes:
-                        self.running_processes.append(ps_process)
-                        self.logger.info(f"已添加到监控列表: {earliest_name} (PID: {earliest_pid}, 主进程)")
-                        new_processes_found = 1
-                except (psutil.NoSuchProcess, psutil.AccessDenied):
-                    pass
-            else:
-                # 没有找到新进程，可能是浏览器已经在运行，只是打开了新窗口
-                # 尝试找到现有的匹配进程并添加到监控列表
-                self.logger.debug(f"未找到新进程，尝试查找现有的 {program_name} 进程")
-                existing_candidates = []
-                
-                for proc in psutil.process_iter(['name', 'exe', 'create_time', 'pid']):
-                    try:
-                        proc_name = proc.info.get('name', '').lower()
-                        proc_exe = proc.info.get('exe', '')
-                        
-                        # 匹配条件
-                        name_match = (proc_name == program_name or 
-                                     program_name_without_ext in proc_name or
-                                     proc_name.startswith(program_name_without_ext))
-                        path_match = proc_exe and Path(proc_exe).resolve() == normalized_path
-                        
-                        if name_match or path_match:
-                            existing_candidates.append((proc.info['create_time'], proc.pid, proc_name))
-                    except (psutil.NoSuchProcess, psutil.AccessDenied, OSError, AttributeError):
-                        continue
-                
-                if existing_candidates:
-                    # 找到现有进程，选择最早启动的（主进程）
-                    existing_candidates.sort(key=lambda x: x[0])
-                    earliest_pid = existing_candidates[0][1]
-                    earliest_name = existing_candidates[0][2]
-                    
-                    try:
-                        ps_process = psutil.Process(earliest_pid)
-                        if ps_process not in self.running_processes:
-                            self.running_processes.append(ps_process)
-                            self.logger.info(f"已添加到监控列表（现有进程）: {earliest_name} (PID: {earliest_pid}, 主进程)")
-                            new_processes_found = 1
-                        else:
-                            self.logger.debug(f"进程已在监控列表中: {earliest_name} (PID: {earliest_pid})")
-                            new_processes_found = 1  # 虽然没有添加，但进程存在
-                    except (psutil.NoSuchProcess, psutil.AccessDenied):
-                        pass
-            
-            if new_processes_found == 0:
-                self.logger.warning(f"未能找到新启动的进程: {program_name}")
+                if self._track_process(earliest_pid, target_path):
+                    self.logger.info(f"已添加到监控列表（现有进程）: {earliest_name} (PID: {earliest_pid}, 主进程)")
+                else:
+                    self.logger.debug(f"进程已在监控列表中: {earliest_name} (PID: {earliest_pid})")
+                new_processes_found = 1  # 虽然可能没有添加，但进程存在
+        
+        if new_processes_found == 0:
+            self.logger.warning(f"未能找到新启动的进程: {program_name}")
 
-        except Exception as e:
-            self.logger.error(f"启动失败: {e}")
+        discovery_ms = (time.perf_counter() - started) * 1000
+        return spawn_ms, discovery_ms, new_processes_found > 0
 
     def start(self) -> tuple[bool, str]:
         """
@@ -294,23 +861,30 @@ class HotkeyManager:
         self.is_running = True
         failed_hotkeys = []
 
-        # 注册所有快捷键
-        for hotkey, program_path in self.hotkeys.items():
-            try:
-                keyboard.add_hotkey(hotkey, lambda p=program_path: self.launch_program(p))
-                self.logger.info(f"注册快捷键: {hotkey}")
-            except Exception as e:
-                self.logger.error(f"注册快捷键失败 {hotkey}: {e}")
-                failed_hotkeys.append(hotkey)
+        # 注册公共绑定、切换快捷键和当前方案的绑定（其他方案的绑定不进入钩子）
+        with self._profile_lock:
+            for hotkey in list(self.binding_options):
+                if self._register(hotkey):
+                    self.logger.info(f"注册快捷键: {hotkey}")
+                else:
+                    failed_hotkeys.append(hotkey)
 
         # 启动进程监控线程
-        monitor_thread = threading.Thread(target=self._monitor_processes, daemon=True)
-        monitor_thread.start()
+        self._monitor_stop = threading.Event()
+        self._monitor_thread = threading.Thread(target=self._monitor_processes, args=(self._monitor_stop,),
+                                                daemon=True, name="ProcessMonitor")
+        self._monitor_thread.start()
+
+        self.prefetcher.start()
+        self.resource_monitor.start()
+        self.hook_health.start()
+        if self.launcher is not None:
+            self.launcher.start()
 
         self.logger.info("快捷键监听已启动")
         
         if failed_hotkeys:
-            msg = f"部分快捷键注册失败: {', '.join(failed_hotkeys)}"
+            msg = f"部分快捷键注册失败: {', '.join(str(h) for h in failed_hotkeys)}"
             return False, msg
         
         return True, "监听启动成功"
@@ -323,49 +897,76 @@ class HotkeyManager:
 
         self.logger.info("开始停止快捷键监听")
         self.is_running = False
+        self._monitor_stop.set()
+        self._monitor_thread = None
+        self.prefetcher.stop()
+        self.resource_monitor.stop()
+        self.hook_health.stop()
+        if self.launcher is not None:
+            self.launcher.stop()
 
         # 移除所有快捷键
         removed_count = 0
-        for hotkey in self.hotkeys.keys():
-            try:
-                keyboard.remove_hotkey(hotkey)
-                removed_count += 1
-                self.logger.debug(f"已注销快捷键: {hotkey}")
-            except Exception as e:
-                self.logger.warning(f"注销快捷键失败 {hotkey}: {e}")
+        with self._profile_lock:
+            for hotkey in list(self._registered):
+                if self._unregister(hotkey):
+                    removed_count += 1
 
         self.logger.info(f"快捷键监听已停止，共注销 {removed_count} 个快捷键")
 
-    def _monitor_processes(self):
-        """监控已启动的进程"""
-        while self.is_running:
-            # 清理已结束的进程，同时处理可能的异常
-            filtered_processes = []
-            for p in self.running_processes:
-                try:
-                    if p.is_running():
-                        filtered_processes.append(p)
-                except (psutil.NoSuchProcess, psutil.AccessDenied, OSError, Exception):
-                    # 进程不存在、无法访问或其他异常，跳过
-                    pass
+    def apply_launcher_settings(self, settings: dict):
+        """
+        启用或关闭启动器辅助进程（仅 Linux，默认关闭）
 
-            self.running_processes = filtered_processes
-            time.sleep(5)
+        latency_bench 实测经辅助进程创建子进程比直接创建更慢（创建进程中位数约 2.1 ms 对 1.7 ms），
+        也还没有测到主进程 fork 时的内存峰值差异，因此只在明确配置时启用，
+        可用 latency_bench.py --launcher-helper 对比。监听运行中切换时立即生效
+        """
+        enabled = bool(settings.get('enabled', False))
+        if enabled and not LauncherHelper.is_supported():
+            self.logger.warning("启动器辅助进程仅支持 Linux，已忽略")
+            enabled = False
+        if enabled == (self.launcher is not None):
+            return
+        if enabled:
+            launcher = LauncherHelper(self.logger)
+            if self.is_running:
+                launcher.start()
+            self.launcher = launcher
+            self.logger.info("已启用启动器辅助进程")
+        else:
+            # 正在进行的请求会收到 LauncherUnavailable 并改为直接启动
+            launcher, self.launcher = self.launcher, None
+            launcher.stop()
+            self.logger.info("已关闭启动器辅助进程")
 
-    def get_running_count(self) -> int:
-        """获取正在运行的程序数量"""
-        # 过滤掉已结束的进程，同时处理可能的异常
-        filtered_processes = []
-        for p in self.running_processes:
+    def shutdown(self):
+        """
+        程序退出时调用：停止监听，关闭启动线程池（不等待进行中的启动），
+        写完启动历史和状态日志。之后触发的快捷键和快速启动都被忽略
+        """
+        self.stop()
+        self._launch_executor.shutdown(wait=False)
+        self.launch_history.close()
+        self.state_journal.close()
+
+    def _monitor_processes(self, stop_event: threading.Event):
+        """监控已启动的程序组（stop 后立即退出，快速重启监听不会留下多个监控线程）"""
+        while not stop_event.is_set():
+            # 收集新出现的子进程，清理已全部结束的程序组
+            self.process_registry.refresh()
+            # 目标被替换、删除或重新出现时重新编译启动计划
             try:
-                if p.is_running():
-                    filtered_processes.append(p)
-            except (psutil.NoSuchProcess, psutil.AccessDenied, OSError, Exception):
-                # 进程不存在、无法访问或其他异常，跳过
-                self.logger.debug("检查进程状态时发生异常，跳过该进程")
-
-        self.running_processes = filtered_processes
-        return len(self.running_processes)
+                recompiled = self.launch_plans.revalidate()
+                if recompiled:
+                    self.logger.debug(f"已重新编译 {recompiled} 个启动计划")
+            except Exception as e:
+                self.logger.error(f"检查启动计划失败: {e}")
+            stop_event.wait(5)
+
+    def get_running_count(self) -> int:
+        """获取正在运行的程序数量（按程序组计数，一个程序的多个子进程只算一个）"""
+        return self.process_registry.prune(lambda group: group.is_alive())
 
     def __del__(self):
         """析构函数，确保停止监听"""
@@ -0,0 +1,245 @@
+"""
+快捷键列表的模型 / 视图组件
+用 QAbstractTableModel 保存绑定数据，删除按钮由委托绘制，不为每行创建控件
+"""
+from typing import Dict, Iterable, List, Optional
+from PyQt5.QtCore import (Qt, QAbstractTableModel, QModelIndex, QRect, QRectF, QEvent,
+                          QSortFilterProxyModel, pyqtSignal as Signal)
+from PyQt5.QtGui import QColor, QFont, QPainter
+from PyQt5.QtWidgets import QStyledItemDelegate, QStyle
+from hotkey import Hotkey
+
+COLUMN_HOTKEY = 0
+COLUMN_PATH = 1
+COLUMN_MODE = 2
+COLUMN_LATENCY = 3
+COLUMN_ACTION = 4
+
+HEADERS = ["快捷键", "目标路径", "模式", "启动耗时 p50/p95/p99", "操作"]
+
+ROW_HEIGHT = 60
+
+# 绑定模式
+MODE_LAUNCH = "launch"
+MODE_FOCUS = "focus"
+MODE_WORKSPACE = "workspace"
+MODE_PROFILE = "profile"
+MODE_PALETTE = "palette"
+MODE_LABELS = {MODE_LAUNCH: "启动", MODE_FOCUS: "切换窗口", MODE_WORKSPACE: "工作区",
+               MODE_PROFILE: "切换方案", MODE_PALETTE: "快速启动"}
+
+# data() 返回该行 Hotkey 对象的角色
+HOTKEY_ROLE = Qt.UserRole + 1
+
+
+class HotkeyTableModel(QAbstractTableModel):
+    """
+    快捷键绑定表格模型
+
+    每行只保存 [Hotkey, 目标路径, 模式]，显示文本在 data() 中按需生成，
+    字体等共享对象只创建一次。
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._rows: List[list] = []
+        # 快捷键 -> 行号
+        self._row_index: Dict[Hotkey, int] = {}
+        # 目标路径 -> {百分位: 毫秒}
+        self._latency: Dict[str, Dict[float, float]] = {}
+        self._bold_font = QFont()
+        self._bold_font.setBold(True)
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(HEADERS)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if orientation == Qt.Horizontal and role == Qt.DisplayRole:
+            return HEADERS[section]
+        return None
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        hotkey, path, mode = self._rows[index.row()]
+        column = index.column()
+
+        if role == Qt.DisplayRole:
+            if column == COLUMN_HOTKEY:
+                return hotkey.display()
+            if column == COLUMN_PATH:
+                return path
+            if column == COLUMN_MODE:
+                return MODE_LABELS.get(mode, mode)
+            if column == COLUMN_LATENCY:
+                values = self._latency.get(path)
+                if not values:
+                    return "-"
+                return " / ".join(f"{values[p]:.0f}" for p in (50, 95, 99)) + " ms"
+            if column == COLUMN_ACTION:
+                return "删除"
+        elif role == Qt.UserRole:
+            # 排序键：耗时列按 p50 数值排序，没有数据的排在最后
+            if column == COLUMN_LATENCY:
+                values = self._latency.get(path)
+                return values[50] if values else float("inf")
+            if column == COLUMN_MODE:
+                return mode
+            if column == COLUMN_ACTION:
+                return 0
+            return str(hotkey) if column == COLUMN_HOTKEY else path.lower()
+        elif role == HOTKEY_ROLE:
+            return hotkey
+        elif role == Qt.FontRole and column == COLUMN_HOTKEY:
+            return self._bold_font
+        elif role == Qt.ToolTipRole and column == COLUMN_PATH:
+            return path
+        return None
+
+    def set_bindings(self, bindings: Iterable[tuple]):
+        """一次性替换全部绑定 [(快捷键, 路径, 模式), ...]，只触发一次模型重置"""
+        self.beginResetModel()
+        self._rows = [[Hotkey.parse(hotkey), path, mode] for hotkey, path, mode in bindings]
+        self._rebuild_index()
+        self.endResetModel()
+
+    def add_binding(self, hotkey, path: str, mode: str = MODE_LAUNCH):
+        """添加或覆盖一行（同一组合的不同写法视为同一行）"""
+        hotkey = Hotkey.parse(hotkey)
+        row = self._row_index.get(hotkey)
+        if row is not None:
+            self._rows[row] = [hotkey, path, mode]
+            self.dataChanged.emit(self.index(row, 0), self.index(row, len(HEADERS) - 1))
+            return
+        row = len(self._rows)
+        self.beginInsertRows(QModelIndex(), row, row)
+        self._rows.append([hotkey, path, mode])
+        self._row_index[hotkey] = row
+        self.endInsertRows()
+
+    def remove_hotkeys(self, hotkeys: Iterable):
+        """删除若干快捷键对应的行"""
+        parsed = set(Hotkey.try_parse(h) for h in hotkeys)
+        rows = sorted((self._row_index[h] for h in parsed if h in self._row_index), reverse=True)
+        if not rows:
+            return
+        if len(rows) == 1:
+            self.beginRemoveRows(QModelIndex(), rows[0], rows[0])
+            del self._rows[rows[0]]
+            self._rebuild_index()
+            self.endRemoveRows()
+            return
+        # 批量删除时一次重置，避免逐行通知视图
+        self.beginResetModel()
+        for row in rows:
+            del self._rows[row]
+        self._rebuild_index()
+        self.endResetModel()
+
+    def hotkey_at(self, row: int) -> Optional[Hotkey]:
+        if 0 <= row < len(self._rows):
+            return self._rows[row][0]
+        return None
+
+    def set_latency(self, stats: Dict[str, Dict[float, float]]):
+        """更新启动耗时列"""
+        self._latency = stats
+        if self._rows:
+            self.dataChanged.emit(self.index(0, COLUMN_LATENCY),
+                                  self.index(len(self._rows) - 1, COLUMN_LATENCY),
+                                  [Qt.DisplayRole, Qt.UserRole])
+
+    def _rebuild_index(self):
+        self._row_index = {row[0]: i for i, row in enumerate(self._rows)}
+
+
+class HotkeyFilterProxy(QSortFilterProxyModel):
+    """按快捷键或目标路径做增量搜索（不区分大小写），并按 UserRole 排序"""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setFilterCaseSensitivity(Qt.CaseInsensitive)
+        self.setSortRole(Qt.UserRole)
+        self._needle = ""
+
+    def set_search_text(self, text: str):
+        self._needle = text.strip().lower()
+        self.invalidateFilter()
+
+    def filterAcceptsRow(self, source_row, source_parent):
+        if not self._needle:
+            return True
+        model = self.sourceModel()
+        hotkey = model.index(source_row, COLUMN_HOTKEY, source_parent).data(Qt.DisplayRole).lower()
+        path = model.index(source_row, COLUMN_PATH, source_parent).data(Qt.UserRole)
+        return self._needle in hotkey or self._needle in path
+
+
+class DeleteButtonDelegate(QStyledItemDelegate):
+    """
+    在"操作"列绘制删除按钮
+
+    点击时按当前索引映射回源模型的快捷键发出信号，行号不会因其他行删除而失效。
+    """
+
+    delete_requested = Signal(object)
+
+    BUTTON_WIDTH = 72
+    BUTTON_HEIGHT = 36
+    COLOR_NORMAL = QColor("#EF4444")
+    COLOR_HOVER = QColor("#DC2626")
+    COLOR_PRESSED = QColor("#B91C1C")
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._pressed_key = None
+        self._font = QFont()
+        self._font.setBold(True)
+
+    def _button_rect(self, cell: QRect) -> QRect:
+        width = min(self.BUTTON_WIDTH, cell.width() - 8)
+        height = min(self.BUTTON_HEIGHT, cell.height() - 8)
+        return QRect(cell.x() + (cell.width() - width) // 2,
+                     cell.y() + (cell.height() - height) // 2, width, height)
+
+    def paint(self, painter: QPainter, option, index):
+        rect = self._button_rect(option.rect)
+        key = (index.row(), index.column())
+        if self._pressed_key == key:
+            color = self.COLOR_PRESSED
+        elif option.state & QStyle.State_MouseOver:
+            color = self.COLOR_HOVER
+        else:
+            color = self.COLOR_NORMAL
+
+        painter.save()
+        painter.setRenderHint(QPainter.Antialiasing)
+        painter.setPen(Qt.NoPen)
+        painter.setBrush(color)
+        painter.drawRoundedRect(QRectF(rect), 6, 6)
+        painter.setPen(QColor("#FFFFFF"))
+        painter.setFont(self._font)
+        painter.drawText(rect, Qt.AlignCenter, index.data(Qt.DisplayRole) or "删除")
+        painter.restore()
+
+    def editorEvent(self, event, model, option, index):
+        event_type = event.type()
+        if event_type not in (QEvent.MouseButtonPress, QEvent.MouseButtonRelease):
+            return False
+        if event.button() != Qt.LeftButton:
+            return False
+        inside = self._button_rect(option.rect).contains(event.pos())
+        key = (index.row(), index.column())
+        if event_type == QEvent.MouseButtonPress:
+            self._pressed_key = key if inside else None
+            return inside
+        clicked = inside and self._pressed_key == key
+        self._pressed_key = None
+        if clicked:
+            hotkey = index.data(HOTKEY_ROLE)
+            if hotkey is not None:
+                self.delete_requested.emit(hotkey)
+        return clicked
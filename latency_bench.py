@@ -0,0 +1,310 @@
+"""
+快捷键到启动的端到端延迟测试
+通过假键盘后端向 HotkeyManager 注入合成按键，在 Linux 上启动真实的轻量子进程，
+测量 按键 -> 分派 -> 创建进程 -> 加入跟踪 -> 运行数量更新 的完整耗时，
+按绑定数量、系统进程数和触发频率组合输出延迟分布，超出百分位预算时以非零状态退出。
+
+用法:
+    python latency_bench.py
+    python latency_bench.py --bindings 10,500 --processes 0,1000 --rates 5,50 --presses 200 \\
+        --budget p95=80 --budget p99=200
+"""
+import argparse
+import logging
+import os
+import queue
+import shutil
+import signal
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+from launch_history import percentile
+
+STAGES = ("dispatch", "spawn", "tracked", "total")
+DEFAULT_BUDGETS = {"p95": 150.0, "p99": 400.0}
+
+
+class FakeKeyboard:
+    """
+    代替 keyboard 库的假后端
+
+    add_hotkey / remove_hotkey 与 keyboard 库接口一致；press() 记录按键时刻后
+    交给单独的钩子线程调用回调，与 keyboard 在监听线程中调用回调的方式相同。
+    """
+
+    def __init__(self):
+        self._callbacks: Dict[str, Callable[[], None]] = {}
+        self._queue: "queue.Queue[Optional[str]]" = queue.Queue()
+        self._thread = threading.Thread(target=self._hook_loop, daemon=True, name="FakeKeyboardHook")
+        self._thread.start()
+        self.unknown = 0
+
+    def add_hotkey(self, text: str, callback: Callable[[], None]):
+        self._callbacks[text] = callback
+
+    def remove_hotkey(self, text: str):
+        if self._callbacks.pop(text, None) is None:
+            raise KeyError(text)
+
+    def press(self, text: str):
+        self._queue.put(text)
+
+    def close(self):
+        self._queue.put(None)
+        self._thread.join(timeout=2)
+
+    def _hook_loop(self):
+        while True:
+            text = self._queue.get()
+            if text is None:
+                return
+            callback = self._callbacks.get(text)
+            if callback is None:
+                self.unknown += 1
+                continue
+            callback()
+
+
+class _Sample:
+    __slots__ = ('pressed', 'dispatched', 'spawn_ms', 'tracked', 'counted', 'done')
+
+    def __init__(self, pressed: float):
+        self.pressed = pressed
+        self.dispatched = self.tracked = self.counted = 0.0
+        self.spawn_ms = 0.0
+        self.done = threading.Event()
+
+    def stages(self) -> Dict[str, float]:
+        return {
+            "dispatch": (self.dispatched - self.pressed) * 1000,
+            "spawn": self.spawn_ms,
+            "tracked": (self.tracked - self.pressed) * 1000,
+            "total": (self.counted - self.pressed) * 1000,
+        }
+
+
+def _make_targets(directory: str, count: int, lifetime_seconds: float) -> List[str]:
+    """生成 count 个不同路径的轻量目标脚本（运行 lifetime_seconds 秒后退出）"""
+    paths = []
+    for i in range(count):
+        path = os.path.join(directory, f"target_{i}.sh")
+        with open(path, "w") as f:
+            f.write(f"#!/bin/sh\nexec sleep {lifetime_seconds}\n")
+        os.chmod(path, 0o755)
+        paths.append(path)
+    return paths
+
+
+def _spawn_background(count: int) -> List[subprocess.Popen]:
+    """占位进程，用于放大系统进程表"""
+    return [subprocess.Popen(["sleep", "600"], stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL,
+                             stderr=subprocess.DEVNULL, start_new_session=True)
+            for _ in range(count)]
+
+
+def run_scenario(bindings: int, processes: int, rate: float, presses: int,
+                 timeout: float = 10.0, launcher_helper: bool = False) -> Tuple[Dict[str, List[float]], int]:
+    """
+    运行一组参数，返回 (各阶段的耗时列表（毫秒）, 未完成的按键数)
+    launcher_helper: 经启动器辅助进程创建子进程（默认直接创建）
+    """
+    from hotkey import Hotkey
+    from hotkey_manager import HotkeyManager
+
+    class BenchHotkeyManager(HotkeyManager):
+        # 测试环境不要求管理员权限
+        def is_admin(self) -> bool:
+            return True
+
+    workdir = tempfile.mkdtemp(prefix="pqs_bench_")
+    background = _spawn_background(processes)
+    keyboard = FakeKeyboard()
+    manager = None
+    samples: List[_Sample] = []
+    try:
+        targets = _make_targets(workdir, bindings, lifetime_seconds=2)
+        manager = BenchHotkeyManager(keyboard_backend=keyboard)
+        manager.apply_launcher_settings({'enabled': launcher_helper})
+        hotkeys = []
+        for i, path in enumerate(targets):
+            hotkey = Hotkey.parse(f"ctrl+alt+shift+win+{i}")
+            success, msg = manager.add_hotkey(hotkey, path, cooldown_ms=0)
+            if not success:
+                raise RuntimeError(msg)
+            hotkeys.append((str(hotkey), path))
+        success, msg = manager.start()
+        if not success:
+            raise RuntimeError(msg)
+
+        # 目标路径 -> 当前正在测量的样本（目标各不相同，按键轮流使用各绑定）
+        current: Dict[str, _Sample] = {}
+        lock = threading.Lock()
+
+        trigger_binding = manager.trigger_binding
+
+        def traced_trigger(hotkey):
+            sample = current.get(manager.hotkeys.get(hotkey))
+            if sample is not None:
+                sample.dispatched = time.perf_counter()
+            trigger_binding(hotkey)
+
+        # 加入跟踪（on_group_changed）先于写启动历史（record）发生，样本在写历史时完成
+        on_group_changed = manager.process_registry.on_group_changed
+
+        def traced_group_changed(group):
+            sample = current.get(group.target_path)
+            if sample is not None and not sample.tracked:
+                sample.tracked = time.perf_counter()
+                manager.get_running_count()
+                sample.counted = time.perf_counter()
+            if on_group_changed is not None:
+                on_group_changed(group)
+
+        record = manager.launch_history.record
+
+        def traced_record(hotkey, target, target_type, spawn_ms, discovery_ms, outcome, prefetched=None):
+            with lock:
+                sample = current.pop(target, None)
+            if sample is not None:
+                sample.spawn_ms = spawn_ms
+                if sample.tracked:
+                    sample.done.set()
+            record(hotkey, target, target_type, spawn_ms, discovery_ms, outcome, prefetched)
+
+        manager.trigger_binding = traced_trigger
+        manager.launch_history.record = traced_record
+        manager.process_registry.on_group_changed = traced_group_changed
+
+        interval = 1.0 / rate
+        next_press = time.perf_counter()
+        for i in range(presses):
+            hotkey, path = hotkeys[i % len(hotkeys)]
+            delay = next_press - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            next_press += interval
+            sample = _Sample(time.perf_counter())
+            with lock:
+                if path in current:
+                    # 同一目标上一次尚未完成（绑定数少于并发数），跳过
+                    continue
+                current[path] = sample
+            samples.append(sample)
+            keyboard.press(hotkey)
+
+        deadline = time.monotonic() + timeout
+        for sample in samples:
+            sample.done.wait(max(0.0, deadline - time.monotonic()))
+    finally:
+        if manager is not None:
+            manager.stop()
+            for group in manager.process_groups:
+                try:
+                    os.killpg(group.pgid or group.root_pid, signal.SIGKILL)
+                except (OSError, TypeError):
+                    pass
+            manager.shutdown()
+        keyboard.close()
+        for proc in background:
+            proc.kill()
+            proc.wait()
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    results: Dict[str, List[float]] = {stage: [] for stage in STAGES}
+    missed = 0
+    for sample in samples:
+        if not sample.done.is_set():
+            missed += 1
+            continue
+        for stage, value in sample.stages().items():
+            results[stage].append(value)
+    return results, missed
+
+
+def _parse_list(text: str, cast=int) -> list:
+    return [cast(item) for item in text.split(",") if item.strip()]
+
+
+def _parse_budgets(items: Optional[List[str]]) -> Dict[str, float]:
+    if not items:
+        return dict(DEFAULT_BUDGETS)
+    budgets = {}
+    for item in items:
+        name, _, value = item.partition("=")
+        name = name.strip().lower()
+        if not name.startswith("p") or not value:
+            raise argparse.ArgumentTypeError(f"预算格式应为 p95=100: {item}")
+        float(name[1:])
+        budgets[name] = float(value)
+    return budgets
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="快捷键到启动的端到端延迟测试（仅 Linux）")
+    parser.add_argument("--bindings", default="10,200", help="绑定数量，逗号分隔")
+    parser.add_argument("--processes", default="0,500", help="额外占位进程数量，逗号分隔")
+    parser.add_argument("--rates", default="5,40", help="每秒触发次数，逗号分隔")
+    parser.add_argument("--presses", type=int, default=100, help="每组参数的按键次数")
+    parser.add_argument("--budget", action="append",
+                        help="总耗时百分位预算（毫秒），如 p95=150，可重复；默认 p95=150 p99=400")
+    parser.add_argument("--launcher-helper", action="store_true", help="经启动器辅助进程创建子进程")
+    args = parser.parse_args(argv)
+
+    if not sys.platform.startswith("linux"):
+        print("延迟测试需要在 Linux 上运行（启动真实子进程并跟踪进程组）")
+        return 2
+    budgets = _parse_budgets(args.budget)
+
+    # 测试在临时目录中运行，日志、统计和数据库不写入工作目录
+    run_dir = tempfile.mkdtemp(prefix="pqs_bench_run_")
+    previous_cwd = os.getcwd()
+    os.chdir(run_dir)
+    failures = []
+    try:
+        from logger import Logger
+        Logger().logger.setLevel(logging.WARNING)
+
+        header = f"{'绑定':>6} {'进程':>6} {'频率':>6} {'完成':>6} " + " ".join(
+            f"{stage + ' p50/p95/p99':>24}" for stage in STAGES)
+        print(header)
+        for bindings in _parse_list(args.bindings):
+            for processes in _parse_list(args.processes):
+                for rate in _parse_list(args.rates, float):
+                    results, missed = run_scenario(bindings, processes, rate, args.presses,
+                                                    launcher_helper=args.launcher_helper)
+                    cells = []
+                    for stage in STAGES:
+                        values = sorted(results[stage])
+                        cells.append("/".join(f"{percentile(values, p):.1f}" for p in (50, 95, 99)))
+                    done = len(results["total"])
+                    print(f"{bindings:>6} {processes:>6} {rate:>6g} {done:>6} "
+                          + " ".join(f"{cell:>24}" for cell in cells))
+
+                    totals = sorted(results["total"])
+                    scenario = f"绑定 {bindings} / 进程 {processes} / 频率 {rate:g}"
+                    if missed:
+                        failures.append(f"{scenario}: {missed} 次按键在超时内没有完成")
+                    for name, budget in budgets.items():
+                        value = percentile(totals, float(name[1:]))
+                        if value > budget:
+                            failures.append(f"{scenario}: 总耗时 {name} = {value:.1f} ms，超出预算 {budget:g} ms")
+    finally:
+        # 回到调用方原来的工作目录（作为模块调用时不能留在系统临时目录中）
+        os.chdir(previous_cwd)
+        shutil.rmtree(run_dir, ignore_errors=True)
+
+    if failures:
+        print("\n超出预算:")
+        for failure in failures:
+            print(f"  {failure}")
+        return 1
+    print("\n全部在预算内: " + ", ".join(f"{name} <= {budget:g} ms" for name, budget in budgets.items()))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,227 @@
+"""
+启动历史模块
+把每次启动的耗时和结果写入 SQLite，并提供按目标统计的延迟百分位
+"""
+import queue
+import sqlite3
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+from logger import Logger
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS launches (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    ts REAL NOT NULL,
+    hotkey TEXT NOT NULL,
+    target TEXT NOT NULL,
+    target_type TEXT NOT NULL,
+    spawn_ms REAL NOT NULL,
+    discovery_ms REAL NOT NULL,
+    outcome TEXT NOT NULL,
+    prefetched INTEGER
+);
+CREATE INDEX IF NOT EXISTS idx_launches_target_ts ON launches (target, ts);
+"""
+
+# 启动结果
+OUTCOME_OK = "ok"
+OUTCOME_NOT_FOUND = "not_found"    # 已启动但未找到对应进程
+OUTCOME_FOCUSED = "focused"        # 目标已在运行，切换到窗口
+OUTCOME_MISSING = "missing"        # 目标不存在
+OUTCOME_ERROR = "error"
+
+# 旧版本数据库缺少的列: 列名 -> 类型
+_ADDED_COLUMNS = {"prefetched": "INTEGER"}
+
+
+def percentile(sorted_values: List[float], p: float) -> float:
+    """线性插值百分位（输入需已排序）"""
+    if not sorted_values:
+        return 0.0
+    if len(sorted_values) == 1:
+        return sorted_values[0]
+    rank = (len(sorted_values) - 1) * p / 100.0
+    lower = int(rank)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    fraction = rank - lower
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * fraction
+
+
+class LaunchHistory:
+    """
+    启动历史存储
+
+    record() 只把记录放进队列，由后台线程批量写入，不阻塞快捷键回调。
+    """
+
+    BATCH_SIZE = 100
+    FLUSH_INTERVAL_SECONDS = 1.0
+
+    def __init__(self, db_file: str = "launch_history.db"):
+        self.db_file = db_file
+        self.logger = Logger()
+        self._queue: "queue.Queue[Optional[tuple]]" = queue.Queue()
+        self._read_lock = threading.Lock()
+        self._read_conn: Optional[sqlite3.Connection] = None
+        self._writer = threading.Thread(target=self._write_loop, daemon=True, name="LaunchHistoryWriter")
+        self._ready = threading.Event()
+        self._writer.start()
+
+    def record(self, hotkey, target: str, target_type: str,
+               spawn_ms: float, discovery_ms: float, outcome: str, prefetched: Optional[bool] = None):
+        """
+        记录一次启动（hotkey 可以是字符串或 Hotkey）
+        prefetched: 触发时目标是否已在后台预读；网页、文件夹等不适用时为 None
+        """
+        self._queue.put((time.time(), str(hotkey) if hotkey else "", target, target_type,
+                         float(spawn_ms), float(discovery_ms), outcome,
+                         None if prefetched is None else int(bool(prefetched))))
+
+    def flush(self, timeout: float = 5.0):
+        """等待队列中的记录写入完成"""
+        done = threading.Event()
+        self._queue.put(done)
+        done.wait(timeout)
+
+    def close(self):
+        """写完剩余记录后停止后台线程"""
+        self._queue.put(None)
+        self._writer.join(timeout=5)
+        with self._read_lock:
+            if self._read_conn is not None:
+                self._read_conn.close()
+                self._read_conn = None
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_file, timeout=5, check_same_thread=False)
+        # WAL 模式下读写互不阻塞
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    def _write_loop(self):
+        try:
+            conn = self._connect()
+            conn.executescript(_SCHEMA)
+            self._migrate(conn)
+            conn.commit()
+        except sqlite3.Error as e:
+            self.logger.error(f"初始化启动历史数据库失败: {e}")
+            self._ready.set()
+            # 数据库不可用时仍消费队列，避免记录无限堆积
+            while self._queue.get() is not None:
+                pass
+            return
+        self._ready.set()
+
+        running = True
+        while running:
+            batch = []
+            waiters = []
+            item = self._queue.get()
+            deadline = time.monotonic() + self.FLUSH_INTERVAL_SECONDS
+            while True:
+                if item is None:
+                    running = False
+                elif isinstance(item, threading.Event):
+                    waiters.append(item)
+                else:
+                    batch.append(item)
+                if not running or waiters or len(batch) >= self.BATCH_SIZE:
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+
+            if batch:
+                try:
+                    conn.executemany(
+                        "INSERT INTO launches (ts, hotkey, target, target_type, spawn_ms, discovery_ms, outcome, "
+                        "prefetched) VALUES (?, ?, ?, ?, ?, ?, ?, ?)", batch
+                    )
+                    conn.commit()
+                except sqlite3.Error as e:
+                    self.logger.error(f"写入启动历史失败: {e}")
+            for waiter in waiters:
+                waiter.set()
+        conn.close()
+
+    @staticmethod
+    def _migrate(conn: sqlite3.Connection):
+        """给旧版本创建的数据库补上新增的列"""
+        existing = {row[1] for row in conn.execute("PRAGMA table_info(launches)")}
+        for column, column_type in _ADDED_COLUMNS.items():
+            if column not in existing:
+                conn.execute(f"ALTER TABLE launches ADD COLUMN {column} {column_type}")
+
+    def _query(self, sql: str, params: Iterable = ()) -> List[tuple]:
+        self._ready.wait(5)
+        with self._read_lock:
+            try:
+                if self._read_conn is None:
+                    self._read_conn = self._connect()
+                return self._read_conn.execute(sql, tuple(params)).fetchall()
+            except sqlite3.Error as e:
+                self.logger.error(f"查询启动历史失败: {e}")
+                return []
+
+    def percentiles(self, target: str, percents: Tuple[float, ...] = (50, 95, 99),
+                    limit: int = 1000) -> Dict[float, float]:
+        """单个目标最近 limit 次成功启动的总耗时（spawn + discovery，毫秒）百分位"""
+        rows = self._query(
+            "SELECT spawn_ms + discovery_ms FROM launches WHERE target = ? AND outcome = ? "
+            "ORDER BY ts DESC LIMIT ?",
+            (target, OUTCOME_OK, limit)
+        )
+        values = sorted(row[0] for row in rows)
+        return {p: percentile(values, p) for p in percents} if values else {}
+
+    def percentiles_by_target(self, percents: Tuple[float, ...] = (50, 95, 99),
+                              since_days: float = 30) -> Dict[str, Dict[float, float]]:
+        """所有目标在最近 since_days 天内成功启动的耗时百分位"""
+        rows = self._query(
+            "SELECT target, spawn_ms + discovery_ms FROM launches WHERE ts >= ? AND outcome = ?",
+            (time.time() - since_days * 86400, OUTCOME_OK)
+        )
+        grouped: Dict[str, List[float]] = {}
+        for target, total_ms in rows:
+            grouped.setdefault(target, []).append(total_ms)
+        result = {}
+        for target, values in grouped.items():
+            values.sort()
+            result[target] = {p: percentile(values, p) for p in percents}
+        return result
+
+    def percentiles_by_prefetch(self, percents: Tuple[float, ...] = (50, 95, 99),
+                                since_days: float = 30) -> Dict[bool, dict]:
+        """
+        最近 since_days 天内成功启动的程序按触发时是否已预读分组的耗时百分位
+        返回 {True/False: {'count': 次数, 百分位: 毫秒, ...}}，用于比较预读的效果
+        """
+        rows = self._query(
+            "SELECT prefetched, spawn_ms + discovery_ms FROM launches "
+            "WHERE ts >= ? AND outcome = ? AND prefetched IS NOT NULL",
+            (time.time() - since_days * 86400, OUTCOME_OK)
+        )
+        grouped: Dict[bool, List[float]] = {}
+        for prefetched, total_ms in rows:
+            grouped.setdefault(bool(prefetched), []).append(total_ms)
+        result = {}
+        for prefetched, values in grouped.items():
+            values.sort()
+            stats = {'count': len(values)}
+            stats.update({p: percentile(values, p) for p in percents})
+            result[prefetched] = stats
+        return result
+
+    def outcome_counts(self, target: str) -> Dict[str, int]:
+        """单个目标各启动结果的次数"""
+        rows = self._query(
+            "SELECT outcome, COUNT(*) FROM launches WHERE target = ? GROUP BY outcome", (target,)
+        )
+        return {outcome: count for outcome, count in rows}
@@ -0,0 +1,153 @@
+"""
+快速启动面板模块
+按下全局快捷键弹出的搜索框：输入关键词即时筛选已配置和启动过的目标，回车启动
+"""
+from typing import Callable, List
+from PyQt5.QtWidgets import QDialog, QVBoxLayout, QLineEdit, QListView, QLabel, QAbstractItemView
+from PyQt5.QtCore import Qt, QAbstractListModel, QModelIndex, QEvent
+from PyQt5.QtGui import QColor
+from quick_launch import KIND_WORKSPACE, QuickLaunchEntry
+
+
+class PaletteResultModel(QAbstractListModel):
+    """查询结果（最多 MAX_RESULTS 行，每次查询整体替换）"""
+
+    DETAIL_COLOR = QColor("#64748B")
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._entries: List[QuickLaunchEntry] = []
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._entries)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        entry = self._entries[index.row()]
+        if role == Qt.DisplayRole:
+            text = f"[工作区] {entry.title}" if entry.kind == KIND_WORKSPACE else entry.title
+            hotkeys = entry.hotkey_text()
+            return f"{text}    {hotkeys}" if hotkeys else text
+        if role == Qt.ToolTipRole:
+            return entry.detail
+        return None
+
+    def set_entries(self, entries: List[QuickLaunchEntry]):
+        self.beginResetModel()
+        self._entries = list(entries)
+        self.endResetModel()
+
+    def entry_at(self, row: int):
+        return self._entries[row] if 0 <= row < len(self._entries) else None
+
+
+class LaunchPaletteDialog(QDialog):
+    """
+    快速启动面板
+
+    每次输入变化直接在内存索引中查询（不做任何 IO，数万条目时单次查询也在
+    一帧之内），上下键选择，回车启动，Esc 或失去焦点时隐藏。
+    search_fn(query) 返回条目列表；launch_fn(entry) 负责在后台启动。
+    """
+
+    WIDTH = 560
+    ROW_HEIGHT = 24
+    VISIBLE_ROWS = 10
+
+    def __init__(self, search_fn: Callable[[str], list], launch_fn: Callable[[QuickLaunchEntry], None],
+                 parent=None):
+        super().__init__(parent, Qt.FramelessWindowHint | Qt.WindowStaysOnTopHint | Qt.Tool)
+        self._search_fn = search_fn
+        self._launch_fn = launch_fn
+        self.setFixedWidth(self.WIDTH)
+        self.setStyleSheet("""
+            QDialog { background: #FFFFFF; border: 1px solid #CBD5E1; border-radius: 8px; }
+            QLineEdit { font-size: 16px; padding: 8px; border: none; border-bottom: 1px solid #E2E8F0; }
+            QListView { border: none; font-size: 13px; }
+            QListView::item { padding: 2px 8px; }
+            QListView::item:selected { background: #DBEAFE; color: #1E293B; }
+        """)
+
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(6, 6, 6, 6)
+        self.input = QLineEdit()
+        self.input.setPlaceholderText("输入名称、目录或快捷键，回车启动")
+        self.input.textChanged.connect(self.on_text_changed)
+        self.input.installEventFilter(self)
+        layout.addWidget(self.input)
+
+        self.model = PaletteResultModel(self)
+        self.view = QListView()
+        self.view.setModel(self.model)
+        self.view.setUniformItemSizes(True)
+        self.view.setSelectionMode(QAbstractItemView.SingleSelection)
+        self.view.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.view.setFocusPolicy(Qt.NoFocus)
+        self.view.setFixedHeight(self.ROW_HEIGHT * self.VISIBLE_ROWS + 4)
+        self.view.clicked.connect(lambda index: self.launch_row(index.row()))
+        layout.addWidget(self.view)
+
+        self.empty_label = QLabel("没有匹配的目标")
+        self.empty_label.setStyleSheet("color: #94A3B8; padding: 6px;")
+        self.empty_label.setVisible(False)
+        layout.addWidget(self.empty_label)
+
+    def popup(self):
+        """在当前屏幕上方居中显示并清空输入"""
+        screen = self.screen() if self.parent() is None else self.parent().screen()
+        if screen is not None:
+            area = screen.availableGeometry()
+            self.move(area.x() + (area.width() - self.WIDTH) // 2, area.y() + area.height() // 5)
+        if self.input.text():
+            self.input.clear()
+        else:
+            self.on_text_changed("")
+        self.show()
+        self.raise_()
+        self.activateWindow()
+        self.input.setFocus()
+
+    def on_text_changed(self, text: str):
+        entries = self._search_fn(text)
+        self.model.set_entries(entries)
+        self.empty_label.setVisible(not entries and bool(text.strip()))
+        if entries:
+            self.view.setCurrentIndex(self.model.index(0))
+
+    def move_selection(self, step: int):
+        count = self.model.rowCount()
+        if count == 0:
+            return
+        row = (self.view.currentIndex().row() + step) % count
+        self.view.setCurrentIndex(self.model.index(row))
+
+    def launch_row(self, row: int):
+        entry = self.model.entry_at(row)
+        if entry is None:
+            return
+        self.hide()
+        self._launch_fn(entry)
+
+    def eventFilter(self, obj, event):
+        if obj is self.input and event.type() == QEvent.KeyPress:
+            key = event.key()
+            if key == Qt.Key_Down:
+                self.move_selection(1)
+                return True
+            if key == Qt.Key_Up:
+                self.move_selection(-1)
+                return True
+            if key in (Qt.Key_Return, Qt.Key_Enter):
+                self.launch_row(self.view.currentIndex().row())
+                return True
+            if key == Qt.Key_Escape:
+                self.hide()
+                return True
+        return super().eventFilter(obj, event)
+
+    def event(self, event):
+        # 点击面板外部（失去激活）时隐藏
+        if event.type() == QEvent.WindowDeactivate and self.isVisible():
+            self.hide()
+        return super().event(event)
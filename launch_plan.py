@@ -0,0 +1,144 @@
+"""
+启动计划模块
+绑定加载或修改时把目标预先分类成不可变的启动计划，按下快捷键时直接按计划执行，
+不再判断网址、探测文件类型或解析路径
+"""
+import os
+import stat
+import threading
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Optional
+from process_tracker import is_direct_launchable, normalize_exe_path
+
+# 计划类型（与启动历史中的目标类型一致，目标不存在时为 "file"）
+PLAN_URL = "url"
+PLAN_FOLDER = "folder"
+PLAN_EXE = "exe"
+PLAN_SHELL = "shell"
+PLAN_MISSING = "file"
+
+
+def is_url(target_path: str) -> bool:
+    return target_path.startswith(('http://', 'https://', 'www.'))
+
+
+def file_signature(target_path: str) -> Optional[tuple]:
+    """用于发现目标变化的签名：(是否目录, 修改时间, 大小)，不存在时为 None"""
+    try:
+        st = os.stat(target_path)
+    except OSError:
+        return None
+    return stat.S_ISDIR(st.st_mode), st.st_mtime_ns, st.st_size
+
+
+class LaunchPlan:
+    """
+    一个目标的启动计划（不可变）
+
+    kind 决定由哪个处理函数启动；path 为目标路径对象，exe_key 为规范化路径；
+    program_name / program_stem / resolved_key 供 Shell 启动后匹配新进程使用；
+    signature 为编译时的文件签名，签名变化后计划需要重新编译。
+    """
+
+    __slots__ = ('target_path', 'kind', 'path', 'exe_key', 'program_name', 'program_stem',
+                 'resolved_key', 'signature')
+
+    def __init__(self, target_path: str, kind: str, path: Optional[Path] = None,
+                 signature: Optional[tuple] = None):
+        object.__setattr__(self, 'target_path', target_path)
+        object.__setattr__(self, 'kind', kind)
+        object.__setattr__(self, 'path', path)
+        object.__setattr__(self, 'signature', signature)
+        exe_key = normalize_exe_path(target_path) if path is not None else ""
+        object.__setattr__(self, 'exe_key', exe_key)
+        name = os.path.basename(exe_key).lower()
+        object.__setattr__(self, 'program_name', name)
+        object.__setattr__(self, 'program_stem', os.path.splitext(name)[0])
+        object.__setattr__(self, 'resolved_key', exe_key)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("LaunchPlan 是不可变对象")
+
+    def __repr__(self):
+        return f"LaunchPlan({self.kind}, {self.target_path!r})"
+
+    @classmethod
+    def compile(cls, target_path: str) -> 'LaunchPlan':
+        """对目标做一次分类（只有这里访问文件系统）"""
+        if is_url(target_path):
+            return cls(target_path, PLAN_URL)
+        path = Path(target_path)
+        signature = file_signature(target_path)
+        if signature is None:
+            return cls(target_path, PLAN_MISSING, path)
+        if signature[0]:
+            return cls(target_path, PLAN_FOLDER, path, signature)
+        kind = PLAN_EXE if is_direct_launchable(path) else PLAN_SHELL
+        return cls(target_path, kind, path, signature)
+
+    def matches_process(self, proc_name: str, proc_exe: str) -> bool:
+        """
+        进程是否像是由该目标启动的：进程名与程序名相同或包含程序名（不含扩展名，
+        用于 Chrome/Edge 等），或进程路径与目标路径相同
+        """
+        stem = self.program_stem
+        if proc_name == self.program_name or stem in proc_name or proc_name.startswith(stem):
+            return True
+        return bool(proc_exe) and normalize_exe_path(proc_exe) == self.resolved_key
+
+
+class LaunchPlanCache:
+    """
+    目标路径 -> 启动计划
+
+    get() 只查字典，未编译过的目标才现场编译。revalidate() 在后台线程中
+    逐个比较文件签名，目标被替换、删除或新出现时重新编译，并丢弃不再被
+    任何绑定引用的计划（live_paths 返回当前仍被引用的目标路径）。
+    """
+
+    def __init__(self, live_paths: Optional[Callable[[], Iterable[str]]] = None):
+        self._live_paths = live_paths
+        self._plans: Dict[str, LaunchPlan] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._plans)
+
+    def get(self, target_path: str) -> LaunchPlan:
+        plan = self._plans.get(target_path)
+        if plan is None:
+            plan = self.compile(target_path)
+        return plan
+
+    def compile(self, target_path: str) -> LaunchPlan:
+        """（重新）编译并保存一个目标的计划"""
+        plan = LaunchPlan.compile(target_path)
+        with self._lock:
+            self._plans[target_path] = plan
+        return plan
+
+    def invalidate(self, target_path: str):
+        with self._lock:
+            self._plans.pop(target_path, None)
+
+    def revalidate(self) -> int:
+        """重新编译文件签名有变化的计划，返回重新编译的数量"""
+        with self._lock:
+            plans = list(self._plans.values())
+        if self._live_paths is not None:
+            live = set(self._live_paths())
+            stale = [plan.target_path for plan in plans if plan.target_path not in live]
+            if stale:
+                with self._lock:
+                    for target_path in stale:
+                        self._plans.pop(target_path, None)
+                plans = [plan for plan in plans if plan.target_path in live]
+
+        recompiled = 0
+        for plan in plans:
+            if plan.kind == PLAN_URL:
+                continue
+            if file_signature(plan.target_path) != plan.signature:
+                self.compile(plan.target_path)
+                recompiled += 1
+        return recompiled
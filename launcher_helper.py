@@ -0,0 +1,213 @@
+"""
+启动器辅助进程模块
+Linux 上由一个预先启动的小进程负责创建目标进程，主进程通过管道发送启动请求
+
+主进程加载了 PyQt5，地址空间大、打开的句柄多，直接 fork 再 exec 代价较高；
+辅助进程只加载标准库，从它派生子进程更快，也不会让主进程内存短暂翻倍。
+"""
+import json
+import os
+import signal
+import subprocess
+import sys
+import threading
+import time
+from typing import Dict, Optional
+
+HELPER_ARG = "--launcher-helper"
+
+
+class LauncherUnavailable(Exception):
+    """辅助进程不可用（调用方应改为直接启动）"""
+
+
+def serve(stdin=None, stdout=None) -> int:
+    """
+    辅助进程主循环
+
+    每行一个 JSON 请求 {"id": n, "path": ..., "cwd": ...}，
+    回复 {"id": n, "pid": pid} 或 {"id": n, "error": 说明, "errno": 错误码}。
+    标准输入关闭（主进程退出）时结束。
+    """
+    stdin = stdin or sys.stdin.buffer
+    stdout = stdout or sys.stdout.buffer
+    # 子进程退出后由内核自动回收，辅助进程不保留任何子进程对象
+    signal.signal(signal.SIGCHLD, signal.SIG_IGN)
+    # 主进程被 Ctrl+C 时不跟着退出，由管道关闭决定生命周期
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+    for line in stdin:
+        try:
+            request = json.loads(line)
+        except ValueError:
+            continue
+        reply = {"id": request.get("id")}
+        try:
+            path = request["path"]
+            proc = subprocess.Popen(
+                [path], cwd=request.get("cwd") or None, start_new_session=True, close_fds=True,
+                stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+            )
+            reply["pid"] = proc.pid
+        except OSError as e:
+            reply["error"] = str(e)
+            reply["errno"] = e.errno or 0
+        except Exception as e:
+            reply["error"] = str(e)
+            reply["errno"] = 0
+        stdout.write(json.dumps(reply).encode("utf-8") + b"\n")
+        stdout.flush()
+    return 0
+
+
+class LauncherHelper:
+    """
+    主进程一侧的辅助进程客户端
+
+    spawn() 发送请求并等待 PID 返回；辅助进程意外退出时由读取线程自动重启
+    （有最小间隔限制），重启期间的请求抛出 LauncherUnavailable。
+    """
+
+    REQUEST_TIMEOUT_SECONDS = 5.0
+    RESTART_MIN_INTERVAL_SECONDS = 2.0
+
+    def __init__(self, logger=None):
+        self.logger = logger
+        self._lock = threading.Lock()
+        self._proc: Optional[subprocess.Popen] = None
+        self._next_id = 0
+        # 请求 id -> [完成事件, 回复]
+        self._pending: Dict[int, list] = {}
+        self._stopping = False
+        self._last_start = 0.0
+        self.restart_count = 0
+
+    @staticmethod
+    def is_supported() -> bool:
+        return sys.platform.startswith("linux")
+
+    def _helper_command(self) -> list:
+        if getattr(sys, "frozen", False):
+            # 打包后由主程序入口识别参数，不加载 GUI
+            return [sys.executable, HELPER_ARG]
+        return [sys.executable, os.path.abspath(__file__), HELPER_ARG]
+
+    def start(self) -> bool:
+        """启动辅助进程（已在运行时无操作）"""
+        with self._lock:
+            self._stopping = False
+            return self._start_locked()
+
+    def _start_locked(self) -> bool:
+        if self._proc is not None and self._proc.poll() is None:
+            return True
+        try:
+            self._last_start = time.monotonic()
+            proc = subprocess.Popen(
+                self._helper_command(), stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL, close_fds=True, start_new_session=True
+            )
+        except OSError as e:
+            self._log("warning", f"启动器辅助进程启动失败: {e}")
+            self._proc = None
+            return False
+        self._proc = proc
+        reader = threading.Thread(target=self._read_loop, args=(proc,), daemon=True,
+                                  name="LauncherHelperReader")
+        reader.start()
+        self._log("info", f"启动器辅助进程已启动 (PID: {proc.pid})")
+        return True
+
+    def stop(self):
+        """关闭辅助进程"""
+        with self._lock:
+            self._stopping = True
+            proc = self._proc
+            self._proc = None
+        if proc is None:
+            return
+        try:
+            proc.stdin.close()
+            proc.wait(timeout=2)
+        except Exception:
+            proc.kill()
+        self._fail_pending("启动器辅助进程已停止")
+
+    def spawn(self, path: str, cwd: Optional[str] = None) -> int:
+        """
+        请求辅助进程启动目标，返回 PID
+
+        目标本身无法启动时抛出 OSError；辅助进程不可用时抛出 LauncherUnavailable。
+        """
+        event = threading.Event()
+        with self._lock:
+            if self._stopping:
+                raise LauncherUnavailable("启动器辅助进程已停止")
+            if (self._proc is None or self._proc.poll() is not None) and not self._start_locked():
+                raise LauncherUnavailable("启动器辅助进程不可用")
+            self._next_id += 1
+            request_id = self._next_id
+            slot = [event, None]
+            self._pending[request_id] = slot
+            request = json.dumps({"id": request_id, "path": path, "cwd": cwd}) + "\n"
+            try:
+                self._proc.stdin.write(request.encode("utf-8"))
+                self._proc.stdin.flush()
+            except (OSError, ValueError) as e:
+                self._pending.pop(request_id, None)
+                raise LauncherUnavailable(f"发送启动请求失败: {e}")
+
+        if not event.wait(self.REQUEST_TIMEOUT_SECONDS):
+            self._pending.pop(request_id, None)
+            raise LauncherUnavailable("启动器辅助进程响应超时")
+        reply = slot[1] or {}
+        if "pid" in reply:
+            return int(reply["pid"])
+        if reply.get("unavailable"):
+            raise LauncherUnavailable(reply.get("error", "启动器辅助进程已退出"))
+        raise OSError(reply.get("errno") or 0, reply.get("error", "启动失败"))
+
+    def _read_loop(self, proc: subprocess.Popen):
+        for line in proc.stdout:
+            try:
+                reply = json.loads(line)
+            except ValueError:
+                continue
+            slot = self._pending.pop(reply.get("id"), None)
+            if slot is not None:
+                slot[1] = reply
+                slot[0].set()
+
+        # 管道关闭：辅助进程已退出
+        proc.wait()
+        with self._lock:
+            if self._proc is not proc:
+                return
+            self._proc = None
+            stopping = self._stopping
+        self._fail_pending("启动器辅助进程已退出")
+        if stopping:
+            return
+        self._log("warning", f"启动器辅助进程意外退出 (返回码: {proc.returncode})，准备重启")
+        delay = self.RESTART_MIN_INTERVAL_SECONDS - (time.monotonic() - self._last_start)
+        if delay > 0:
+            time.sleep(delay)
+        with self._lock:
+            if not self._stopping and self._proc is None and self._start_locked():
+                self.restart_count += 1
+
+    def _fail_pending(self, message: str):
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        for slot in pending.values():
+            slot[1] = {"unavailable": True, "error": message}
+            slot[0].set()
+
+    def _log(self, level: str, message: str):
+        if self.logger is not None:
+            getattr(self.logger, level)(message)
+
+
+if __name__ == "__main__":
+    if HELPER_ARG in sys.argv:
+        sys.exit(serve())
@@ -0,0 +1,238 @@
+"""
+泄漏监视模块
+长时间驻留托盘时定期记录自身的内存、线程、句柄和 gc 对象数量，
+发现持续增长时输出差异报告（线程名称、对象类型和 tracemalloc 分配位置）
+"""
+import gc
+import re
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter, deque
+from typing import Dict, List, Optional
+import psutil
+from logger import Logger
+from resource_monitor import format_bytes
+
+# tracemalloc 模式
+TRACE_OFF = "off"
+TRACE_ON_GROWTH = "on_growth"   # 发现增长后才开始跟踪（默认，平时无额外开销）
+TRACE_ALWAYS = "always"
+
+METRIC_LABELS = {'rss': "内存", 'threads': "线程数", 'handles': "句柄数", 'gc_objects': "gc 对象数"}
+
+
+def _thread_kind(name: str) -> str:
+    """线程名去掉序号，"Thread-3 (_monitor_processes)" -> "_monitor_processes"，"Launch_0" -> "Launch" """
+    match = re.search(r'\((.+)\)$', name)
+    if match:
+        return match.group(1)
+    return re.sub(r'[-_]\d+$', '', name)
+
+
+class LeakWatchdog:
+    """
+    自身资源的泄漏监视线程
+
+    每 interval_seconds 采样一次 RSS、线程数、句柄数（Windows）/ 文件描述符数、
+    各 gc 代的对象数，写入日志并保存在最近 WINDOW_SAMPLES 个样本中。
+    窗口最后三分之一的最小值仍高于最前三分之一的最大值加阈值时视为持续增长
+    （短暂的峰值不会触发），输出差异报告：各项的变化、线程名称的增减、
+    对象类型数量的增减，以及 tracemalloc 开启后分配增长最多的代码位置。
+    同一类报告最多每 REPORT_COOLDOWN_SECONDS 输出一次。
+    """
+
+    WINDOW_SAMPLES = 12
+    REPORT_COOLDOWN_SECONDS = 3600
+    TOP_SITES = 10
+    TOP_TYPES = 10
+    # 各项判定为持续增长的最小增量
+    THRESHOLDS = {
+        'rss': 32 * 1024 * 1024,
+        'threads': 5,
+        'handles': 100,
+        'gc_objects': 50000,
+    }
+
+    def __init__(self, settings: Optional[dict] = None):
+        self.logger = Logger()
+        self.enabled = True
+        self.interval_seconds = 300.0
+        self.trace_mode = TRACE_ON_GROWTH
+        self.apply_settings(settings or {})
+
+        self._process = psutil.Process()
+        self.samples: deque = deque(maxlen=self.WINDOW_SAMPLES)
+        # 窗口起点的线程名称和对象类型统计，用于差异报告
+        self._thread_names: deque = deque(maxlen=self.WINDOW_SAMPLES)
+        self._type_baseline: Optional[Counter] = None
+        self._trace_baseline = None
+        self._last_report_at = 0.0
+        self.growing: List[str] = []
+        self.last_cost_ms = 0.0
+
+        self._thread = None
+        self._stop_event = threading.Event()
+
+    def apply_settings(self, settings: dict):
+        """应用配置: enabled / interval_minutes / tracemalloc（off / on_growth / always）"""
+        try:
+            self.enabled = bool(settings.get('enabled', self.enabled))
+            if 'interval_minutes' in settings:
+                self.interval_seconds = max(10.0, float(settings['interval_minutes']) * 60)
+            mode = settings.get('tracemalloc', self.trace_mode)
+            if mode in (TRACE_OFF, TRACE_ON_GROWTH, TRACE_ALWAYS):
+                self.trace_mode = mode
+            else:
+                self.logger.warning(f"无效的 tracemalloc 模式: {mode}，使用 {self.trace_mode}")
+        except (TypeError, ValueError) as e:
+            self.logger.warning(f"泄漏监视配置无效，使用默认值: {e}")
+
+    def start(self):
+        """启动监视（重复调用无副作用）"""
+        if not self.enabled:
+            return
+        if self._thread is not None and self._thread.is_alive():
+            return
+        if self.trace_mode == TRACE_ALWAYS:
+            self._start_tracing()
+        self._stop_event = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True, name="LeakWatchdog")
+        self._thread.start()
+
+    def stop(self):
+        self._stop_event.set()
+        self._thread = None
+        if tracemalloc.is_tracing():
+            tracemalloc.stop()
+        self._trace_baseline = None
+
+    def _run(self):
+        stop_event = self._stop_event
+        while not stop_event.is_set():
+            try:
+                self.sample_once()
+            except Exception as e:
+                self.logger.debug(f"泄漏监视采样失败: {e}")
+            stop_event.wait(self.interval_seconds)
+
+    def sample_once(self) -> Dict[str, int]:
+        """采样一次，写入日志，并检查是否持续增长"""
+        started = time.perf_counter()
+        proc = self._process
+        with proc.oneshot():
+            rss = proc.memory_info().rss
+            threads = proc.num_threads()
+            try:
+                handles = proc.num_handles() if sys.platform == 'win32' else proc.num_fds()
+            except (psutil.AccessDenied, AttributeError):
+                handles = 0
+        generations = [len(gc.get_objects(generation)) for generation in range(3)]
+        sample = {
+            'time': time.time(),
+            'rss': rss,
+            'threads': threads,
+            'handles': handles,
+            'gc_objects': sum(generations),
+            'gc_generations': generations,
+        }
+        if tracemalloc.is_tracing():
+            sample['traced'] = tracemalloc.get_traced_memory()[0]
+        self.samples.append(sample)
+        self._thread_names.append(Counter(_thread_kind(thread.name) for thread in threading.enumerate()))
+        self.last_cost_ms = (time.perf_counter() - started) * 1000
+
+        self.logger.info(
+            f"资源自检: 内存 {format_bytes(rss)}，线程 {threads}，句柄 {handles}，"
+            f"gc 对象 {'/'.join(str(n) for n in generations)}，耗时 {self.last_cost_ms:.1f} ms"
+        )
+        self._check_growth()
+        return sample
+
+    def _check_growth(self):
+        samples = list(self.samples)
+        if len(samples) < self.WINDOW_SAMPLES:
+            return
+        third = max(1, len(samples) // 3)
+        growing = []
+        for metric, threshold in self.THRESHOLDS.items():
+            head = max(sample[metric] for sample in samples[:third])
+            tail = min(sample[metric] for sample in samples[-third:])
+            if tail - head >= threshold:
+                growing.append(metric)
+        self.growing = growing
+        if not growing:
+            return
+
+        if self._type_baseline is None:
+            self._type_baseline = self._type_census()
+        if self.trace_mode != TRACE_OFF and not tracemalloc.is_tracing():
+            # 从现在开始跟踪分配位置，下一份报告给出增长来源
+            self._start_tracing()
+        now = time.monotonic()
+        if self._last_report_at and now - self._last_report_at < self.REPORT_COOLDOWN_SECONDS:
+            return
+        self._last_report_at = now
+        self.logger.warning(self.growth_report(growing))
+
+    def _start_tracing(self):
+        try:
+            # 只记录一层调用栈，开销最小
+            tracemalloc.start(1)
+            self._trace_baseline = tracemalloc.take_snapshot()
+            self.logger.info("已开启 tracemalloc 跟踪内存分配位置")
+        except Exception as e:
+            self.logger.warning(f"开启 tracemalloc 失败: {e}")
+
+    @staticmethod
+    def _type_census() -> Counter:
+        return Counter(type(obj).__name__ for obj in gc.get_objects())
+
+    def growth_report(self, growing: List[str]) -> str:
+        """持续增长的差异报告"""
+        first, last = self.samples[0], self.samples[-1]
+        minutes = (last['time'] - first['time']) / 60
+        lines = [f"检测到资源持续增长（{minutes:.0f} 分钟内）:"]
+        for metric in growing:
+            before, after = first[metric], last[metric]
+            if metric == 'rss':
+                lines.append(f"  内存: {format_bytes(before)} -> {format_bytes(after)}")
+            else:
+                lines.append(f"  {METRIC_LABELS[metric]}: {before} -> {after} (+{after - before})")
+
+        names_before, names_after = self._thread_names[0], self._thread_names[-1]
+        thread_diff = {name: names_after[name] - names_before[name]
+                       for name in set(names_before) | set(names_after)
+                       if names_after[name] != names_before[name]}
+        if thread_diff:
+            lines.append("  线程变化: " + ", ".join(f"{name} {delta:+d}" for name, delta in
+                                                    sorted(thread_diff.items(), key=lambda item: -item[1])))
+
+        if self._type_baseline is not None:
+            census = self._type_census()
+            census.subtract(self._type_baseline)
+            top = [(name, delta) for name, delta in census.most_common(self.TOP_TYPES) if delta > 0]
+            if top:
+                lines.append("  对象类型增长: " + ", ".join(f"{name} +{delta}" for name, delta in top))
+
+        if self._trace_baseline is not None and tracemalloc.is_tracing():
+            stats = tracemalloc.take_snapshot().compare_to(self._trace_baseline, 'lineno')
+            sites = [stat for stat in stats[:self.TOP_SITES] if stat.size_diff > 0]
+            if sites:
+                lines.append("  分配增长最多的位置:")
+                for stat in sites:
+                    frame = stat.traceback[0]
+                    lines.append(f"    {frame.filename}:{frame.lineno}  +{format_bytes(stat.size_diff)} "
+                                 f"({stat.count_diff:+d} 块)")
+        if len(lines) == len(growing) + 1 or self._trace_baseline is None:
+            lines.append("  已记录当前的对象类型和分配位置，下一份报告将列出增长来源")
+        return "\n".join(lines)
+
+    def status(self) -> dict:
+        """最近一次采样和当前持续增长的项目"""
+        return {
+            'latest': self.samples[-1] if self.samples else None,
+            'growing': list(self.growing),
+            'last_cost_ms': self.last_cost_ms,
+        }
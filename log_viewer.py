@@ -0,0 +1,362 @@
+"""
+日志查看模块
+用内存映射读取当前日志文件，按字节偏移建立行索引和级别索引，
+界面只绘制可见的行，新追加的内容增量索引
+"""
+import mmap
+import os
+import re
+from array import array
+from pathlib import Path
+from typing import Optional
+from PyQt5.QtCore import Qt, QAbstractListModel, QModelIndex, QTimer
+from PyQt5.QtGui import QColor, QFont
+from PyQt5.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QLabel, QComboBox,
+                             QCheckBox, QTableView, QHeaderView, QAbstractItemView)
+from logger import Logger
+
+# 级别编码（0 表示续行，沿用上一条记录的级别）
+LEVEL_CONTINUATION = 0
+LEVEL_DEBUG = 1
+LEVEL_INFO = 2
+LEVEL_WARNING = 3
+LEVEL_ERROR = 4
+LEVEL_CRITICAL = 5
+
+# 日志格式 "2026-01-23 10:00:00,123 [INFO] ..."：级别首字母位于第 25 个字节
+_LEVEL_OFFSET = 25
+_LEVEL_LETTERS = {ord('D'): LEVEL_DEBUG, ord('I'): LEVEL_INFO, ord('W'): LEVEL_WARNING,
+                  ord('E'): LEVEL_ERROR, ord('C'): LEVEL_CRITICAL}
+_NEWLINE = re.compile(rb'\n')
+
+# 过滤选项：(显示名称, 最低级别)
+LEVEL_FILTERS = [
+    ("全部", LEVEL_CONTINUATION),
+    ("调试及以上", LEVEL_DEBUG),
+    ("信息及以上", LEVEL_INFO),
+    ("警告及以上", LEVEL_WARNING),
+    ("错误", LEVEL_ERROR),
+]
+
+
+class LogIndex:
+    """
+    日志文件的行索引
+
+    文件以只读方式内存映射，只保存每行的起始字节偏移（array）和级别（bytearray），
+    不把文本读入内存。每个最低级别另有一个满足条件的行号数组，切换过滤只是换一个数组。
+    refresh() 只索引上次之后新追加的完整行，每次最多处理 max_bytes 字节；
+    文件被截断或换成新文件（按日期切换）时重新建立索引。
+    """
+
+    # 每次最多索引的字节数（约几十毫秒），大文件分多次完成，界面不卡顿
+    CHUNK_BYTES = 2 * 1024 * 1024
+
+    def __init__(self, path=None):
+        self.path: Optional[Path] = None
+        self._file = None
+        self._map: Optional[mmap.mmap] = None
+        self._identity = None
+        self._reset_index()
+        if path is not None:
+            self.open(path)
+
+    def _reset_index(self):
+        self._starts = array('Q')
+        self._levels = bytearray()
+        # 最低级别 -> 满足条件的行号（LEVEL_CONTINUATION 表示全部，不单独保存）
+        self._views = {level: array('I') for _, level in LEVEL_FILTERS if level}
+        self._indexed = 0
+        # 已查找过换行符的位置（末尾不完整的行不重复扫描）
+        self._scanned = 0
+        self._size = 0
+        self._last_level = LEVEL_INFO
+
+    def open(self, path):
+        """打开（或重新打开）日志文件并清空索引"""
+        self.close()
+        self.path = Path(path)
+        self._reset_index()
+
+    def close(self):
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        self._identity = None
+
+    @property
+    def pending_bytes(self) -> int:
+        """已写入但尚未索引的字节数"""
+        return max(0, self._size - self._scanned)
+
+    @property
+    def size(self) -> int:
+        return self._size
+
+    def refresh(self, max_bytes: int = CHUNK_BYTES) -> bool:
+        """
+        索引新追加的内容
+        返回: 是否重新建立了索引（文件被截断或替换），调用方需整体刷新视图
+        """
+        if self.path is None:
+            return False
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            return False
+
+        reset = False
+        identity = (stat.st_dev, stat.st_ino)
+        if self._identity is not None and (identity != self._identity or stat.st_size < self._indexed):
+            self.open(self.path)
+            reset = True
+        self._size = stat.st_size
+        if self._size <= self._scanned:
+            return reset
+
+        if self._map is None or len(self._map) < self._size:
+            if not self._remap(identity):
+                return reset
+        self._index_chunk(max_bytes)
+        return reset
+
+    def _remap(self, identity) -> bool:
+        """文件变大后重新映射（映射本身不复制数据）"""
+        try:
+            if self._file is None:
+                self._file = open(self.path, 'rb')
+            if self._map is not None:
+                self._map.close()
+                self._map = None
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError) as e:
+            Logger().debug(f"映射日志文件失败: {e}")
+            self.close()
+            return False
+        self._identity = identity
+        self._size = len(self._map)
+        return True
+
+    def _index_chunk(self, max_bytes: int):
+        data = self._map
+        size = self._size
+        start = self._indexed
+        limit = min(size, start + max_bytes)
+        end = data.rfind(b'\n', start, limit)
+        if end < 0 and limit < size:
+            # 单行超过 max_bytes，向后找到该行结尾
+            end = data.find(b'\n', limit)
+        self._scanned = size if end < 0 else max(limit, end + 1)
+        if end < 0:
+            return
+
+        # 热循环中使用局部变量，每行只做几次追加
+        add_start = self._starts.append
+        add_level = self._levels.append
+        add_debug = self._views[LEVEL_DEBUG].append
+        add_info = self._views[LEVEL_INFO].append
+        add_warning = self._views[LEVEL_WARNING].append
+        add_error = self._views[LEVEL_ERROR].append
+        letters = _LEVEL_LETTERS
+        last_level = self._last_level
+        line = len(self._starts)
+        line_start = start
+        for match in _NEWLINE.finditer(data, start, end + 1):
+            level = LEVEL_CONTINUATION
+            probe = line_start + _LEVEL_OFFSET
+            if probe < size and data[probe - 1] == 0x5B:  # '['
+                level = letters.get(data[probe], LEVEL_CONTINUATION)
+                if level:
+                    last_level = level
+            add_start(line_start)
+            add_level(level)
+            # 续行按所属记录的级别进入过滤结果
+            add_debug(line)
+            if last_level >= LEVEL_INFO:
+                add_info(line)
+                if last_level >= LEVEL_WARNING:
+                    add_warning(line)
+                    if last_level >= LEVEL_ERROR:
+                        add_error(line)
+            line += 1
+            line_start = match.end()
+
+        self._last_level = last_level
+        self._indexed = line_start
+
+    def line_count(self, min_level: int = LEVEL_CONTINUATION) -> int:
+        if min_level:
+            return len(self._views[min_level])
+        return len(self._starts)
+
+    def line_number(self, row: int, min_level: int = LEVEL_CONTINUATION) -> int:
+        """过滤后第 row 行对应的文件行号"""
+        return self._views[min_level][row] if min_level else row
+
+    def line_level(self, line: int) -> int:
+        """行的级别（续行返回其所属记录的级别）"""
+        levels = self._levels
+        while line > 0 and levels[line] == LEVEL_CONTINUATION:
+            line -= 1
+        return levels[line] if levels else LEVEL_INFO
+
+    def line_text(self, line: int) -> str:
+        start = self._starts[line]
+        end = self._starts[line + 1] if line + 1 < len(self._starts) else self._indexed
+        return self._map[start:end].decode('utf-8', 'replace').rstrip('\r\n')
+
+
+class LogLineModel(QAbstractListModel):
+    """只在 data() 中按需解码可见行的列表模型"""
+
+    LEVEL_COLORS = {
+        LEVEL_DEBUG: QColor("#94A3B8"),
+        LEVEL_WARNING: QColor("#D97706"),
+        LEVEL_ERROR: QColor("#DC2626"),
+        LEVEL_CRITICAL: QColor("#991B1B"),
+    }
+
+    def __init__(self, index: LogIndex, parent=None):
+        super().__init__(parent)
+        self._index = index
+        self._min_level = LEVEL_CONTINUATION
+        self._count = 0
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self._count
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        line = self._index.line_number(index.row(), self._min_level)
+        if role in (Qt.DisplayRole, Qt.ToolTipRole):
+            return self._index.line_text(line)
+        if role == Qt.ForegroundRole:
+            return self.LEVEL_COLORS.get(self._index.line_level(line))
+        return None
+
+    def set_min_level(self, level: int):
+        self.beginResetModel()
+        self._min_level = level
+        self._count = self._index.line_count(level)
+        self.endResetModel()
+
+    def sync(self, reset: bool = False) -> bool:
+        """同步索引中的新行，返回是否有变化"""
+        count = self._index.line_count(self._min_level)
+        if reset or count < self._count:
+            self.beginResetModel()
+            self._count = count
+            self.endResetModel()
+            return True
+        if count == self._count:
+            return False
+        self.beginInsertRows(QModelIndex(), self._count, count - 1)
+        self._count = count
+        self.endInsertRows()
+        return True
+
+
+class LogViewerDialog(QDialog):
+    """
+    日志面板（非模态）
+
+    打开时分块建立索引，追上文件末尾后每 FOLLOW_INTERVAL_MS 检查一次文件大小，
+    只有追加了内容才读取新增部分。面板隐藏时停止检查。
+    """
+
+    FOLLOW_INTERVAL_MS = 500
+    ROW_HEIGHT = 20
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("运行日志")
+        self.resize(900, 560)
+        self.logger = Logger()
+        self.log_index = LogIndex(self.logger.log_file)
+
+        layout = QVBoxLayout(self)
+        toolbar = QHBoxLayout()
+        toolbar.addWidget(QLabel("级别:"))
+        self.level_combo = QComboBox()
+        for label, level in LEVEL_FILTERS:
+            self.level_combo.addItem(label, level)
+        self.level_combo.currentIndexChanged.connect(self.on_level_changed)
+        toolbar.addWidget(self.level_combo)
+        self.follow_checkbox = QCheckBox("跟随最新")
+        self.follow_checkbox.setChecked(True)
+        toolbar.addWidget(self.follow_checkbox)
+        toolbar.addStretch()
+        self.info_label = QLabel("")
+        self.info_label.setStyleSheet("color: #64748B;")
+        toolbar.addWidget(self.info_label)
+        layout.addLayout(toolbar)
+
+        self.model = LogLineModel(self.log_index, self)
+        # 单列表格 + 固定行高：追加和重置都不按行计算布局（QListView 追加行是 O(总行数)），
+        # 视图只为可见行取数据
+        self.view = QTableView()
+        self.view.setModel(self.model)
+        self.view.horizontalHeader().setVisible(False)
+        self.view.horizontalHeader().setStretchLastSection(True)
+        self.view.verticalHeader().setVisible(False)
+        self.view.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+        self.view.verticalHeader().setDefaultSectionSize(self.ROW_HEIGHT)
+        self.view.setShowGrid(False)
+        self.view.setWordWrap(False)
+        self.view.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.view.setSelectionMode(QAbstractItemView.ExtendedSelection)
+        self.view.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        font = QFont("Consolas")
+        font.setStyleHint(QFont.Monospace)
+        self.view.setFont(font)
+        layout.addWidget(self.view)
+
+        self.timer = QTimer(self)
+        self.timer.timeout.connect(self.poll)
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self.poll()
+
+    def hideEvent(self, event):
+        super().hideEvent(event)
+        self.timer.stop()
+
+    def closeEvent(self, event):
+        self.timer.stop()
+        super().closeEvent(event)
+
+    def on_level_changed(self, _):
+        self.model.set_min_level(self.level_combo.currentData())
+        if self.follow_checkbox.isChecked():
+            self.view.scrollToBottom()
+
+    def poll(self):
+        """索引新内容并更新视图；还有未索引的内容时尽快继续，否则按跟随间隔检查"""
+        if self.log_index.path != self.logger.log_file:
+            # 日期变化后日志切换到了新文件
+            self.log_index.open(self.logger.log_file)
+            self.model.sync(reset=True)
+
+        reset = self.log_index.refresh()
+        if self.model.sync(reset) and self.follow_checkbox.isChecked():
+            self.view.scrollToBottom()
+        self.update_info()
+        if self.isVisible():
+            self.timer.start(0 if self.log_index.pending_bytes else self.FOLLOW_INTERVAL_MS)
+
+    def update_info(self):
+        index = self.log_index
+        text = f"{self.model.rowCount()} / {index.line_count()} 行，{index.size / 1024 / 1024:.1f} MB"
+        if index.pending_bytes:
+            text += f"（索引中 {index.pending_bytes / 1024 / 1024:.0f} MB）"
+        self.info_label.setText(text)
+
+    def shutdown(self):
+        """关闭面板并释放文件映射"""
+        self.timer.stop()
+        self.log_index.close()
@@ -4,6 +4,12 @@
 """
 import os
 import sys
+
+if __name__ == "__main__" and "--launcher-helper" in sys.argv:
+    # 启动器辅助进程（打包版本）：不加载 GUI，只负责创建子进程
+    from launcher_helper import serve
+    sys.exit(serve())
+
 import ctypes
 from PyQt5.QtWidgets import QApplication, QMessageBox
 from gui_qt import HotkeyManagerQt
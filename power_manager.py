@@ -5,8 +5,10 @@
 import ctypes
 import threading
 import time
+from typing import Dict, List
 from pynput.keyboard import Controller, Key
 from logger import Logger
+from hook_health import last_input_age_seconds
 
 # Windows电源管理常量
 ES_CONTINUOUS = 0x80000000
@@ -36,6 +38,34 @@ class _ReasonContext(ctypes.Structure):
     ]
 
 
+class _MethodStats:
+    """一种防锁屏方式的统计：调用是否成功、是否确实重置了系统空闲计时、耗时"""
+
+    COST_EWMA_ALPHA = 0.3
+
+    def __init__(self):
+        self.attempts = 0
+        self.successes = 0
+        self.failures_in_a_row = 0
+        self.cost_ms = 0.0
+        # 模拟输入类方式：最近一次可判定的验证结果（None 为尚未验证）
+        self.verified = None
+        # 只使用该方式时仍发生锁屏的次数
+        self.locks = 0
+
+    def record(self, ok: bool, cost_ms: float):
+        self.attempts += 1
+        if ok:
+            self.successes += 1
+            self.failures_in_a_row = 0
+        else:
+            self.failures_in_a_row += 1
+        if self.attempts == 1:
+            self.cost_ms = cost_ms
+        else:
+            self.cost_ms += self.COST_EWMA_ALPHA * (cost_ms - self.cost_ms)
+
+
 class PowerManager:
     # 防护强度枚举
     class ProtectionLevel:
@@ -44,15 +74,46 @@ class PowerManager:
         HEAVY = "heavy"      # 重度：15秒，100像素
         CUSTOM = "custom"    # 自定义：120秒，100像素（默认）
     
+    # 防锁屏方式: 名称 -> (显示名称, 是否为模拟输入)
+    # 模拟输入会重置系统的用户空闲计时（规避锁屏），SetThreadExecutionState 只阻止休眠和关闭显示器
+    KEEP_AWAKE_METHODS = {
+        "simulate_keyboard": ("模拟按键", True),
+        "mouse_movement": ("鼠标移动", True),
+        "reset_idle_timer": ("重置空闲计时器", False),
+        "restore_continuous_state": ("恢复持续状态", False),
+    }
+    # 每隔该次数的刷新执行一次全部方式，重新评估未被选用的方式
+    PROBE_EVERY_TICKS = 30
+    # 连续失败该次数后暂停使用，直到下一次全量探测
+    DROP_AFTER_FAILURES = 3
+    # 模拟输入前系统已空闲至少该秒数，才能用 GetLastInputInfo 判断输入是否生效
+    VERIFY_MIN_IDLE_SECONDS = 1.0
+
     def __init__(self, protection_level="custom"):
         self.logger = Logger()
         self.is_preventing_sleep = False
-        self._keepalive_timer = None
         self._keepalive_interval_seconds = 30
         self._power_request_handle = None
         self._keyboard = Controller()
-        self._keyboard_simulation_timer = None
         self._keyboard_simulation_interval = 120  # 默认120秒
+        # 后台保活线程：一个常驻线程同时负责 SetThreadExecutionState 保活和防锁屏刷新
+        self._keep_awake_thread = None
+        self._stop_event = threading.Event()
+        self._wake_event = threading.Event()
+        self._next_keepalive_at = 0.0
+        self._next_simulation_at = 0.0
+        self._simulation_enabled = False
+        # 防锁屏方式的自适应选择
+        self._method_stats: Dict[str, _MethodStats] = {name: _MethodStats() for name in self.KEEP_AWAKE_METHODS}
+        self._method_runners = {
+            "simulate_keyboard": self._run_simulate_keyboard,
+            "mouse_movement": self._run_mouse_movement,
+            "reset_idle_timer": lambda: bool(self._reset_idle_timer()),
+            "restore_continuous_state": lambda: bool(self._restore_continuous_state()),
+        }
+        self._tick_count = 0
+        self._active_methods: List[str] = []
+        self._lock_count_seen = 0
         self.protection_level = protection_level
         self._mouse_movement_pixels = 100  # 默认100像素
         self._update_protection_settings()
@@ -85,10 +146,11 @@ class PowerManager:
         self._update_protection_settings()
         self.logger.info(f"防护强度已更改为: {level}")
         
-        # 如果防护已启用，重新调度定时器
-        if self.is_preventing_sleep:
-            self._schedule_keyboard_simulation()
-            self.logger.info("防护已启用，重新调度定时器以应用新设置")
+        # 如果防护已启用，从现在起按新间隔刷新
+        if self.is_preventing_sleep and self._simulation_enabled:
+            self._next_simulation_at = time.monotonic() + self._keyboard_simulation_interval
+            self._wake_event.set()
+            self.logger.info("防护已启用，已按新设置重新计时")
         
         return True
 
@@ -189,15 +251,6 @@ class PowerManager:
         self.logger.info("PowerClearRequest 已关闭 (SystemRequired/DisplayRequired)")
         return True
 
-    def _cancel_keepalive(self):
-        timer = self._keepalive_timer
-        self._keepalive_timer = None
-        if timer is not None:
-            try:
-                timer.cancel()
-            except Exception:
-                pass
-
     def _move_mouse(self, pixels):
         """执行鼠标移动 - 使用绝对坐标确保精确回到原位"""
         try:
@@ -215,19 +268,16 @@ class PowerManager:
                 point = POINT()
                 ctypes.windll.user32.GetCursorPos(ctypes.byref(point))
                 original_x, original_y = point.x, point.y
-                self.logger.debug(f"鼠标原始位置: ({original_x}, {original_y})")
                 
                 # 向右移动
                 ctypes.windll.user32.mouse_event(MOUSEEVENTF_MOVE, pixels, 0, 0, 0)
-                self.logger.debug(f"鼠标向右移动: {pixels}px")
                 time.sleep(0.15)  # 增加到150毫秒，让系统有足够时间识别为用户活动
                 
                 # 向左移动回原位（使用相对移动而不是绝对定位）
                 ctypes.windll.user32.mouse_event(MOUSEEVENTF_MOVE, -pixels, 0, 0, 0)
-                self.logger.debug(f"鼠标向左移动回原位: {pixels}px")
                 time.sleep(0.05)
                 
-                self.logger.debug(f"鼠标移动完成: {pixels}px往返，已回到原位")
+                self.logger.debug(f"鼠标移动完成: 从 ({original_x}, {original_y}) {pixels}px往返，已回到原位")
             except (OSError, AttributeError, ctypes.ArgumentError) as e:
                 # 捕获ctypes特定异常
                 error_msg = f"鼠标移动失败 (像素: {pixels}px): ctypes API调用错误 - {type(e).__name__}: {e}"
@@ -254,20 +304,21 @@ class PowerManager:
             return None
     
     def _simulate_keyboard(self):
-        """模拟按键 - 使用F15键（不会影响用户操作）"""
+        """
+        模拟按键 - 使用F15键（不会影响用户操作）
+
+        按下和松开之间不再等待：注入的按键事件一到达系统就会重置空闲计时，
+        是否生效由 GetLastInputInfo 验证，无效时改用鼠标移动
+        """
         try:
             # F15键通常不会被应用程序使用，是防止休眠的理想选择
             self._keyboard.press(Key.f15)
-            time.sleep(0.05)  # 增加按键持续时间到50毫秒
             self._keyboard.release(Key.f15)
-            self.logger.debug("模拟按键完成: F15")
         except Exception as e:
             # 如果F15失败，降级使用Shift
             self.logger.warning(f"F15按键失败，降级使用Shift: {e}")
             self._keyboard.press(Key.shift)
-            time.sleep(0.05)
             self._keyboard.release(Key.shift)
-            self.logger.debug("模拟按键完成: Shift (降级)")
     
     def _restore_continuous_state(self):
         """恢复持续状态"""
@@ -280,63 +331,94 @@ class PowerManager:
             self.logger.debug("恢复持续状态: SetThreadExecutionState API不可用")
             return None
 
-    def _simulate_key_press(self):
-        """模拟鼠标小范围移动 - 规避锁屏"""
-        # 记录防护强度和移动像素数
-        self.logger.debug(f"开始防护刷新 - 强度: {self.protection_level}, 移动像素: {self._mouse_movement_pixels}px, 间隔: {self._keyboard_simulation_interval}秒")
-        
-        # 跟踪各个方法的成功状态
-        methods_success = {
-            "mouse_movement": False,
-            "reset_idle_timer": False,
-            "simulate_keyboard": False,
-            "restore_continuous_state": False
-        }
-        
+    def _run_simulate_keyboard(self) -> bool:
+        self._simulate_keyboard()
+        return True
+
+    def _run_mouse_movement(self) -> bool:
+        self._move_mouse(self._mouse_movement_pixels)
+        return True
+
+    def _is_usable(self, name: str) -> bool:
+        return self._method_stats[name].failures_in_a_row < self.DROP_AFTER_FAILURES
+
+    def _select_methods(self, probe: bool) -> List[str]:
+        """
+        选择本次刷新执行的方式
+
+        全量探测时执行全部方式；否则执行仍可用的 SetThreadExecutionState 方式
+        （耗时为微秒级），加上已验证有效的模拟输入方式中代价最小的一个
+        （只用它仍发生过锁屏的排在后面）。还没有验证有效的模拟输入方式时，
+        执行全部可用的模拟输入方式。
+        """
+        if probe:
+            return list(self.KEEP_AWAKE_METHODS)
+        selected = [name for name, (_, is_input) in self.KEEP_AWAKE_METHODS.items()
+                    if not is_input and self._is_usable(name)]
+        inputs = [name for name, (_, is_input) in self.KEEP_AWAKE_METHODS.items()
+                  if is_input and self._is_usable(name)]
+        proven = [name for name in inputs if self._method_stats[name].verified]
+        if proven:
+            best = min(proven, key=lambda name: (self._method_stats[name].locks, self._method_stats[name].cost_ms))
+            if self._method_stats[best].locks == 0 or len(proven) == 1:
+                return [best] + selected
+        return inputs + selected
+
+    def _check_lock_escalation(self):
+        """上次刷新后发生过锁屏：只用一种模拟输入不够，记入该方式并重新全量探测"""
+        if self._lock_count <= self._lock_count_seen:
+            return
+        self._lock_count_seen = self._lock_count
+        inputs = [name for name in self._active_methods if self.KEEP_AWAKE_METHODS[name][1]]
+        if len(inputs) == 1:
+            self._method_stats[inputs[0]].locks += 1
+            self.logger.warning(f"只使用{self.KEEP_AWAKE_METHODS[inputs[0]][0]}时发生了锁屏，下次刷新执行全部方式")
+        self._tick_count = 0
+
+    def _simulate_key_press(self, probe: bool = False):
+        """
+        防锁屏刷新 - 按统计自适应地只执行必要的方式
+
+        每种方式记录调用是否成功和耗时；模拟输入类方式还用 GetLastInputInfo
+        验证是否确实重置了系统空闲计时。平时只执行代价最小且已验证有效的组合，
+        每 PROBE_EVERY_TICKS 次（或 probe=True、发生锁屏后）执行一次全部方式，
+        以便重新评估被暂停或未选用的方式。
+        """
+        self.check_lock_state()
+        self._check_lock_escalation()
+        probe = probe or self._tick_count % self.PROBE_EVERY_TICKS == 0
+        self._tick_count += 1
+        methods = self._select_methods(probe)
+        if methods != self._active_methods and not probe:
+            labels = ", ".join(self.KEEP_AWAKE_METHODS[name][0] for name in methods)
+            self.logger.info(f"防锁屏方式调整为: {labels}")
+        if not probe:
+            self._active_methods = methods
+
+        results = []
         try:
-            # 方法1：模拟按键（优先级提高，因为按键更可靠）
-            self.logger.debug(f"步骤1: 模拟按键")
-            try:
-                self._simulate_keyboard()
-                methods_success["simulate_keyboard"] = True
-            except Exception as e:
-                self.logger.warning(f"步骤1: 模拟按键失败: {e}")
-            
-            # 方法2：使用 mouse_event 移动鼠标（增大移动范围，规避锁屏）
-            pixels = self._mouse_movement_pixels
-            self.logger.debug(f"步骤2: 执行鼠标移动 ({pixels}px)")
-            try:
-                self._move_mouse(pixels)
-                self.logger.debug(f"步骤2: 鼠标移动成功")
-                methods_success["mouse_movement"] = True
-            except Exception as e:
-                self.logger.warning(f"步骤2: 鼠标移动失败，降级到其他方法: {e}")
-            
-            # 方法3：使用 SetThreadExecutionState 重置空闲计时器
-            self.logger.debug(f"步骤3: 重置空闲计时器")
-            try:
-                result = self._reset_idle_timer()
-                if result:
-                    methods_success["reset_idle_timer"] = True
-            except Exception as e:
-                self.logger.warning(f"步骤3: 重置空闲计时器失败: {e}")
-            
-            # 方法4：恢复持续状态
-            self.logger.debug(f"步骤4: 恢复持续状态")
-            try:
-                result = self._restore_continuous_state()
-                if result:
-                    methods_success["restore_continuous_state"] = True
-            except Exception as e:
-                self.logger.warning(f"步骤4: 恢复持续状态失败: {e}")
-            
-            # 检查是否所有方法都失败
-            if not any(methods_success.values()):
+            for name in methods:
+                label, is_input = self.KEEP_AWAKE_METHODS[name]
+                idle_before = last_input_age_seconds() if is_input else None
+                started = time.perf_counter()
+                try:
+                    ok = self._method_runners[name]()
+                except Exception as e:
+                    ok = False
+                    self.logger.warning(f"{label}失败: {e}")
+                cost_ms = (time.perf_counter() - started) * 1000
+                stats = self._method_stats[name]
+                stats.record(ok, cost_ms)
+                if is_input and ok:
+                    self._verify_input(stats, idle_before)
+                results.append(f"{label} {'成功' if ok else '失败'} {cost_ms:.1f}ms")
+
+            if not any(self._method_stats[name].failures_in_a_row == 0 for name in methods):
                 # 所有方法都失败
                 error_msg = (
                     f"严重错误: 所有防护方法都失败！\n"
                     f"防护强度: {self.protection_level}\n"
-                    f"失败的方法: 鼠标移动, 重置空闲计时器, 模拟按键, 恢复持续状态\n"
+                    f"失败的方法: {', '.join(self.KEEP_AWAKE_METHODS[name][0] for name in methods)}\n"
                     f"故障排除建议:\n"
                     f"1. 检查是否在虚拟机或远程桌面环境中运行\n"
                     f"2. 确认程序具有足够的系统权限\n"
@@ -347,10 +429,10 @@ class PowerManager:
                 self.logger.critical(error_msg)
                 # 存储错误信息供GUI显示
                 self._last_critical_error = error_msg
+                # 下次刷新重新尝试全部方式
+                self._tick_count = 0
             else:
-                # 至少有一个方法成功
-                success_methods = [k for k, v in methods_success.items() if v]
-                self.logger.info(f"防锁屏刷新完成 (强度: {self.protection_level}, 成功方法: {', '.join(success_methods)})")
+                self.logger.debug(f"防锁屏刷新{'（全量探测）' if probe else ''}: {'; '.join(results)}")
                 # 清除之前的错误信息
                 self._last_critical_error = None
                 
@@ -359,7 +441,42 @@ class PowerManager:
             error_msg = f"防锁屏刷新过程发生严重错误: {type(e).__name__}: {e}"
             self.logger.critical(error_msg, exc_info=True)
             self._last_critical_error = error_msg
-    
+
+    def _verify_input(self, stats: _MethodStats, idle_before):
+        """
+        用 GetLastInputInfo 验证模拟输入是否重置了空闲计时
+
+        只有模拟前系统已空闲一段时间才可判定（用户正在操作或前一种方式刚生效时
+        无法区分）；非 Windows 平台无法验证，调用成功即视为有效
+        """
+        if idle_before is None:
+            if last_input_age_seconds() is None:
+                stats.verified = True
+            return
+        if idle_before < self.VERIFY_MIN_IDLE_SECONDS:
+            return
+        idle_after = last_input_age_seconds()
+        effective = idle_after is not None and idle_after < min(idle_before, self.VERIFY_MIN_IDLE_SECONDS)
+        if stats.verified and not effective:
+            self.logger.warning(f"模拟输入没有重置系统空闲计时（空闲 {idle_before:.0f} 秒），改用其他方式")
+        stats.verified = effective
+
+    def get_keep_awake_statistics(self) -> List[str]:
+        """各防锁屏方式的统计（供GUI显示）"""
+        lines = []
+        active = self._active_methods or list(self.KEEP_AWAKE_METHODS)
+        for name, (label, is_input) in self.KEEP_AWAKE_METHODS.items():
+            stats = self._method_stats[name]
+            if stats.attempts == 0:
+                continue
+            state = "使用中" if name in active else "备用"
+            if not self._is_usable(name):
+                state = "已暂停"
+            elif is_input and stats.verified is False:
+                state = "无效"
+            lines.append(f"{label}: {state}，成功 {stats.successes}/{stats.attempts}，平均 {stats.cost_ms:.1f} ms")
+        return lines
+
     def get_last_critical_error(self):
         """获取最后一次严重错误信息（供GUI显示）"""
         return getattr(self, '_last_critical_error', None)
@@ -394,54 +511,50 @@ class PowerManager:
             "currently_locked": self._last_lock_time is not None
         }
 
-    def _cancel_keyboard_simulation(self):
-        """取消键盘模拟定时器"""
-        timer = self._keyboard_simulation_timer
-        self._keyboard_simulation_timer = None
-        if timer is not None:
-            try:
-                timer.cancel()
-            except Exception:
-                pass
-
-    def _schedule_keyboard_simulation(self):
-        """调度键盘模拟任务"""
-        self._cancel_keyboard_simulation()
-        if not self.is_preventing_sleep:
+    def _start_keep_awake_thread(self, simulate: bool = True):
+        """启动常驻保活线程（重复调用无副作用），simulate 为 False 时只保活不做防锁屏刷新"""
+        if self._keep_awake_thread is not None and self._keep_awake_thread.is_alive():
             return
-
-        def _tick():
-            if not self.is_preventing_sleep:
-                return
-            try:
-                self._simulate_key_press()
-            finally:
-                self._schedule_keyboard_simulation()
-
-        timer = threading.Timer(self._keyboard_simulation_interval, _tick)
-        timer.daemon = True
-        self._keyboard_simulation_timer = timer
-        timer.start()
-
-    def _schedule_keepalive(self):
-        self._cancel_keepalive()
-        if not self.is_preventing_sleep:
-            return
-
-        def _tick():
-            if not self.is_preventing_sleep:
-                return
-            try:
-                func = self._get_set_thread_execution_state()
+        now = time.monotonic()
+        self._simulation_enabled = simulate
+        self._next_keepalive_at = now
+        self._next_simulation_at = now + self._keyboard_simulation_interval if simulate else float('inf')
+        self._tick_count = 0
+        self._stop_event = threading.Event()
+        self._wake_event = threading.Event()
+        self._keep_awake_thread = threading.Thread(target=self._keep_awake_loop,
+                                                   args=(self._stop_event, self._wake_event),
+                                                   daemon=True, name="KeepAwake")
+        self._keep_awake_thread.start()
+
+    def _stop_keep_awake_thread(self):
+        self._stop_event.set()
+        self._wake_event.set()
+        self._keep_awake_thread = None
+
+    def _keep_awake_loop(self, stop_event: threading.Event, wake_event: threading.Event):
+        """
+        保活线程：到期时调用 SetThreadExecutionState 保活和防锁屏刷新
+
+        SetThreadExecutionState 的持续状态属于调用线程，线程退出即失效；
+        常驻线程让保活状态一直有效，也不必每次刷新都新建定时器线程
+        """
+        func = self._get_set_thread_execution_state()
+        while not stop_event.is_set():
+            now = time.monotonic()
+            if now >= self._next_keepalive_at:
                 if func is not None:
                     func(ES_CONTINUOUS | ES_SYSTEM_REQUIRED | ES_DISPLAY_REQUIRED)
-            finally:
-                self._schedule_keepalive()
-
-        timer = threading.Timer(self._keepalive_interval_seconds, _tick)
-        timer.daemon = True
-        self._keepalive_timer = timer
-        timer.start()
+                self._next_keepalive_at = now + self._keepalive_interval_seconds
+            if now >= self._next_simulation_at:
+                self._simulate_key_press()
+                self._next_simulation_at = time.monotonic() + self._keyboard_simulation_interval
+            timeout = min(self._next_keepalive_at, self._next_simulation_at) - time.monotonic()
+            wake_event.wait(max(0.0, timeout))
+            wake_event.clear()
+        # 清除本线程设置的持续状态
+        if func is not None:
+            func(ES_CONTINUOUS)
 
     def prevent_sleep(self):
         """防止系统休眠"""
@@ -457,7 +570,7 @@ class PowerManager:
                 self.logger.warning("启用防休眠失败: 当前平台不支持 SetThreadExecutionState")
                 if ok_power_request:
                     self.is_preventing_sleep = True
-                    self._schedule_keepalive()
+                    self._start_keep_awake_thread(simulate=False)
                     return True
                 return False
 
@@ -469,8 +582,7 @@ class PowerManager:
                     return False
 
             self.is_preventing_sleep = True
-            self._schedule_keepalive()
-            self._schedule_keyboard_simulation()  # 启动键盘模拟
+            self._start_keep_awake_thread()  # 保活和防锁屏刷新
             self.logger.info(f"已启用防休眠模式 (API返回值: {result}，包含键盘模拟)")
             if not ok_power_request:
                 self.logger.warning("PowerSetRequest 未生效/不可用，本次仅依赖 SetThreadExecutionState + 键盘模拟")
@@ -486,8 +598,7 @@ class PowerManager:
             return True
 
         try:
-            self._cancel_keepalive()
-            self._cancel_keyboard_simulation()  # 取消键盘模拟
+            self._stop_keep_awake_thread()
 
             ok_power_clear = self._clear_power_requests()
 
@@ -0,0 +1,275 @@
+"""
+预读模块
+统计快捷键目标的使用频率和时段，在后台提前把常用程序读入系统文件缓存
+"""
+import ctypes
+import json
+import os
+import sys
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+from logger import Logger
+
+# 与可执行文件一起预读的相邻库文件
+LIBRARY_SUFFIXES = {'.dll', '.pyd', '.so', '.dylib', '.ocx', '.node'}
+
+# Windows 线程后台模式（同时降低 CPU 和 IO 优先级）
+THREAD_MODE_BACKGROUND_BEGIN = 0x00010000
+
+READ_CHUNK_SIZE = 1024 * 1024
+
+
+class UsageStats:
+    """每个目标的启动次数和按小时分布，持久化到 JSON 文件"""
+
+    def __init__(self, stats_file: str = "usage_stats.json"):
+        self.stats_file = Path(stats_file)
+        self.logger = Logger()
+        self._lock = threading.Lock()
+        self._dirty = False
+        self.targets: Dict[str, dict] = {}
+        self.load()
+
+    def load(self):
+        """加载统计数据"""
+        try:
+            if self.stats_file.exists():
+                with open(self.stats_file, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                if isinstance(data, dict):
+                    self.targets = {
+                        target: stat for target, stat in data.items()
+                        if isinstance(stat, dict) and isinstance(stat.get('hours'), list)
+                        and len(stat['hours']) == 24
+                    }
+        except Exception as e:
+            self.logger.warning(f"加载使用统计失败: {e}")
+            self.targets = {}
+
+    def save(self):
+        """有变化时保存统计数据"""
+        with self._lock:
+            if not self._dirty:
+                return
+            data = {target: dict(stat, hours=list(stat['hours'])) for target, stat in self.targets.items()}
+            self._dirty = False
+        try:
+            tmp_file = self.stats_file.with_name(self.stats_file.name + '.tmp')
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                json.dump(data, f, ensure_ascii=False)
+            os.replace(tmp_file, self.stats_file)
+        except Exception as e:
+            self.logger.warning(f"保存使用统计失败: {e}")
+
+    def record(self, target_path: str, when: Optional[datetime] = None):
+        """记录一次启动（只更新内存，由后台线程定期落盘）"""
+        when = when or datetime.now()
+        with self._lock:
+            stat = self.targets.get(target_path)
+            if stat is None:
+                stat = {'count': 0, 'hours': [0] * 24, 'last_used': 0.0}
+                self.targets[target_path] = stat
+            stat['count'] += 1
+            stat['hours'][when.hour] += 1
+            stat['last_used'] = when.timestamp()
+            self._dirty = True
+
+    def likely_targets(self, limit: int, when: Optional[datetime] = None) -> List[str]:
+        """
+        按当前时段的使用可能性排序的目标
+
+        当前小时及前后一小时的次数权重最高，总次数作为次要权重。
+        """
+        when = when or datetime.now()
+        hour = when.hour
+        with self._lock:
+            scored = []
+            for target, stat in self.targets.items():
+                hours = stat['hours']
+                nearby = hours[hour] * 2 + hours[(hour - 1) % 24] + hours[(hour + 1) % 24]
+                score = nearby * 10 + stat['count']
+                if score > 0:
+                    scored.append((score, target))
+        scored.sort(reverse=True)
+        return [target for _, target in scored[:limit]]
+
+
+class Prefetcher:
+    """
+    后台预读线程
+
+    定期挑选当前时段最可能使用的目标，把可执行文件及其同目录下的库文件
+    读入系统文件缓存。每轮读取量受 io_budget_mb 限制，保持预读的文件总量
+    不超过 memory_budget_mb，已预读且未变化的文件不重复读取。
+    """
+
+    def __init__(self, usage_stats: UsageStats, settings: Optional[dict] = None):
+        self.logger = Logger()
+        self.usage_stats = usage_stats
+        self.enabled = True
+        self.interval_seconds = 600
+        self.io_budget_bytes = 256 * 1024 * 1024
+        self.memory_budget_bytes = 512 * 1024 * 1024
+        self.max_targets = 5
+        self.apply_settings(settings or {})
+
+        # 路径 -> (st_mtime_ns, size)，记录已预读的文件（与启动计划的文件签名同一形式）
+        self._warm_files: Dict[str, tuple] = {}
+        self._thread = None
+        self._stop_event = threading.Event()
+        self._wake_event = threading.Event()
+
+    def apply_settings(self, settings: dict):
+        """应用配置: enabled / interval_minutes / io_budget_mb / memory_budget_mb / max_targets"""
+        try:
+            self.enabled = bool(settings.get('enabled', self.enabled))
+            if 'interval_minutes' in settings:
+                self.interval_seconds = max(60, float(settings['interval_minutes']) * 60)
+            if 'io_budget_mb' in settings:
+                self.io_budget_bytes = max(0, int(settings['io_budget_mb'])) * 1024 * 1024
+            if 'memory_budget_mb' in settings:
+                self.memory_budget_bytes = max(0, int(settings['memory_budget_mb'])) * 1024 * 1024
+            if 'max_targets' in settings:
+                self.max_targets = max(1, int(settings['max_targets']))
+        except (TypeError, ValueError) as e:
+            self.logger.warning(f"预读配置无效，使用默认值: {e}")
+
+    def start(self):
+        """启动后台预读（重复调用无副作用）"""
+        if not self.enabled:
+            return
+        if self._thread is not None and self._thread.is_alive():
+            return
+        # 每次启动使用新的事件，避免与尚未退出的旧线程互相影响
+        self._stop_event = threading.Event()
+        self._wake_event = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True, name="Prefetcher")
+        self._thread.start()
+        self.logger.info("后台预读已启动")
+
+    def stop(self):
+        """停止后台预读并保存使用统计"""
+        self._stop_event.set()
+        self._wake_event.set()
+        self._thread = None
+        self.usage_stats.save()
+
+    def is_warm(self, path: str, signature: Optional[tuple] = None) -> bool:
+        """
+        文件是否已预读且之后未被修改
+
+        signature: 调用方已有的文件签名 (是否目录, st_mtime_ns, 大小)（如启动计划中的签名），
+        传入时直接比较，不再访问文件系统；否则 stat 一次
+        """
+        warm = self._warm_files.get(os.path.normcase(path))
+        if warm is None:
+            return False
+        if signature is None:
+            try:
+                stat = os.stat(path)
+            except OSError:
+                return False
+            return warm == (stat.st_mtime_ns, stat.st_size)
+        return warm == tuple(signature[1:])
+
+    def _run(self):
+        stop_event = self._stop_event
+        wake_event = self._wake_event
+        self._lower_thread_priority()
+        # 刚启动时给程序自身的初始化留出时间
+        if stop_event.wait(30):
+            return
+        while not stop_event.is_set():
+            try:
+                self.usage_stats.save()
+                self.prefetch_once()
+            except Exception as e:
+                self.logger.error(f"预读失败: {e}")
+            wake_event.wait(self.interval_seconds)
+            wake_event.clear()
+
+    def _lower_thread_priority(self):
+        """把当前线程降为后台优先级"""
+        try:
+            if sys.platform == 'win32':
+                kernel32 = ctypes.windll.kernel32
+                kernel32.SetThreadPriority(kernel32.GetCurrentThread(), THREAD_MODE_BACKGROUND_BEGIN)
+            elif hasattr(os, 'setpriority') and hasattr(threading, 'get_native_id'):
+                # Linux 上线程即任务，可单独设置 nice 值
+                os.setpriority(os.PRIO_PROCESS, threading.get_native_id(), 19)
+        except Exception as e:
+            self.logger.debug(f"降低预读线程优先级失败: {e}")
+
+    def prefetch_once(self) -> int:
+        """执行一轮预读，返回本轮读取的字节数"""
+        targets = self.usage_stats.likely_targets(self.max_targets)
+        files = [file_path for target in targets for file_path in self._files_for_target(target)]
+
+        # 只保留当前候选目标的预读记录，其余交给系统自行淘汰
+        wanted = set(os.path.normcase(file_path) for file_path in files)
+        self._warm_files = {key: sig for key, sig in self._warm_files.items() if key in wanted}
+        warm_total = sum(size for _, size in self._warm_files.values())
+        budget = min(self.io_budget_bytes, max(0, self.memory_budget_bytes - warm_total))
+
+        read_total = 0
+        started = time.perf_counter()
+        for file_path in files:
+            if self._stop_event.is_set() or budget <= 0:
+                break
+            if self.is_warm(file_path):
+                continue
+            read = self._prefetch_file(file_path, budget)
+            budget -= read
+            read_total += read
+
+        if read_total:
+            elapsed = time.perf_counter() - started
+            self.logger.info(
+                f"预读完成: {len(targets)} 个目标，{read_total // 1024} KB，用时 {elapsed:.2f} 秒"
+            )
+        return read_total
+
+    def _files_for_target(self, target: str) -> List[str]:
+        """目标可执行文件及同目录的库文件（小文件优先）"""
+        path = Path(target)
+        if target.startswith(('http://', 'https://', 'www.')) or not path.is_file():
+            return []
+        files = [str(path)]
+        libraries = []
+        try:
+            for entry in os.scandir(path.parent):
+                if entry.is_file() and Path(entry.name).suffix.lower() in LIBRARY_SUFFIXES:
+                    libraries.append((entry.stat().st_size, entry.path))
+        except OSError:
+            pass
+        libraries.sort()
+        files.extend(lib_path for _, lib_path in libraries)
+        return files
+
+    def _prefetch_file(self, file_path: str, budget: int) -> int:
+        """把文件读入页缓存，返回计入预算的字节数"""
+        try:
+            stat = os.stat(file_path)
+            size = min(stat.st_size, budget)
+            if size <= 0:
+                return 0
+            with open(file_path, 'rb') as f:
+                if hasattr(os, 'posix_fadvise'):
+                    # 交给内核异步预读，不经过用户态拷贝
+                    os.posix_fadvise(f.fileno(), 0, size, os.POSIX_FADV_WILLNEED)
+                else:
+                    remaining = size
+                    while remaining > 0 and not self._stop_event.is_set():
+                        data = f.read(min(READ_CHUNK_SIZE, remaining))
+                        if not data:
+                            break
+                        remaining -= len(data)
+            if size == stat.st_size:
+                self._warm_files[os.path.normcase(file_path)] = (stat.st_mtime_ns, stat.st_size)
+            return size
+        except OSError as e:
+            self.logger.debug(f"预读文件失败 {file_path}: {e}")
+            return 0
@@ -0,0 +1,165 @@
+"""
+进程登记表模块
+线程安全地保存被跟踪的程序组，读者使用写时复制的快照
+"""
+import threading
+from typing import Callable, Dict, Optional, Tuple
+from logger import Logger
+from process_tracker import ProcessGroup
+
+GroupKey = Tuple[int, float]
+
+
+class ProcessRegistry:
+    """
+    被跟踪程序组的登记表
+
+    以根进程的 (pid, create_time) 为键，另维护成员 PID 和规范化路径两个索引，
+    插入、删除和按 PID / 路径查找都是 O(1)。所有写操作在锁内完成；
+    snapshot() 返回不可变元组，写操作只把快照置空，下次读取时才重建，
+    监控线程、快捷键线程和界面线程可以同时访问。
+    """
+
+    def __init__(self):
+        self.logger = Logger()
+        self._lock = threading.Lock()
+        self._groups: Dict[GroupKey, ProcessGroup] = {}
+        # 成员 pid -> 所属程序组的键
+        self._by_pid: Dict[int, GroupKey] = {}
+        # 规范化路径 -> {键: 程序组}（保持插入顺序）
+        self._by_exe: Dict[str, Dict[GroupKey, ProcessGroup]] = {}
+        self._snapshot: Optional[tuple] = ()
+        # 变更通知（在锁外调用）：程序组登记或成员变化、程序组移除
+        self.on_group_changed: Optional[Callable[[ProcessGroup], None]] = None
+        self.on_group_removed: Optional[Callable[[ProcessGroup], None]] = None
+
+    def __len__(self) -> int:
+        return len(self._groups)
+
+    def snapshot(self) -> tuple:
+        """当前所有程序组的只读快照"""
+        snapshot = self._snapshot
+        if snapshot is None:
+            with self._lock:
+                if self._snapshot is None:
+                    self._snapshot = tuple(self._groups.values())
+                snapshot = self._snapshot
+        return snapshot
+
+    def add(self, group: ProcessGroup) -> bool:
+        """登记程序组，已登记（同一根进程）时返回 False"""
+        key = group.key
+        with self._lock:
+            if key in self._groups:
+                return False
+            self._groups[key] = group
+            self._by_exe.setdefault(group.exe_key, {})[key] = group
+            self._index_members(key, (), group.member_pids())
+            self._snapshot = None
+        self._notify(self.on_group_changed, group)
+        return True
+
+    def remove(self, group: ProcessGroup):
+        """移除程序组"""
+        with self._lock:
+            removed = self._remove_locked(group.key)
+        if removed is not None:
+            self._notify(self.on_group_removed, removed)
+
+    def find_by_pid(self, pid: int) -> Optional[ProcessGroup]:
+        """按成员 PID 查找所属程序组"""
+        key = self._by_pid.get(pid)
+        return self._groups.get(key) if key is not None else None
+
+    def find_running(self, exe_key: str) -> Optional[ProcessGroup]:
+        """
+        按规范化路径查找运行中的程序组（在快捷键线程中调用）
+
+        信任由监控线程定期清理的索引，不逐个探测成员进程；
+        只跳过根进程已被回收且没有其他已知成员的程序组
+        """
+        groups = self._by_exe.get(exe_key)
+        if not groups:
+            return None
+        for group in list(groups.values()):
+            if not group.root_exited_alone():
+                return group
+        return None
+
+    def refresh(self):
+        """刷新所有程序组的成员，移除已全部结束的程序组"""
+        for group in self.snapshot():
+            # 刷新前的成员即已登记到 _by_pid 的成员（只有这里修改已登记程序组的成员）
+            previous = group.member_pids()
+            failed = False
+            try:
+                group.refresh()
+            except Exception:
+                # 刷新失败时保留该程序组，成员可能已部分更新，照常同步索引
+                failed = True
+            changed = removed = None
+            with self._lock:
+                members = group.member_pids()
+                if group.key not in self._groups:
+                    # 刷新期间已被移除：移除时按刷新后的成员清理，这里补上刷新前的成员
+                    self._unindex_pids(group.key, previous)
+                    continue
+                if members or failed:
+                    if self._index_members(group.key, previous, members):
+                        changed = group
+                else:
+                    removed = self._remove_locked(group.key, previous)
+            if changed is not None:
+                self._notify(self.on_group_changed, changed)
+            if removed is not None:
+                self._notify(self.on_group_removed, removed)
+
+    def prune(self, is_alive: Callable[[ProcessGroup], bool]) -> int:
+        """移除 is_alive 返回 False 的程序组，返回剩余数量"""
+        for group in self.snapshot():
+            try:
+                alive = is_alive(group)
+            except Exception:
+                self.logger.debug("检查程序组状态时发生异常，跳过该程序组")
+                continue
+            if not alive:
+                self.remove(group)
+        return len(self._groups)
+
+    def _index_members(self, key: GroupKey, previous: tuple, members: tuple) -> bool:
+        """按刷新前后的成员同步 PID 索引（需持有锁），返回成员是否有变化"""
+        if members == previous:
+            return False
+        current = set(members)
+        self._unindex_pids(key, [pid for pid in previous if pid not in current])
+        for pid in members:
+            self._by_pid[pid] = key
+        return True
+
+    def _unindex_pids(self, key: GroupKey, pids):
+        for pid in pids:
+            if self._by_pid.get(pid) == key:
+                del self._by_pid[pid]
+
+    def _remove_locked(self, key: GroupKey, previous: tuple = ()) -> Optional[ProcessGroup]:
+        """移除程序组及其索引（需持有锁）；previous 为刷新前登记的成员 pid"""
+        group = self._groups.pop(key, None)
+        if group is None:
+            return None
+        self._unindex_pids(key, group.member_pids())
+        self._unindex_pids(key, previous)
+        groups = self._by_exe.get(group.exe_key)
+        if groups is not None:
+            groups.pop(key, None)
+            if not groups:
+                del self._by_exe[group.exe_key]
+        self._snapshot = None
+        return group
+
+    def _notify(self, callback: Optional[Callable[[ProcessGroup], None]], group: ProcessGroup):
+        if callback is None:
+            return
+        try:
+            callback(group)
+        except Exception as e:
+            self.logger.error(f"程序组变更通知失败: {e}")
@@ -0,0 +1,335 @@
+"""
+进程跟踪模块
+直接启动程序并把它的整棵进程树作为一个程序组跟踪
+"""
+import ctypes
+import os
+import subprocess
+import sys
+import time
+from array import array
+from pathlib import Path
+from typing import Dict, Optional
+import psutil
+from logger import Logger
+from launcher_helper import LauncherHelper, LauncherUnavailable
+
+# Windows 作业对象常量
+JOB_OBJECT_BASIC_PROCESS_ID_LIST = 3
+PROCESS_SET_QUOTA = 0x0100
+PROCESS_TERMINATE = 0x0001
+
+# 窗口激活相关常量
+GW_OWNER = 4
+SW_RESTORE = 9
+VK_MENU = 0x12
+KEYEVENTF_KEYUP = 0x0002
+
+# 可以直接创建进程（而不是交给 Shell 打开）的可执行文件后缀
+DIRECT_LAUNCH_SUFFIXES = {'.exe'}
+
+
+class _JobObject:
+    """Windows 作业对象，子进程默认继承所属作业，可一次性枚举整棵进程树"""
+
+    def __init__(self):
+        self.handle = None
+        if not hasattr(ctypes, "windll"):
+            return
+        try:
+            kernel32 = ctypes.windll.kernel32
+            kernel32.CreateJobObjectW.restype = ctypes.c_void_p
+            handle = kernel32.CreateJobObjectW(None, None)
+            if handle:
+                self.handle = handle
+        except Exception:
+            self.handle = None
+
+    def assign(self, pid: int, process_handle: Optional[int] = None) -> bool:
+        """把进程加入作业（不设置 KILL_ON_JOB_CLOSE，关闭作业不会结束程序）"""
+        if not self.handle:
+            return False
+        kernel32 = ctypes.windll.kernel32
+        opened = False
+        try:
+            if process_handle is None:
+                kernel32.OpenProcess.restype = ctypes.c_void_p
+                process_handle = kernel32.OpenProcess(PROCESS_SET_QUOTA | PROCESS_TERMINATE, False, pid)
+                opened = True
+                if not process_handle:
+                    return False
+            return bool(kernel32.AssignProcessToJobObject(ctypes.c_void_p(self.handle),
+                                                          ctypes.c_void_p(int(process_handle))))
+        except Exception:
+            return False
+        finally:
+            if opened and process_handle:
+                kernel32.CloseHandle(ctypes.c_void_p(process_handle))
+
+    def pids(self) -> Optional[set]:
+        """枚举作业内的所有进程 PID，失败返回 None"""
+        if not self.handle:
+            return None
+        try:
+            max_ids = 1024
+
+            class _ProcessIdList(ctypes.Structure):
+                _fields_ = [
+                    ("NumberOfAssignedProcesses", ctypes.c_uint32),
+                    ("NumberOfProcessIdsInList", ctypes.c_uint32),
+                    ("ProcessIdList", ctypes.c_size_t * max_ids),
+                ]
+
+            info = _ProcessIdList()
+            ok = ctypes.windll.kernel32.QueryInformationJobObject(
+                ctypes.c_void_p(self.handle), JOB_OBJECT_BASIC_PROCESS_ID_LIST,
+                ctypes.byref(info), ctypes.sizeof(info), None
+            )
+            if not ok:
+                return None
+            return set(info.ProcessIdList[:info.NumberOfProcessIdsInList])
+        except Exception:
+            return None
+
+    def close(self):
+        if self.handle:
+            try:
+                ctypes.windll.kernel32.CloseHandle(ctypes.c_void_p(self.handle))
+            except Exception:
+                pass
+            self.handle = None
+
+
+class ProcessGroup:
+    """
+    一个被跟踪的程序组：启动的根进程及其所有后代进程
+
+    Windows 上使用作业对象收集后代；POSIX 上子进程在独立会话中启动，
+    根进程退出后（启动器场景）按进程组 ID 查找仍在运行的成员。
+    """
+
+    __slots__ = ('root_pid', 'target_path', 'exe_key', 'started_at', 'key',
+                 '_job', '_pgid', '_popen', '_members')
+
+    def __init__(self, root_pid: int, target_path: str, job: Optional[_JobObject] = None,
+                 pgid: Optional[int] = None, popen: Optional[subprocess.Popen] = None,
+                 exe_key: Optional[str] = None):
+        self.root_pid = root_pid
+        self.target_path = target_path
+        # 调用方已有规范化路径（启动计划）时直接共用，不再解析路径
+        self.exe_key = exe_key or normalize_exe_path(target_path)
+        self.started_at = time.time()
+        self._job = job
+        self._pgid = pgid
+        # 保留 Popen 对象以便回收已退出的根进程（POSIX 上避免僵尸进程）
+        self._popen = popen
+        # 成员记录：(pid 数组, create_time 数组)，按下标对应，每个成员 16 字节；
+        # 用 create_time 防止 PID 复用造成误判。整体替换而不是逐项修改，读者取一次引用即可
+        self._members = (array('q'), array('d'))
+        self._add_member(root_pid)
+        # 登记表中的键：根进程 (pid, create_time)
+        pids, create_times = self._members
+        self.key = (root_pid, create_times[0] if pids else self.started_at)
+
+    @classmethod
+    def restore(cls, root_pid: int, target_path: str, root_create_time: float,
+                members: Dict[int, float], pgid: Optional[int] = None) -> Optional['ProcessGroup']:
+        """
+        按状态日志恢复程序组（不扫描全部进程）
+
+        只保留 PID 仍存在且创建时间与记录一致的成员，防止 PID 被复用造成误判；
+        没有存活成员时返回 None。
+        """
+        group = cls(root_pid, target_path, pgid=pgid)
+        group.started_at = root_create_time
+        group.key = (root_pid, root_create_time)
+        group._set_members(
+            (pid, create_time) for pid, create_time in members.items()
+            if psutil.pid_exists(pid) and group._member_alive(pid, create_time)
+        )
+        return group if group._members[0] else None
+
+    @property
+    def pgid(self) -> Optional[int]:
+        return self._pgid
+
+    @property
+    def name(self) -> str:
+        return Path(self.target_path).name
+
+    @property
+    def members(self) -> Dict[int, float]:
+        """成员 pid -> create_time（副本）"""
+        return dict(zip(*self._members))
+
+    def member_pids(self) -> tuple:
+        return tuple(self._members[0])
+
+    def _set_members(self, items):
+        pids, create_times = array('q'), array('d')
+        for pid, create_time in items:
+            pids.append(pid)
+            create_times.append(create_time)
+        self._members = (pids, create_times)
+
+    def _add_member(self, pid: int):
+        # 只在创建时和监控线程的 refresh() 中调用；先追加 pid，读者用 zip 时未配对的一项会被忽略
+        pids, create_times = self._members
+        if pid in pids:
+            return
+        try:
+            create_time = psutil.Process(pid).create_time()
+        except (psutil.NoSuchProcess, psutil.AccessDenied, OSError):
+            return
+        pids.append(pid)
+        create_times.append(create_time)
+
+    def _live_members(self):
+        return [(pid, ct) for pid, ct in zip(*self._members) if self._member_alive(pid, ct)]
+
+    def _member_alive(self, pid: int, create_time: float) -> bool:
+        if self._popen is not None and pid == self.root_pid and self._popen.poll() is not None:
+            return False
+        try:
+            proc = psutil.Process(pid)
+            return (proc.is_running() and abs(proc.create_time() - create_time) < 0.01
+                    and proc.status() != psutil.STATUS_ZOMBIE)
+        except (psutil.NoSuchProcess, psutil.AccessDenied, OSError):
+            return False
+
+    def refresh(self):
+        """更新成员：加入新出现的后代，移除已结束的进程"""
+        job_pids = self._job.pids() if self._job is not None else None
+        if job_pids:
+            for pid in job_pids:
+                self._add_member(pid)
+
+        for pid in self.member_pids():
+            try:
+                for child in psutil.Process(pid).children(recursive=True):
+                    self._add_member(child.pid)
+            except (psutil.NoSuchProcess, psutil.AccessDenied, OSError):
+                continue
+
+        self._set_members(self._live_members())
+
+        if not self._members[0] and self._pgid is not None:
+            # 启动器已退出，子进程被过继给 init，按进程组找回
+            for proc in psutil.process_iter():
+                try:
+                    if os.getpgid(proc.pid) == self._pgid:
+                        self._add_member(proc.pid)
+                except (psutil.NoSuchProcess, ProcessLookupError, PermissionError, OSError):
+                    continue
+            self._set_members(self._live_members())
+
+        if not self._members[0] and self._job is not None:
+            self._job.close()
+            self._job = None
+
+    def is_alive(self) -> bool:
+        """组内是否还有存活的进程"""
+        return any(self._member_alive(pid, ct) for pid, ct in zip(*self._members))
+
+    def root_exited_alone(self) -> bool:
+        """
+        根进程已退出且没有其他已知成员（只调用一次非阻塞的 Popen.poll，不访问其他进程）；
+        不是由本程序创建的根进程（启动器、恢复的程序组）无法这样判断，返回 False
+        """
+        if self._popen is None or self._popen.poll() is None:
+            return False
+        return all(pid == self.root_pid for pid in self.member_pids())
+
+    def contains(self, pid: int) -> bool:
+        return pid in self._members[0]
+
+    def focus_window(self) -> bool:
+        """把组内进程最上层的可见窗口切到前台"""
+        if not hasattr(ctypes, "windll"):
+            return False
+        try:
+            user32 = ctypes.windll.user32
+            pids = set(self._members[0])
+            found = []
+
+            enum_proc = ctypes.WINFUNCTYPE(ctypes.c_bool, ctypes.c_void_p, ctypes.c_void_p)
+
+            def _callback(hwnd, _):
+                # EnumWindows 按 Z 序枚举，第一个匹配的就是最上层窗口
+                if not user32.IsWindowVisible(hwnd) or user32.GetWindow(hwnd, GW_OWNER):
+                    return True
+                window_pid = ctypes.c_ulong()
+                user32.GetWindowThreadProcessId(hwnd, ctypes.byref(window_pid))
+                if window_pid.value in pids:
+                    found.append(hwnd)
+                    return False
+                return True
+
+            user32.EnumWindows(enum_proc(_callback), 0)
+            if not found:
+                return False
+
+            hwnd = found[0]
+            if user32.IsIconic(hwnd):
+                user32.ShowWindow(hwnd, SW_RESTORE)
+            # 模拟一次 Alt 键，解除系统对 SetForegroundWindow 的前台锁限制
+            user32.keybd_event(VK_MENU, 0, 0, 0)
+            user32.keybd_event(VK_MENU, 0, KEYEVENTF_KEYUP, 0)
+            return bool(user32.SetForegroundWindow(hwnd))
+        except Exception:
+            return False
+
+
+def normalize_exe_path(path: str) -> str:
+    """规范化可执行文件路径，作为运行实例索引的键"""
+    try:
+        resolved = str(Path(path).resolve())
+    except OSError:
+        resolved = str(Path(path).absolute())
+    return os.path.normcase(resolved)
+
+
+def is_direct_launchable(path: Path) -> bool:
+    """目标是否可以直接创建进程并拿到 PID"""
+    if sys.platform == 'win32':
+        return path.suffix.lower() in DIRECT_LAUNCH_SUFFIXES
+    return path.is_file() and os.access(path, os.X_OK)
+
+
+def spawn_tracked(path: Path, logger: Logger = None, launcher: LauncherHelper = None,
+                  exe_key: Optional[str] = None) -> ProcessGroup:
+    """
+    直接启动可执行文件，立即返回其进程组
+
+    Linux 上传入 launcher 时由启动器辅助进程创建子进程，辅助进程不可用时改为直接创建。
+    失败时抛出 OSError（例如需要提权的程序），调用方可回退到 Shell 方式启动。
+    exe_key 为已算好的规范化路径（可选），由程序组共用。
+    """
+    if sys.platform == 'win32':
+        # 不重定向标准句柄：控制台程序使用 CREATE_NEW_CONSOLE 创建的新控制台正常输入输出，
+        # 图形界面程序不使用它们
+        flags = subprocess.CREATE_NEW_PROCESS_GROUP | subprocess.CREATE_NEW_CONSOLE
+        proc = subprocess.Popen([str(path)], cwd=str(path.parent), creationflags=flags, close_fds=True)
+        job = _JobObject()
+        if not job.assign(proc.pid, getattr(proc, '_handle', None)):
+            job.close()
+            job = None
+            if logger:
+                logger.debug(f"无法加入作业对象，改用进程树跟踪: PID {proc.pid}")
+        return ProcessGroup(proc.pid, str(path), job=job, popen=proc, exe_key=exe_key)
+
+    if launcher is not None:
+        try:
+            pid = launcher.spawn(str(path), str(path.parent))
+            # 辅助进程以新会话启动目标，进程组 ID 即 PID
+            return ProcessGroup(pid, str(path), pgid=pid, exe_key=exe_key)
+        except LauncherUnavailable as e:
+            if logger:
+                logger.debug(f"启动器辅助进程不可用，改为直接启动: {e}")
+
+    proc = subprocess.Popen(
+        [str(path)], cwd=str(path.parent), start_new_session=True, close_fds=True,
+        stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    # 新会话的进程组 ID 即根进程 PID
+    return ProcessGroup(proc.pid, str(path), pgid=proc.pid, popen=proc, exe_key=exe_key)
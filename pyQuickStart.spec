@@ -11,6 +11,9 @@ a = Analysis(
         'pynput.keyboard', 
         'pynput.keyboard._win32', 
         'requests',
+        'watchdog.events',
+        'watchdog.observers',
+        'watchdog.observers.read_directory_changes',
         'PyQt5',
         'PyQt5.QtCore',
         'PyQt5.QtGui',
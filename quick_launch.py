@@ -0,0 +1,295 @@
+"""
+快速启动索引模块
+为快速启动面板维护所有已配置目标和启动过的目标的内存索引（三元组 + 词前缀），
+按匹配程度和使用频率排序
+"""
+import bisect
+import heapq
+import math
+import os
+import re
+import threading
+from typing import Callable, Dict, List, Optional, Set
+
+KIND_TARGET = "target"
+KIND_WORKSPACE = "workspace"
+
+
+class QuickLaunchEntry:
+    """面板中的一项：一个目标路径，或一个工作区绑定"""
+
+    __slots__ = ('key', 'kind', 'target', 'title', 'detail', 'hotkeys', 'from_history', 'text', 'title_text')
+
+    def __init__(self, key, kind: str, target, title: str, detail: str):
+        self.key = key
+        self.kind = kind
+        # 启动时使用：目标路径，或工作区的快捷键
+        self.target = target
+        self.title = title
+        self.detail = detail
+        self.hotkeys: Set[str] = set()
+        # 是否来自使用记录（没有绑定时仍保留在面板中）
+        self.from_history = False
+        self.text = ""
+        self.title_text = ""
+
+    def hotkey_text(self) -> str:
+        return ", ".join(sorted(h.upper() for h in self.hotkeys))
+
+
+def _initials(title: str) -> str:
+    """词首字母，例如 "Visual Studio Code" -> "vsc" """
+    words = title.replace('-', ' ').replace('_', ' ').replace('.', ' ').split()
+    return "".join(word[0] for word in words if word).lower()
+
+
+def _path_parts(path: str) -> List[str]:
+    """按 / 和 \\ 拆分路径（在任何平台上都能处理 Windows 路径）"""
+    return [part for part in re.split(r'[\\/]+', path) if part]
+
+
+def _is_url(path: str) -> bool:
+    return path.startswith(('http://', 'https://', 'www.'))
+
+
+def _target_title(path: str) -> str:
+    if _is_url(path):
+        return path
+    parts = _path_parts(path)
+    return parts[-1] if parts else path
+
+
+def _search_detail(entry: 'QuickLaunchEntry') -> str:
+    """参与搜索的附加文本：只取所在目录名，不索引整条路径（减少三元组数量）"""
+    if entry.kind != KIND_TARGET or _is_url(entry.target):
+        return entry.detail
+    parts = _path_parts(entry.target)
+    return parts[-2] if len(parts) > 1 else ""
+
+
+def _words(text: str) -> Set[str]:
+    for sep in '\\/:._-+()[]':
+        text = text.replace(sep, ' ')
+    return set(text.split())
+
+
+class QuickLaunchIndex:
+    """
+    快速启动的内存索引
+
+    每项的搜索文本（名称、所在目录名、快捷键、名称首字母）拆成三元组建立倒排表，
+    另为每个词的前 1~2 个字符建立前缀表。查询时每个关键词取对应倒排表的交集，
+    三个字符以上的关键词再做一次子串校验。增删条目只更新该条目涉及的倒排表。
+
+    排序分数 = 匹配位置得分 + 静态权重（weight_fn 给出的使用次数、是否绑定快捷键）。
+    静态权重排名是一个有序列表，条目增删和 record_use() 时按二分查找单独
+    插入或移出，查询从不重建排名。候选较多时按静态权重从高到低遍历，
+    剩余条目即使匹配得分最高也无法进入前 limit 名时提前结束，且最多检查
+    WALK_LIMIT 个候选，宽泛的查询也不需要为每个候选计算分数。
+    """
+
+    MAX_RESULTS = 50
+    PREFIX_LENGTH = 2
+    # 候选不超过该数量时直接逐个打分
+    DIRECT_SCORE_LIMIT = 2000
+    # 候选很多时最多检查这么多个（按静态权重从高到低），宽泛查询只在常用条目中排序
+    WALK_LIMIT = 3000
+    # 匹配位置得分：名称开头 / 名称中 / 其他位置
+    SCORE_TITLE_PREFIX = 30
+    SCORE_TITLE = 20
+    SCORE_OTHER = 5
+
+    def __init__(self, weight_fn: Optional[Callable[[str], float]] = None):
+        self._weight_fn = weight_fn or (lambda target: 0)
+        self._lock = threading.Lock()
+        self._entries: Dict[object, QuickLaunchEntry] = {}
+        self._ids: Dict[object, int] = {}
+        self._by_id: Dict[int, QuickLaunchEntry] = {}
+        self._next_id = 0
+        self._trigrams: Dict[str, Set[int]] = {}
+        self._prefixes: Dict[str, Set[int]] = {}
+        # (-静态权重, 条目 id) 的有序列表，即按静态权重从高到低排列，增删时二分插入 / 移出
+        self._ranked: List[tuple] = []
+        self._static: Dict[int, float] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @staticmethod
+    def target_key(path: str):
+        return (KIND_TARGET, os.path.normcase(path))
+
+    def add_target(self, path: str, hotkey=None, from_history: bool = False):
+        """加入（或更新）一个目标路径；hotkey 为绑定到它的快捷键"""
+        key = self.target_key(path)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                entry = QuickLaunchEntry(key, KIND_TARGET, path, _target_title(path), path)
+            elif (hotkey is None or str(hotkey) in entry.hotkeys) and (entry.from_history or not from_history):
+                return
+            if hotkey is not None:
+                entry.hotkeys.add(str(hotkey))
+            entry.from_history = entry.from_history or from_history
+            self._index_locked(entry)
+
+    def record_use(self, path: str):
+        """目标被启动了一次：加入使用记录，并按新的使用次数调整它在排名中的位置"""
+        key = self.target_key(path)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                entry = QuickLaunchEntry(key, KIND_TARGET, path, _target_title(path), path)
+                entry.from_history = True
+                self._index_locked(entry)
+                return
+            entry.from_history = True
+            entry_id = self._ids[key]
+            self._unrank_locked(entry_id)
+            self._rank_locked(entry_id, entry)
+
+    def remove_target_hotkey(self, path: str, hotkey):
+        """快捷键不再绑定该目标；既没有其他绑定也不来自使用记录时移除"""
+        key = self.target_key(path)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return
+            entry.hotkeys.discard(str(hotkey))
+            if entry.hotkeys or entry.from_history:
+                self._index_locked(entry)
+            else:
+                self._remove_locked(key)
+
+    def add_workspace(self, hotkey, title: str):
+        key = (KIND_WORKSPACE, str(hotkey))
+        entry = QuickLaunchEntry(key, KIND_WORKSPACE, hotkey, title, "工作区")
+        entry.hotkeys.add(str(hotkey))
+        with self._lock:
+            self._index_locked(entry)
+
+    def remove_workspace(self, hotkey):
+        with self._lock:
+            self._remove_locked((KIND_WORKSPACE, str(hotkey)))
+
+    def _index_locked(self, entry: QuickLaunchEntry):
+        """（重新）建立一项的倒排表"""
+        self._remove_locked(entry.key)
+        entry_id = self._next_id
+        self._next_id += 1
+        entry.title_text = entry.title.lower()
+        entry.text = " ".join((entry.title_text, _search_detail(entry).lower(), " ".join(entry.hotkeys),
+                               _initials(entry.title)))
+
+        grams, prefixes = self._tokens(entry.text)
+        for gram in grams:
+            self._trigrams.setdefault(gram, set()).add(entry_id)
+        for prefix in prefixes:
+            self._prefixes.setdefault(prefix, set()).add(entry_id)
+
+        self._entries[entry.key] = entry
+        self._ids[entry.key] = entry_id
+        self._by_id[entry_id] = entry
+        self._rank_locked(entry_id, entry)
+
+    def _rank_locked(self, entry_id: int, entry: QuickLaunchEntry):
+        """计算一项的静态权重并插入排名"""
+        uses = self._weight_fn(entry.target) if entry.kind == KIND_TARGET else 0
+        static = 10 * math.log1p(uses) + (5 if entry.hotkeys else 0)
+        self._static[entry_id] = static
+        bisect.insort(self._ranked, (-static, entry_id))
+
+    def _unrank_locked(self, entry_id: int):
+        static = self._static.pop(entry_id)
+        index = bisect.bisect_left(self._ranked, (-static, entry_id))
+        del self._ranked[index]
+
+    def _tokens(self, text: str) -> tuple:
+        """搜索文本的三元组和词前缀（删除时由保存的文本重新计算，不另存每项的倒排位置）"""
+        grams = {text[i:i + 3] for i in range(len(text) - 2)}
+        prefixes = {word[:n] for word in _words(text) for n in range(1, self.PREFIX_LENGTH + 1)}
+        return grams, prefixes
+
+    def _remove_locked(self, key):
+        entry_id = self._ids.pop(key, None)
+        if entry_id is None:
+            return
+        entry = self._entries.pop(key)
+        self._by_id.pop(entry_id, None)
+        self._unrank_locked(entry_id)
+        grams, prefixes = self._tokens(entry.text)
+        for table, tokens in ((self._trigrams, grams), (self._prefixes, prefixes)):
+            for token in tokens:
+                ids = table.get(token)
+                if ids is not None:
+                    ids.discard(entry_id)
+                    if not ids:
+                        del table[token]
+
+    def search(self, query: str, limit: int = MAX_RESULTS) -> List[QuickLaunchEntry]:
+        """按关键词（空格分隔，全部需匹配）查询；查询为空时返回最常用的条目"""
+        words = query.lower().split()
+        with self._lock:
+            if not words:
+                return [self._by_id[i] for _, i in self._ranked[:limit]]
+            ids = None
+            for word in sorted(words, key=len, reverse=True):
+                matched = self._match_word(word, ids)
+                ids = matched if ids is None else ids & matched
+                if not ids:
+                    return []
+
+            static = self._static
+            by_id = self._by_id
+            if len(ids) <= self.DIRECT_SCORE_LIMIT:
+                best = heapq.nlargest(limit, ids, key=lambda i: static[i] + self._match_score(by_id[i], words))
+                return [by_id[i] for i in best]
+
+            # 按静态权重遍历，上界不足以进入前 limit 名时停止
+            max_match = self.SCORE_TITLE_PREFIX * len(words)
+            heap = []
+            examined = 0
+            for _, i in self._ranked:
+                if i not in ids:
+                    continue
+                if len(heap) == limit and static[i] + max_match <= heap[0][0]:
+                    break
+                examined += 1
+                if examined > self.WALK_LIMIT:
+                    break
+                item = (static[i] + self._match_score(by_id[i], words), -i)
+                if len(heap) < limit:
+                    heapq.heappush(heap, item)
+                elif item > heap[0]:
+                    heapq.heapreplace(heap, item)
+            return [by_id[-i] for _, i in sorted(heap, reverse=True)]
+
+    def _match_word(self, word: str, within: Optional[Set[int]]) -> Set[int]:
+        if len(word) < 3:
+            return set(self._prefixes.get(word[:self.PREFIX_LENGTH], ()))
+        postings = [self._trigrams.get(word[i:i + 3]) for i in range(len(word) - 2)]
+        if not all(postings):
+            return set()
+        postings.sort(key=len)
+        ids = set(postings[0]) if within is None else within & postings[0]
+        for posting in postings[1:]:
+            ids &= posting
+            if not ids:
+                return ids
+        if len(word) == 3:
+            return ids
+        # 三元组都出现不代表连续出现，做一次子串校验
+        by_id = self._by_id
+        return {i for i in ids if word in by_id[i].text}
+
+    def _match_score(self, entry: QuickLaunchEntry, words: List[str]) -> float:
+        score = 0
+        for word in words:
+            position = entry.title_text.find(word)
+            if position == 0:
+                score += self.SCORE_TITLE_PREFIX
+            elif position > 0:
+                score += self.SCORE_TITLE
+            else:
+                score += self.SCORE_OTHER
+        return score
@@ -0,0 +1,258 @@
+"""
+资源统计模块
+按程序组汇总被跟踪程序（含子进程）的 CPU、内存和线程数
+"""
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+import psutil
+from logger import Logger
+
+
+class ResourceMonitor:
+    """
+    后台资源采样线程
+
+    每轮对每个成员进程使用 psutil oneshot() 一次性读取 CPU 时间、内存和线程数。
+    采样间隔自适应：占用变化明显时加快，平稳时逐步放慢，并保证采样自身的
+    耗时不超过间隔的 1/COST_BUDGET_RATIO。窗口隐藏时暂停采样。
+    """
+
+    MIN_INTERVAL_SECONDS = 1.0
+    MAX_INTERVAL_SECONDS = 10.0
+    BACKOFF_FACTOR = 1.5
+    # 总 CPU 占用变化超过该值（百分点）视为有明显变化
+    CPU_CHANGE_THRESHOLD = 5.0
+    # 采样耗时最多占间隔的 1%
+    COST_BUDGET_RATIO = 100
+    COST_EWMA_ALPHA = 0.2
+
+    def __init__(self, groups_provider: Callable[[], list]):
+        self.logger = Logger()
+        self._groups_provider = groups_provider
+        self._cpu_count = psutil.cpu_count() or 1
+        self.interval = self.MIN_INTERVAL_SECONDS
+
+        # (pid, create_time) -> (psutil.Process, 上次 CPU 时间, 上次采样时刻)
+        self._procs: Dict[Tuple[int, float], list] = {}
+        self._last_total_cpu = 0.0
+        self._last_root_pids: set = set()
+        self._snapshot: dict = self._empty_snapshot()
+
+        # 采样自身的开销
+        self.sample_count = 0
+        self.last_cost_ms = 0.0
+        self.avg_cost_ms = 0.0
+        self.total_cost_cpu_seconds = 0.0
+
+        self._thread = None
+        self._stop_event = threading.Event()
+        self._wake_event = threading.Event()
+        # 暂停状态与唤醒事件分开保存：停止监听不会解除窗口隐藏导致的暂停
+        self._paused = False
+        self._resume_event = threading.Event()
+        self._resume_event.set()
+
+    def start(self):
+        """启动后台采样（重复调用无副作用；窗口隐藏期间启动时保持暂停）"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop_event = threading.Event()
+        self._wake_event = threading.Event()
+        self._resume_event = threading.Event()
+        if not self._paused:
+            self._resume_event.set()
+        self._thread = threading.Thread(target=self._run, daemon=True, name="ResourceMonitor")
+        self._thread.start()
+
+    def stop(self):
+        """停止后台采样"""
+        self._stop_event.set()
+        self._wake_event.set()
+        # 只唤醒暂停中的旧线程使其退出，暂停状态保持不变
+        self._resume_event.set()
+        self._thread = None
+        self._procs.clear()
+        self._snapshot = self._empty_snapshot()
+
+    def set_paused(self, paused: bool):
+        """暂停或恢复采样（窗口隐藏时暂停）"""
+        if paused:
+            self._paused = True
+            self._resume_event.clear()
+            return
+        if self._paused:
+            # 暂停期间的 CPU 时间不计入，恢复后重新建立基线
+            self._paused = False
+            self._procs.clear()
+            self.interval = self.MIN_INTERVAL_SECONDS
+            self._resume_event.set()
+            self._wake_event.set()
+
+    @property
+    def paused(self) -> bool:
+        return self._paused
+
+    def snapshot(self) -> dict:
+        """最近一次采样结果（只读副本）"""
+        return self._snapshot
+
+    def _run(self):
+        stop_event = self._stop_event
+        wake_event = self._wake_event
+        resume_event = self._resume_event
+        while not stop_event.is_set():
+            if self._paused:
+                resume_event.wait()
+                continue
+            try:
+                self.sample_once()
+            except Exception as e:
+                self.logger.debug(f"资源采样失败: {e}")
+            wake_event.wait(self.interval)
+            wake_event.clear()
+
+    def sample_once(self) -> dict:
+        """采样一轮并更新快照"""
+        wall_started = time.perf_counter()
+        cpu_started = time.thread_time()
+
+        groups = [group for group in self._groups_provider() if group.members]
+        seen = set()
+        group_stats = []
+        for group in groups:
+            stat = {
+                'name': group.name,
+                'target_path': group.target_path,
+                'root_pid': group.root_pid,
+                'processes': 0,
+                'cpu_percent': 0.0,
+                'rss': 0,
+                'threads': 0,
+            }
+            for pid, create_time in list(group.members.items()):
+                key = (pid, create_time)
+                if key in seen:
+                    continue
+                seen.add(key)
+                usage = self._sample_process(key)
+                if usage is None:
+                    continue
+                cpu_percent, rss, threads = usage
+                stat['processes'] += 1
+                stat['cpu_percent'] += cpu_percent
+                stat['rss'] += rss
+                stat['threads'] += threads
+            if stat['processes']:
+                group_stats.append(stat)
+
+        # 清理已不在任何程序组中的进程缓存
+        for key in list(self._procs):
+            if key not in seen:
+                del self._procs[key]
+
+        group_stats.sort(key=lambda s: (s['cpu_percent'], s['rss']), reverse=True)
+        total = {
+            'processes': sum(s['processes'] for s in group_stats),
+            'cpu_percent': sum(s['cpu_percent'] for s in group_stats),
+            'rss': sum(s['rss'] for s in group_stats),
+            'threads': sum(s['threads'] for s in group_stats),
+        }
+
+        cost_ms = (time.perf_counter() - wall_started) * 1000
+        self.total_cost_cpu_seconds += time.thread_time() - cpu_started
+        self.sample_count += 1
+        self.last_cost_ms = cost_ms
+        if self.sample_count == 1:
+            self.avg_cost_ms = cost_ms
+        else:
+            self.avg_cost_ms += self.COST_EWMA_ALPHA * (cost_ms - self.avg_cost_ms)
+
+        self._adapt_interval(total['cpu_percent'], set(s['root_pid'] for s in group_stats))
+
+        self._snapshot = {
+            'groups': group_stats,
+            'total': total,
+            'sampled_at': time.time(),
+            'interval': self.interval,
+            'last_cost_ms': self.last_cost_ms,
+            'avg_cost_ms': self.avg_cost_ms,
+            'total_cost_cpu_seconds': self.total_cost_cpu_seconds,
+            'sample_count': self.sample_count,
+        }
+        return self._snapshot
+
+    def _sample_process(self, key: Tuple[int, float]) -> Optional[tuple]:
+        """读取单个进程的 (CPU%, RSS, 线程数)，进程已结束返回 None"""
+        now = time.monotonic()
+        entry = self._procs.get(key)
+        try:
+            if entry is None:
+                proc = psutil.Process(key[0])
+            else:
+                proc = entry[0]
+            with proc.oneshot():
+                cpu_times = proc.cpu_times()
+                rss = proc.memory_info().rss
+                threads = proc.num_threads()
+        except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess, OSError):
+            self._procs.pop(key, None)
+            return None
+
+        cpu_time = cpu_times.user + cpu_times.system
+        cpu_percent = 0.0
+        if entry is not None:
+            elapsed = now - entry[2]
+            if elapsed > 0:
+                # 与任务管理器一致，按逻辑核心数归一化到 0-100
+                cpu_percent = max(0.0, (cpu_time - entry[1]) / elapsed * 100 / self._cpu_count)
+        self._procs[key] = [proc, cpu_time, now]
+        return cpu_percent, rss, threads
+
+    def _adapt_interval(self, total_cpu: float, root_pids: set):
+        """根据占用变化调整下一次采样间隔"""
+        changed = (abs(total_cpu - self._last_total_cpu) >= self.CPU_CHANGE_THRESHOLD
+                   or root_pids != self._last_root_pids)
+        self._last_total_cpu = total_cpu
+        self._last_root_pids = root_pids
+
+        if not root_pids:
+            interval = self.MAX_INTERVAL_SECONDS
+        elif changed:
+            interval = self.MIN_INTERVAL_SECONDS
+        else:
+            interval = min(self.MAX_INTERVAL_SECONDS, self.interval * self.BACKOFF_FACTOR)
+
+        # 采样越慢，间隔越长，保证开销不超过预算
+        cost_floor = self.avg_cost_ms / 1000 * self.COST_BUDGET_RATIO
+        self.interval = max(interval, cost_floor)
+
+    def _empty_snapshot(self) -> dict:
+        return {
+            'groups': [],
+            'total': {'processes': 0, 'cpu_percent': 0.0, 'rss': 0, 'threads': 0},
+            'sampled_at': 0.0,
+            'interval': self.interval,
+            'last_cost_ms': 0.0,
+            'avg_cost_ms': 0.0,
+            'total_cost_cpu_seconds': 0.0,
+            'sample_count': 0,
+        }
+
+
+def format_bytes(size: int) -> str:
+    """字节数格式化为 MB / GB"""
+    if size >= 1024 ** 3:
+        return f"{size / 1024 ** 3:.1f} GB"
+    return f"{size / 1024 ** 2:.0f} MB"
+
+
+def describe_groups(snapshot: dict) -> List[str]:
+    """每个程序组一行的文字说明"""
+    lines = []
+    for stat in snapshot['groups']:
+        lines.append(
+            f"{stat['name']}: CPU {stat['cpu_percent']:.1f}%  内存 {format_bytes(stat['rss'])}  "
+            f"线程 {stat['threads']}  进程 {stat['processes']}"
+        )
+    return lines
@@ -0,0 +1,161 @@
+"""
+状态日志模块
+把被跟踪的程序组、防休眠状态和当前方案追加写入日志文件，
+崩溃或更新重启后重放，无需全量扫描进程即可恢复
+"""
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+from logger import Logger
+
+GroupKey = Tuple[int, float]
+
+
+class StateJournal:
+    """
+    只追加的状态日志（每行一个 JSON 记录）
+
+    记录类型:
+        {"t": "group", "key": [pid, 创建时间], "path": ..., "pgid": ..., "members": [[pid, 创建时间], ...]}
+        {"t": "drop", "key": [pid, 创建时间]}
+        {"t": "keep_awake", "on": true}
+        {"t": "profile", "name": "工作"}
+    每条记录写入后立即 flush（进程崩溃不丢失）；追加超过 COMPACT_AFTER_RECORDS 条后
+    把当前状态写成快照并原子替换文件。重放时忽略末尾写了一半的记录。
+    """
+
+    COMPACT_AFTER_RECORDS = 200
+
+    def __init__(self, journal_file: str = "state.journal"):
+        self.journal_file = Path(journal_file)
+        self.logger = Logger()
+        self._lock = threading.Lock()
+        self._file = None
+        self._appended = 0
+        # 当前状态（与文件内容一致）
+        self.groups: Dict[GroupKey, dict] = {}
+        self.keep_awake = False
+        self.profile: Optional[str] = None
+
+    def load(self) -> Dict:
+        """
+        重放日志，返回 {"groups": [程序组记录...], "keep_awake": bool, "profile": 名称或 None}
+        """
+        with self._lock:
+            self.groups = {}
+            self.keep_awake = False
+            self.profile = None
+            try:
+                with open(self.journal_file, 'r', encoding='utf-8') as f:
+                    for line in f:
+                        try:
+                            self._apply(json.loads(line))
+                        except (ValueError, TypeError, KeyError):
+                            # 崩溃时写了一半的记录
+                            continue
+            except FileNotFoundError:
+                pass
+            except Exception as e:
+                self.logger.error(f"读取状态日志失败: {e}")
+            return {
+                "groups": list(self.groups.values()),
+                "keep_awake": self.keep_awake,
+                "profile": self.profile,
+            }
+
+    def _apply(self, entry: dict):
+        kind = entry["t"]
+        if kind == "group":
+            self.groups[tuple(entry["key"])] = entry
+        elif kind == "drop":
+            self.groups.pop(tuple(entry["key"]), None)
+        elif kind == "keep_awake":
+            self.keep_awake = bool(entry["on"])
+        elif kind == "profile":
+            self.profile = entry["name"]
+
+    def record_group(self, group):
+        """记录（或更新）一个程序组"""
+        self._append({
+            "t": "group",
+            "key": list(group.key),
+            "path": group.target_path,
+            "pgid": group.pgid,
+            "members": [[pid, create_time] for pid, create_time in list(group.members.items())],
+        })
+
+    def record_drop(self, group):
+        """记录程序组已结束或不再跟踪"""
+        if tuple(group.key) in self.groups:
+            self._append({"t": "drop", "key": list(group.key)})
+
+    def record_keep_awake(self, enabled: bool):
+        if enabled != self.keep_awake:
+            self._append({"t": "keep_awake", "on": bool(enabled)})
+
+    def record_profile(self, name: str):
+        if name != self.profile:
+            self._append({"t": "profile", "name": name})
+
+    def _append(self, entry: dict):
+        line = json.dumps(entry, ensure_ascii=False) + "\n"
+        with self._lock:
+            self._apply(entry)
+            try:
+                if self._file is None:
+                    self._file = open(self.journal_file, 'a', encoding='utf-8')
+                self._file.write(line)
+                self._file.flush()
+            except Exception as e:
+                self.logger.error(f"写入状态日志失败: {e}")
+                return
+            self._appended += 1
+            if self._appended >= self.COMPACT_AFTER_RECORDS:
+                self._compact_locked()
+
+    def compact(self, groups=None):
+        """
+        把当前状态写成快照替换日志
+        groups: 传入时用这些程序组（例如恢复后仍在运行的）替换已记录的程序组
+        """
+        with self._lock:
+            if groups is not None:
+                known = self.groups
+                self.groups = {}
+                for group in groups:
+                    key = tuple(group.key)
+                    self.groups[key] = known.get(key) or {
+                        "t": "group", "key": list(key), "path": group.target_path, "pgid": group.pgid,
+                        "members": [[pid, ct] for pid, ct in list(group.members.items())],
+                    }
+            self._compact_locked()
+
+    def _compact_locked(self):
+        entries = list(self.groups.values())
+        entries.append({"t": "keep_awake", "on": self.keep_awake})
+        if self.profile is not None:
+            entries.append({"t": "profile", "name": self.profile})
+        temp_file = self.journal_file.with_name(self.journal_file.name + ".tmp")
+        try:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+            with open(temp_file, 'w', encoding='utf-8') as f:
+                for entry in entries:
+                    f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_file, self.journal_file)
+            self._appended = 0
+        except Exception as e:
+            self.logger.error(f"压缩状态日志失败: {e}")
+
+    def close(self):
+        """压缩并关闭日志"""
+        with self._lock:
+            self._compact_locked()
+            if self._file is not None:
+                self._file.close()
+                self._file = None
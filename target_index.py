@@ -0,0 +1,471 @@
+"""
+目标文件索引模块
+在后台把指定目录下的可执行文件、快捷方式和文件夹写入 SQLite 全文索引，
+供添加快捷键时在路径输入框中边输入边查找
+"""
+import ctypes
+import os
+import sqlite3
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Set, Tuple
+from logger import Logger
+
+try:
+    from watchdog.events import FileSystemEventHandler
+    from watchdog.observers import Observer
+except ImportError:
+    FileSystemEventHandler = object
+    Observer = None
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS dirs (
+    path TEXT PRIMARY KEY,
+    parent TEXT NOT NULL,
+    mtime REAL NOT NULL,
+    depth INTEGER NOT NULL,
+    root TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS targets (
+    id INTEGER PRIMARY KEY,
+    path TEXT NOT NULL UNIQUE,
+    dir TEXT NOT NULL,
+    name TEXT NOT NULL,
+    parent TEXT NOT NULL,
+    kind TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_dirs_parent ON dirs (parent);
+CREATE INDEX IF NOT EXISTS idx_targets_dir ON targets (dir);
+CREATE VIRTUAL TABLE IF NOT EXISTS targets_fts USING fts5 (
+    name, parent, content='targets', content_rowid='id', prefix='1 2 3'
+);
+CREATE TRIGGER IF NOT EXISTS targets_ai AFTER INSERT ON targets BEGIN
+    INSERT INTO targets_fts (rowid, name, parent) VALUES (new.id, new.name, new.parent);
+END;
+CREATE TRIGGER IF NOT EXISTS targets_ad AFTER DELETE ON targets BEGIN
+    INSERT INTO targets_fts (targets_fts, rowid, name, parent) VALUES ('delete', old.id, old.name, old.parent);
+END;
+"""
+
+# 目标类型
+KIND_PROGRAM = "program"
+KIND_SHORTCUT = "shortcut"
+KIND_FOLDER = "folder"
+
+WINDOWS_PROGRAM_SUFFIXES = {'.exe', '.bat', '.cmd', '.msc', '.appref-ms'}
+SHORTCUT_SUFFIXES = {'.lnk', '.url', '.desktop'}
+POSIX_PROGRAM_SUFFIXES = {'.appimage', '.sh'}
+# 不进入的目录（小写）
+SKIP_DIR_NAMES = {'node_modules', '__pycache__', '$recycle.bin', 'windowsapps', 'temp', 'tmp', 'cache',
+                  'caches', 'site-packages', 'locale', 'locales', 'logs'}
+
+# Windows 线程后台模式（同时降低 CPU 和 IO 优先级）
+THREAD_MODE_BACKGROUND_BEGIN = 0x00010000
+
+
+def default_roots() -> List[str]:
+    """默认扫描目录：开始菜单、桌面和程序安装目录"""
+    home = Path.home()
+    if sys.platform == 'win32':
+        env = os.environ.get
+        candidates = [
+            Path(env('ProgramData', r'C:\ProgramData')) / 'Microsoft' / 'Windows' / 'Start Menu' / 'Programs',
+            Path(env('APPDATA', str(home / 'AppData' / 'Roaming'))) / 'Microsoft' / 'Windows' / 'Start Menu' / 'Programs',
+            home / 'Desktop',
+            Path(env('PUBLIC', r'C:\Users\Public')) / 'Desktop',
+            Path(env('LOCALAPPDATA', str(home / 'AppData' / 'Local'))) / 'Programs',
+            Path(env('ProgramFiles', r'C:\Program Files')),
+            Path(env('ProgramFiles(x86)', r'C:\Program Files (x86)')),
+        ]
+    else:
+        candidates = [
+            Path('/usr/share/applications'), home / '.local' / 'share' / 'applications',
+            home / 'Desktop', Path('/opt'), Path('/usr/local/bin'), home / 'bin', home / '.local' / 'bin',
+        ]
+    return [str(path) for path in candidates if path.is_dir()]
+
+
+def classify(entry: os.DirEntry) -> Optional[str]:
+    """文件是否可作为启动目标，返回目标类型"""
+    suffix = os.path.splitext(entry.name)[1].lower()
+    if suffix in SHORTCUT_SUFFIXES:
+        return KIND_SHORTCUT
+    if sys.platform == 'win32':
+        return KIND_PROGRAM if suffix in WINDOWS_PROGRAM_SUFFIXES else None
+    if suffix in POSIX_PROGRAM_SUFFIXES:
+        return KIND_PROGRAM
+    try:
+        return KIND_PROGRAM if entry.stat().st_mode & 0o111 else None
+    except OSError:
+        return None
+
+
+class _ChangeHandler(FileSystemEventHandler):
+    """把文件系统事件转换为需要重新扫描的目录"""
+
+    def __init__(self, index: 'TargetIndex'):
+        super().__init__()
+        self._index = index
+
+    def on_any_event(self, event):
+        paths = [event.src_path, getattr(event, 'dest_path', None)]
+        for path in paths:
+            if path:
+                self._index.mark_dirty(os.path.dirname(os.fsdecode(path)))
+                if event.is_directory:
+                    self._index.mark_dirty(os.fsdecode(path))
+
+
+class TargetIndex:
+    """
+    可启动目标的持久化索引
+
+    后台线程按目录扫描，每个目录记录修改时间：目录中有文件增删或改名时
+    它的修改时间会变化，之后的刷新只重新列出修改时间变了的目录。
+    装有 watchdog 时由文件系统通知标记需要刷新的目录，定期全量核对只作为兜底；
+    否则按 poll_interval 定期核对。扫描速度受 dirs_per_second 限制，线程为后台优先级。
+
+    search() 在调用线程中查询 FTS5 索引（名称和所在目录名按词前缀匹配）。
+    """
+
+    COMMIT_EVERY_DIRS = 50
+    # 收到文件系统通知后等待一小段时间，合并连续的变更
+    DEBOUNCE_SECONDS = 1.0
+    # 刚启动时给程序自身的初始化留出时间
+    STARTUP_DELAY_SECONDS = 10
+    # 有文件系统通知时全量核对的间隔
+    WATCHED_POLL_SECONDS = 3600
+    MAX_RESULTS = 20
+    # 只核对修改时间（不列出内容）的目录按扫描一个目录的这个比例计入速度限制
+    CHECK_COST = 0.05
+
+    def __init__(self, db_file: str = "target_index.db", settings: Optional[dict] = None):
+        self.db_file = db_file
+        self.logger = Logger()
+        self.enabled = True
+        self.roots: List[str] = []
+        self.max_depth = 6
+        self.dirs_per_second = 200.0
+        self.poll_interval_seconds = 600.0
+        # 文件夹本身只在根目录下这么多层以内作为目标
+        self.folder_depth = 2
+        self.apply_settings(settings or {})
+
+        self._thread = None
+        self._stop_event = threading.Event()
+        self._wake_event = threading.Event()
+        self._dirty_lock = threading.Lock()
+        self._dirty: Set[str] = set()
+        self._observer = None
+        self._read_lock = threading.Lock()
+        self._read_conn: Optional[sqlite3.Connection] = None
+        self._ready = threading.Event()
+        self._next_scan_at = 0.0
+
+    def apply_settings(self, settings: dict):
+        """应用配置: enabled / roots / max_depth / dirs_per_second / poll_interval_minutes"""
+        try:
+            self.enabled = bool(settings.get('enabled', self.enabled))
+            roots = settings.get('roots')
+            if isinstance(roots, list) and roots:
+                self.roots = [os.path.normpath(os.path.expandvars(os.path.expanduser(str(root))))
+                              for root in roots]
+            else:
+                self.roots = default_roots()
+            if 'max_depth' in settings:
+                self.max_depth = max(0, int(settings['max_depth']))
+            if 'dirs_per_second' in settings:
+                self.dirs_per_second = max(1.0, float(settings['dirs_per_second']))
+            if 'poll_interval_minutes' in settings:
+                self.poll_interval_seconds = max(60.0, float(settings['poll_interval_minutes']) * 60)
+        except (TypeError, ValueError) as e:
+            self.logger.warning(f"目标索引配置无效，使用默认值: {e}")
+
+    def start(self):
+        """启动后台索引（重复调用无副作用）"""
+        if not self.enabled:
+            return
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop_event = threading.Event()
+        self._wake_event = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True, name="TargetIndex")
+        self._thread.start()
+
+    def stop(self):
+        """停止后台索引和文件系统监视"""
+        self._stop_event.set()
+        self._wake_event.set()
+        thread, self._thread = self._thread, None
+        if thread is not None:
+            thread.join(timeout=5)
+        with self._read_lock:
+            if self._read_conn is not None:
+                self._read_conn.close()
+                self._read_conn = None
+
+    def mark_dirty(self, directory: str):
+        """标记目录需要重新扫描（文件系统通知线程调用）"""
+        with self._dirty_lock:
+            self._dirty.add(directory)
+        self._wake_event.set()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_file, timeout=5, check_same_thread=False)
+        # WAL 模式下读写互不阻塞
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    def search(self, text: str, limit: int = MAX_RESULTS) -> List[Tuple[str, str]]:
+        """按词前缀查找目标，返回 [(路径, 类型)]（按相关度排序，名称权重高于目录名）"""
+        words = [word.replace('"', '') for word in text.split()]
+        words = [word for word in words if word]
+        if not words or not self._ready.is_set():
+            return []
+        query = " ".join(f'"{word}"*' for word in words)
+        with self._read_lock:
+            try:
+                if self._read_conn is None:
+                    self._read_conn = self._connect()
+                return self._read_conn.execute(
+                    "SELECT t.path, t.kind FROM targets_fts JOIN targets t ON t.id = targets_fts.rowid "
+                    "WHERE targets_fts MATCH ? ORDER BY bm25(targets_fts, 10.0, 1.0) LIMIT ?",
+                    (query, limit)
+                ).fetchall()
+            except sqlite3.Error as e:
+                self.logger.debug(f"查询目标索引失败: {e}")
+                return []
+
+    def count(self) -> int:
+        """已索引的目标数量"""
+        if not self._ready.is_set():
+            return 0
+        with self._read_lock:
+            try:
+                if self._read_conn is None:
+                    self._read_conn = self._connect()
+                return self._read_conn.execute("SELECT COUNT(*) FROM targets").fetchone()[0]
+            except sqlite3.Error:
+                return 0
+
+    def _run(self):
+        stop_event = self._stop_event
+        self._lower_thread_priority()
+        try:
+            conn = self._connect()
+            conn.executescript(_SCHEMA)
+            conn.commit()
+        except sqlite3.Error as e:
+            self.logger.error(f"初始化目标索引数据库失败: {e}")
+            return
+        self._ready.set()
+        if stop_event.wait(self.STARTUP_DELAY_SECONDS):
+            conn.close()
+            return
+
+        self._start_observer()
+        poll_seconds = self.WATCHED_POLL_SECONDS if self._observer is not None else self.poll_interval_seconds
+        try:
+            while not stop_event.is_set():
+                try:
+                    self.refresh(conn)
+                except Exception as e:
+                    self.logger.error(f"刷新目标索引失败: {e}")
+                deadline = time.monotonic() + poll_seconds
+                while not stop_event.is_set():
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    if self._wake_event.wait(remaining):
+                        self._wake_event.clear()
+                        if stop_event.wait(self.DEBOUNCE_SECONDS):
+                            break
+                        try:
+                            self._scan_dirty(conn)
+                        except Exception as e:
+                            self.logger.error(f"更新目标索引失败: {e}")
+        finally:
+            self._stop_observer()
+            conn.close()
+
+    def _lower_thread_priority(self):
+        """把当前线程降为后台优先级"""
+        try:
+            if sys.platform == 'win32':
+                kernel32 = ctypes.windll.kernel32
+                kernel32.SetThreadPriority(kernel32.GetCurrentThread(), THREAD_MODE_BACKGROUND_BEGIN)
+            elif hasattr(os, 'setpriority') and hasattr(threading, 'get_native_id'):
+                os.setpriority(os.PRIO_PROCESS, threading.get_native_id(), 19)
+        except Exception as e:
+            self.logger.debug(f"降低目标索引线程优先级失败: {e}")
+
+    def _start_observer(self):
+        if Observer is None:
+            self.logger.info("未安装 watchdog，目标索引按修改时间定期核对")
+            return
+        try:
+            observer = Observer()
+            handler = _ChangeHandler(self)
+            for root in self.roots:
+                if os.path.isdir(root):
+                    observer.schedule(handler, root, recursive=True)
+            observer.daemon = True
+            observer.start()
+            self._observer = observer
+        except Exception as e:
+            self.logger.warning(f"启动文件系统监视失败，改为定期核对: {e}")
+            self._observer = None
+
+    def _stop_observer(self):
+        observer, self._observer = self._observer, None
+        if observer is not None:
+            try:
+                observer.stop()
+                observer.join(timeout=2)
+            except Exception:
+                pass
+
+    def refresh(self, conn: sqlite3.Connection) -> int:
+        """
+        核对全部已索引的目录：修改时间变化的重新扫描，消失的删除，
+        新增的扫描目录递归加入。返回本轮扫描（列出内容）的目录数
+        """
+        started = time.perf_counter()
+        roots = set(self.roots)
+        # 已从配置中移除的根目录
+        stale_roots = [row[0] for row in conn.execute("SELECT DISTINCT root FROM dirs")
+                       if row[0] not in roots]
+        for root in stale_roots:
+            self._delete_tree(conn, root)
+        conn.commit()
+
+        known: Dict[str, tuple] = {
+            path: (mtime, depth, root)
+            for path, mtime, depth, root in conn.execute("SELECT path, mtime, depth, root FROM dirs")
+        }
+        pending = [(root, 0, root) for root in self.roots if root not in known]
+        pending.extend((path, depth, root) for path, (_, depth, root) in known.items())
+        checked = scanned = 0
+        while pending and not self._stop_event.is_set():
+            path, depth, root = pending.pop()
+            checked += 1
+            previous = known.get(path)
+            try:
+                mtime = os.stat(path).st_mtime
+            except OSError:
+                if previous is not None:
+                    self._delete_tree(conn, path)
+                continue
+            if previous is not None and previous[0] == mtime:
+                self._throttle(self.CHECK_COST)
+                continue
+            # 新出现的子目录在本轮中继续扫描
+            for subdir in self._scan_dir(conn, path, depth, root, mtime):
+                if subdir not in known:
+                    pending.append((subdir, depth + 1, root))
+            scanned += 1
+            if scanned % self.COMMIT_EVERY_DIRS == 0:
+                conn.commit()
+            self._throttle()
+        conn.commit()
+        if scanned:
+            self.logger.info(f"目标索引已刷新: 核对 {checked} 个目录，重新扫描 {scanned} 个，"
+                             f"用时 {time.perf_counter() - started:.1f} 秒")
+        return scanned
+
+    def _scan_dirty(self, conn: sqlite3.Connection):
+        """重新扫描文件系统通知标记的目录（只处理已索引的目录）"""
+        with self._dirty_lock:
+            dirty, self._dirty = self._dirty, set()
+        for path in dirty:
+            if self._stop_event.is_set():
+                break
+            row = conn.execute("SELECT depth, root FROM dirs WHERE path = ?", (path,)).fetchone()
+            if row is None:
+                continue
+            depth, root = row
+            try:
+                mtime = os.stat(path).st_mtime
+            except OSError:
+                self._delete_tree(conn, path)
+                continue
+            pending = [(path, depth, mtime)]
+            while pending:
+                current, current_depth, current_mtime = pending.pop()
+                for subdir in self._scan_dir(conn, current, current_depth, root, current_mtime):
+                    known = conn.execute("SELECT 1 FROM dirs WHERE path = ?", (subdir,)).fetchone()
+                    if known is None:
+                        try:
+                            pending.append((subdir, current_depth + 1, os.stat(subdir).st_mtime))
+                        except OSError:
+                            continue
+                self._throttle()
+        conn.commit()
+
+    def _scan_dir(self, conn: sqlite3.Connection, path: str, depth: int, root: str, mtime: float) -> List[str]:
+        """
+        列出目录内容并与索引中的记录比较，只增删有变化的条目
+        返回需要继续扫描的子目录
+        """
+        found: Dict[str, tuple] = {}
+        subdirs = []
+        parent = os.path.basename(path)
+        try:
+            with os.scandir(path) as entries:
+                for entry in entries:
+                    name = entry.name
+                    if name.startswith('.') or name.startswith('$'):
+                        continue
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            if name.lower() in SKIP_DIR_NAMES:
+                                continue
+                            if depth < self.max_depth:
+                                subdirs.append(entry.path)
+                            if depth < self.folder_depth:
+                                found[entry.path] = (name, KIND_FOLDER)
+                        elif entry.is_file():
+                            kind = classify(entry)
+                            if kind is not None:
+                                found[entry.path] = (os.path.splitext(name)[0], kind)
+                    except OSError:
+                        continue
+        except OSError as e:
+            self.logger.debug(f"扫描目录失败 {path}: {e}")
+
+        existing = {row[0] for row in conn.execute("SELECT path FROM targets WHERE dir = ?", (path,))}
+        removed = existing - found.keys()
+        if removed:
+            conn.executemany("DELETE FROM targets WHERE path = ?", [(p,) for p in removed])
+        added = [(p, path, name, parent, kind) for p, (name, kind) in found.items() if p not in existing]
+        if added:
+            conn.executemany("INSERT INTO targets (path, dir, name, parent, kind) VALUES (?, ?, ?, ?, ?)", added)
+
+        # 已不存在（或不再扫描）的子目录连同其下的记录一起删除
+        subdir_set = set(subdirs)
+        stale = [row[0] for row in conn.execute("SELECT path FROM dirs WHERE parent = ?", (path,))
+                 if row[0] not in subdir_set]
+        for subdir in stale:
+            self._delete_tree(conn, subdir)
+
+        conn.execute("INSERT OR REPLACE INTO dirs (path, parent, mtime, depth, root) VALUES (?, ?, ?, ?, ?)",
+                     (path, os.path.dirname(path), mtime, depth, root))
+        return subdirs
+
+    def _delete_tree(self, conn: sqlite3.Connection, path: str):
+        """删除目录及其下所有目录和目标的记录（按路径前缀做范围查询，走索引）"""
+        prefix = path.rstrip('\\/') + os.sep
+        upper = prefix[:-1] + chr(ord(os.sep) + 1)
+        conn.execute("DELETE FROM dirs WHERE path = ? OR (path >= ? AND path < ?)", (path, prefix, upper))
+        conn.execute("DELETE FROM targets WHERE dir = ? OR (dir >= ? AND dir < ?)", (path, prefix, upper))
+
+    def _throttle(self, cost: float = 1.0):
+        """按 dirs_per_second 限制扫描速度（只核对修改时间的目录按 cost 折算）"""
+        now = time.monotonic()
+        self._next_scan_at = max(self._next_scan_at, now) + cost / self.dirs_per_second
+        delay = self._next_scan_at - now
+        if delay > 0:
+            self._stop_event.wait(delay)
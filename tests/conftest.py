@@ -0,0 +1,15 @@
+"""
+测试公共配置：把项目根目录加入导入路径（模块都在根目录下），每个测试在临时目录中运行
+"""
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@pytest.fixture(autouse=True)
+def _isolated_cwd(tmp_path, monkeypatch):
+    """日志、缓存和数据库都写在当前目录，测试在临时目录中运行，不污染工作区"""
+    monkeypatch.chdir(tmp_path)
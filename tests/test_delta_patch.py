@@ -0,0 +1,100 @@
+"""
+增量补丁测试：生成补丁后分块流式应用，结果与新文件一致；损坏的补丁报 PatchError
+"""
+import io
+import os
+import random
+import zlib
+
+import pytest
+
+from delta_patch import MAGIC, OP_END, DeltaPatcher, PatchError, create_patch
+
+
+def _make_files(tmp_path, old: bytes, new: bytes):
+    old_path, new_path, patch_path = tmp_path / "old.bin", tmp_path / "new.bin", tmp_path / "out.patch"
+    old_path.write_bytes(old)
+    new_path.write_bytes(new)
+    return str(old_path), str(new_path), str(patch_path)
+
+
+def _apply(old_path: str, patch: bytes, chunk_size: int, info: dict) -> bytes:
+    out = io.BytesIO()
+    with open(old_path, "rb") as old_file:
+        patcher = DeltaPatcher(old_file, out)
+        for start in range(0, len(patch), chunk_size):
+            patcher.feed(patch[start:start + chunk_size])
+        patcher.finish(info["sha256"], info["target_sha256"], info["target_size"])
+    return out.getvalue()
+
+
+def _shifted_copy(old: bytes, rng: random.Random) -> bytes:
+    """插入、删除、替换若干片段，使大部分内容相对旧文件错位"""
+    return (old[:1000] + b"inserted" * 13 + old[1000:40000] + rng.randbytes(3000)
+            + old[45000:90000] + old[100000:])
+
+
+@pytest.mark.parametrize("chunk_size", [1, 777, 64 * 1024])
+def test_round_trip_with_chunked_feed(tmp_path, chunk_size):
+    rng = random.Random(chunk_size)
+    old = rng.randbytes(200 * 1024)
+    new = _shifted_copy(old, rng)
+    old_path, new_path, patch_path = _make_files(tmp_path, old, new)
+
+    info = create_patch(old_path, new_path, patch_path)
+    with open(patch_path, "rb") as f:
+        patch = f.read()
+
+    assert info["size"] == len(patch)
+    # 错位的内容应以复制操作表示，补丁远小于新文件
+    assert len(patch) < len(new) // 10
+    assert _apply(old_path, patch, chunk_size, info) == new
+
+
+@pytest.mark.parametrize("old, new", [
+    (b"", b""),
+    (b"", b"only new data"),
+    (b"old data" * 1000, b""),
+    (os.urandom(10000), os.urandom(10000)),
+])
+def test_round_trip_edge_cases(tmp_path, old, new):
+    old_path, new_path, patch_path = _make_files(tmp_path, old, new)
+    info = create_patch(old_path, new_path, patch_path, block_size=64)
+    with open(patch_path, "rb") as f:
+        assert _apply(old_path, f.read(), 100, info) == new
+
+
+def test_corrupted_patch_raises(tmp_path):
+    rng = random.Random(1)
+    old = rng.randbytes(64 * 1024)
+    new = _shifted_copy(old, rng)
+    old_path, new_path, patch_path = _make_files(tmp_path, old, new)
+    info = create_patch(old_path, new_path, patch_path)
+    with open(patch_path, "rb") as f:
+        patch = bytearray(f.read())
+
+    # 翻转中间的一个字节
+    patch[len(patch) // 2] ^= 0xFF
+    with pytest.raises(PatchError):
+        _apply(old_path, bytes(patch), 512, info)
+    # 不校验哈希时，损坏的压缩流同样报 PatchError 而不是 zlib.error
+    with pytest.raises(PatchError):
+        _apply(old_path, bytes(patch), 512, dict(info, sha256=None, target_sha256=None))
+
+    # 截断：缺少结束标记
+    with pytest.raises(PatchError):
+        _apply(old_path, bytes(patch[:len(patch) // 2]), 512, dict(info, sha256=None))
+
+
+def test_invalid_patch_contents_raise(tmp_path):
+    old_path, _, _ = _make_files(tmp_path, b"x" * 100, b"")
+    no_checks = {"sha256": None, "target_sha256": None, "target_size": None}
+
+    with pytest.raises(PatchError):
+        _apply(old_path, zlib.compress(b"NOTAPTCH" + OP_END), 4, no_checks)
+    with pytest.raises(PatchError):
+        _apply(old_path, zlib.compress(MAGIC + b"X"), 4, no_checks)
+    # 复制超出旧文件长度
+    copy_past_end = MAGIC + b"C" + (50).to_bytes(8, "little") + (100).to_bytes(4, "little") + OP_END
+    with pytest.raises(PatchError):
+        _apply(old_path, zlib.compress(copy_past_end), 4, no_checks)
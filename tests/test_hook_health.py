@@ -0,0 +1,141 @@
+"""
+键盘钩子监视测试：模拟系统移除钩子，确认重新安装的是系统钩子（新的监听线程），
+计时包装作用在钩子过程中的 direct_callback 上，并由探测按键确认恢复
+"""
+import threading
+import time
+import types
+
+import pytest
+
+import hook_health
+from hook_health import HOOK_LOST, HOOK_PROBING, HOOK_RECOVERED, HookHealthMonitor, restart_os_hook
+
+
+class _FakeSystem:
+    """模拟系统键盘钩子：listen() 安装钩子后阻塞到线程被要求退出，remove_hook() 模拟系统静默移除"""
+
+    def __init__(self):
+        self.hook = None
+        self.installs = 0
+        self.stops = {}
+
+    def listen(self, callback):
+        stop = self.stops.setdefault(threading.get_ident(), threading.Event())
+        self.hook = callback
+        self.installs += 1
+        stop.wait()
+
+    def remove_hook(self):
+        self.hook = None
+
+    def press(self, name):
+        if self.hook is not None:
+            self.hook(name)
+
+
+class _FakeListener:
+    lock = threading.Lock()
+
+    def __init__(self, system):
+        self.system = system
+        self.listening = False
+        self.active_modifiers = set()
+        self.modifier_states = {}
+        self.handlers = []
+
+    def direct_callback(self, event):
+        for handler in list(self.handlers):
+            handler(event)
+        return True
+
+    def listen(self):
+        self.system.listen(self.direct_callback)
+
+    def start(self):
+        self.listening = True
+        self.listening_thread = threading.Thread(target=self.listen, daemon=True)
+        self.listening_thread.start()
+
+
+def _fake_backend(system):
+    listener = _FakeListener(system)
+    backend = types.SimpleNamespace(_listener=listener, _pressed_events_lock=threading.Lock(),
+                                    _pressed_events={}, _logically_pressed_keys={})
+
+    def hook(callback):
+        listener.handlers.append(callback)
+        return callback
+
+    backend.hook = hook
+    backend.unhook = listener.handlers.remove
+    backend.send = system.press
+    return backend
+
+
+@pytest.fixture
+def system(monkeypatch):
+    system = _FakeSystem()
+    monkeypatch.setattr(hook_health.sys, "platform", "win32")
+
+    def stop_thread(thread, timeout):
+        system.stops[thread.ident].set()
+        thread.join(timeout)
+        return not thread.is_alive()
+
+    monkeypatch.setattr(hook_health, "_stop_listening_thread", stop_thread)
+    yield system
+    for stop in system.stops.values():
+        stop.set()
+
+
+def _wait_for(predicate, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+
+
+def test_lost_hook_is_reinstalled_and_confirmed_by_probe(system):
+    backend = _fake_backend(system)
+    monitor = HookHealthMonitor(backend, on_lost=lambda: restart_os_hook(backend))
+    backend._listener.start()
+    _wait_for(lambda: system.installs == 1)
+    monitor.hook()
+
+    system.press("a")
+    assert monitor.histogram.total == 1
+
+    old_thread = backend._listener.listening_thread
+    system.remove_hook()
+    backend._pressed_events[29] = "ctrl down"
+
+    monitor.PROBE_TIMEOUT_SECONDS = 0.0
+    monitor._send_probe("测试")
+    monitor.check_once()
+
+    # 旧线程已结束，新线程重新安装了钩子；漏掉的按键状态被清除
+    assert not old_thread.is_alive()
+    _wait_for(lambda: system.installs == 2)
+    assert backend._pressed_events == {}
+    assert monitor.recoveries == 1
+    assert monitor.status == HOOK_PROBING
+
+    # 下一次检查发送探测按键，经过新钩子（仍然计时），再下一次检查确认恢复
+    monitor.check_once()
+    assert monitor.histogram.total == 2
+    monitor.check_once()
+    assert monitor.status == HOOK_RECOVERED
+
+
+def test_restart_failure_marks_hook_lost(system, monkeypatch):
+    backend = _fake_backend(system)
+    monitor = HookHealthMonitor(backend, on_lost=lambda: restart_os_hook(backend))
+    monitor.hook()
+    # 监听线程没有启动时无法重新安装
+    monitor._hook_lost()
+    assert monitor.status == HOOK_LOST
+    assert monitor.recoveries == 0
+
+    monkeypatch.setattr(hook_health.sys, "platform", "linux")
+    assert restart_os_hook(backend)[0] is False
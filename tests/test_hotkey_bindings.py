@@ -0,0 +1,99 @@
+"""
+绑定类型测试：hotkeys 只保存目标路径，工作区、方案切换和快速启动面板按 kind 区分；
+切换窗口模式在没有可激活的窗口时照常启动
+"""
+import types
+
+import pytest
+
+from hotkey import Hotkey
+from hotkey_manager import (BINDING_PALETTE, BINDING_PROFILE, BINDING_TARGET, BINDING_WORKSPACE,
+                            HotkeyManager)
+from launch_history import OUTCOME_FOCUSED, OUTCOME_OK
+from workspace import Workspace, WorkspaceTarget
+
+
+class _NullKeyboard:
+    def add_hotkey(self, text, callback):
+        pass
+
+    def remove_hotkey(self, text):
+        pass
+
+
+@pytest.fixture
+def manager():
+    manager = HotkeyManager(keyboard_backend=_NullKeyboard())
+    yield manager
+    manager.shutdown()
+
+
+def test_only_target_bindings_are_stored_as_paths(manager, tmp_path):
+    app = tmp_path / "app.exe"
+    app.write_bytes(b"")
+    other = tmp_path / "other.exe"
+    other.write_bytes(b"")
+
+    assert manager.add_hotkey("ctrl+alt+1", str(app))[0]
+    assert manager.add_workspace("ctrl+alt+2", Workspace("开发", [WorkspaceTarget("a", str(other))]))[0]
+    assert manager.add_profile_switch("ctrl+alt+3", "工作")[0]
+    assert manager.add_palette_hotkey("ctrl+alt+space")[0]
+
+    assert manager.hotkeys == {Hotkey.parse("ctrl+alt+1"): str(app)}
+    kinds = {str(hotkey): options['kind'] for hotkey, options in manager.binding_options.items()}
+    assert kinds == {"ctrl+alt+1": BINDING_TARGET, "ctrl+alt+2": BINDING_WORKSPACE,
+                     "ctrl+alt+3": BINDING_PROFILE, "ctrl+alt+space": BINDING_PALETTE}
+    assert manager._bound_target_paths() == {str(app), str(other)}
+
+    conflict, msg = manager.check_system_conflict("ctrl+alt+3")
+    assert conflict and "切换到方案: 工作" in msg
+    assert manager.describe_binding("ctrl+alt+space") == "打开快速启动面板"
+
+
+def test_rebinding_workspace_as_target_and_removing(manager, tmp_path):
+    app = tmp_path / "app.exe"
+    app.write_bytes(b"")
+
+    assert manager.add_workspace("ctrl+alt+2", Workspace("开发", [WorkspaceTarget("a", str(app))]))[0]
+    assert manager.add_hotkey("ctrl+alt+2", str(app))[0]
+    assert Hotkey.parse("ctrl+alt+2") not in manager.workspaces
+    assert manager.binding_options[Hotkey.parse("ctrl+alt+2")]['kind'] == BINDING_TARGET
+
+    assert manager.add_workspace("ctrl+alt+2", Workspace("开发", [WorkspaceTarget("a", str(app))]))[0]
+    assert manager.hotkeys == {}
+
+    assert manager.remove_hotkey("ctrl+alt+2")
+    assert manager.binding_options == {} and manager.workspaces == {}
+
+
+def test_trigger_after_remove_or_shutdown_is_ignored(manager, tmp_path):
+    app = tmp_path / "app.exe"
+    app.write_bytes(b"")
+    assert manager.add_hotkey("ctrl+alt+1", str(app))[0]
+    hotkey = Hotkey.parse("ctrl+alt+1")
+
+    # 回调线程查到选项之后绑定才被移除：不应抛出 KeyError
+    manager.trigger_stats.pop(hotkey)
+    manager._on_hotkey(hotkey)
+
+    manager.trigger_stats[hotkey] = {'accepted': 0, 'coalesced': 0, 'cooldown': 0}
+    manager.shutdown()
+    manager._on_hotkey(hotkey)
+    assert manager.trigger_stats[hotkey]['accepted'] == 1
+    assert manager._in_flight == {}
+
+
+def test_focus_existing_launches_when_no_window_can_be_activated(manager, tmp_path, monkeypatch):
+    app = tmp_path / "app.exe"
+    app.write_bytes(b"")
+    launched = []
+    running = types.SimpleNamespace(name="app.exe", root_pid=1, focus_window=lambda: False)
+    monkeypatch.setattr(manager, "find_running", lambda exe_key: running)
+    monkeypatch.setattr(manager, "launch_program", lambda path, hotkey="": launched.append(path) or OUTCOME_OK)
+
+    assert manager._activate_target(str(app), "ctrl+alt+1", focus_existing=True) == OUTCOME_OK
+    assert launched == [str(app)]
+
+    running.focus_window = lambda: True
+    assert manager._activate_target(str(app), "ctrl+alt+1", focus_existing=True) == OUTCOME_FOCUSED
+    assert launched == [str(app)]
@@ -0,0 +1,19 @@
+"""
+延迟测试脚本测试：main() 在临时目录中运行，结束后回到调用方原来的工作目录
+"""
+import os
+import sys
+
+import pytest
+
+import latency_bench
+
+
+@pytest.mark.skipif(not sys.platform.startswith("linux"), reason="延迟测试仅在 Linux 上运行")
+def test_main_restores_working_directory(monkeypatch):
+    monkeypatch.setattr(latency_bench, "run_scenario",
+                        lambda *args, **kwargs: ({stage: [1.0] for stage in latency_bench.STAGES}, 0))
+    cwd = os.getcwd()
+
+    assert latency_bench.main(["--bindings", "1", "--processes", "0", "--rates", "1", "--presses", "1"]) == 0
+    assert os.getcwd() == cwd
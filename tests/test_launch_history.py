@@ -0,0 +1,54 @@
+"""
+启动历史测试：按是否已预读分组的耗时百分位，以及旧版本数据库的列迁移
+"""
+import sqlite3
+
+from launch_history import OUTCOME_ERROR, OUTCOME_OK, LaunchHistory
+
+
+def test_percentiles_grouped_by_prefetch_state():
+    history = LaunchHistory("history.db")
+    try:
+        for ms in (10, 20, 30):
+            history.record("ctrl+1", "/bin/app", "exe", ms, 0, OUTCOME_OK, prefetched=True)
+        for ms in (100, 200):
+            history.record("ctrl+1", "/bin/app", "exe", ms, 5, OUTCOME_OK, prefetched=False)
+        # 不适用（网页）和失败的启动不参与比较
+        history.record("ctrl+2", "https://example.com", "url", 1, 0, OUTCOME_OK)
+        history.record("ctrl+1", "/bin/app", "exe", 999, 0, OUTCOME_ERROR, prefetched=False)
+        history.flush()
+
+        stats = history.percentiles_by_prefetch()
+    finally:
+        history.close()
+
+    assert stats[True]['count'] == 3
+    assert stats[True][50] == 20
+    assert stats[False]['count'] == 2
+    assert stats[False][50] == 155
+
+
+def test_old_database_gains_prefetched_column():
+    conn = sqlite3.connect("old.db")
+    conn.execute(
+        "CREATE TABLE launches (id INTEGER PRIMARY KEY AUTOINCREMENT, ts REAL NOT NULL, hotkey TEXT NOT NULL, "
+        "target TEXT NOT NULL, target_type TEXT NOT NULL, spawn_ms REAL NOT NULL, "
+        "discovery_ms REAL NOT NULL, outcome TEXT NOT NULL)"
+    )
+    conn.execute("INSERT INTO launches (ts, hotkey, target, target_type, spawn_ms, discovery_ms, outcome) "
+                 "VALUES (strftime('%s', 'now'), '', '/bin/app', 'exe', 50, 0, 'ok')")
+    conn.commit()
+    conn.close()
+
+    history = LaunchHistory("old.db")
+    try:
+        history.record("ctrl+1", "/bin/app", "exe", 10, 0, OUTCOME_OK, prefetched=True)
+        history.flush()
+        stats = history.percentiles_by_prefetch()
+        assert history.percentiles("/bin/app")[50] == 30
+    finally:
+        history.close()
+
+    # 旧记录的预读状态未知，不参与分组
+    assert list(stats) == [True]
+    assert stats[True]['count'] == 1
@@ -0,0 +1,29 @@
+"""
+预读测试：按启动计划的文件签名判断目标是否已预读，不在按键路径上访问文件系统
+"""
+import os
+
+import prefetcher
+from launch_plan import file_signature
+from prefetcher import Prefetcher, UsageStats
+
+
+def test_is_warm_compares_plan_signature_without_stat(tmp_path, monkeypatch):
+    target = tmp_path / "app"
+    target.write_bytes(b"\0" * 4096)
+    warmer = Prefetcher(UsageStats(str(tmp_path / "usage.json")))
+    assert warmer._prefetch_file(str(target), 1 << 20) == 4096
+    signature = file_signature(str(target))
+
+    def no_stat(*args, **kwargs):
+        raise AssertionError("按键路径上调用了 os.stat")
+
+    monkeypatch.setattr(prefetcher.os, "stat", no_stat)
+    assert warmer.is_warm(str(target), signature)
+    # 目标被替换后签名变化，不再视为已预读
+    assert not warmer.is_warm(str(target), (False, signature[1] + 1, signature[2]))
+    monkeypatch.undo()
+
+    assert warmer.is_warm(str(target))
+    os.utime(target, ns=(0, 0))
+    assert not warmer.is_warm(str(target))
@@ -0,0 +1,57 @@
+"""
+进程登记表测试：按路径查找运行中的程序组只查索引，不探测成员进程；
+成员变化后 PID 索引同步更新
+"""
+import subprocess
+import sys
+
+from process_registry import ProcessRegistry
+from process_tracker import ProcessGroup
+
+
+def _spawn(args):
+    proc = subprocess.Popen(args, stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    return ProcessGroup(proc.pid, sys.executable, popen=proc), proc
+
+
+def test_find_running_does_not_probe_members(monkeypatch):
+    registry = ProcessRegistry()
+    group, proc = _spawn([sys.executable, "-c", "import time; time.sleep(30)"])
+    try:
+        registry.add(group)
+        monkeypatch.setattr(ProcessGroup, "_member_alive",
+                            lambda *args: (_ for _ in ()).throw(AssertionError("按键路径上探测了进程")))
+        assert registry.find_running(group.exe_key) is group
+    finally:
+        proc.kill()
+        proc.wait()
+
+
+def test_find_running_skips_group_whose_root_was_reaped():
+    registry = ProcessRegistry()
+    group, proc = _spawn([sys.executable, "-c", "pass"])
+    proc.wait()
+    registry.add(group)
+
+    assert registry.find_running(group.exe_key) is None
+
+
+def test_pid_index_follows_member_changes():
+    registry = ProcessRegistry()
+    group, proc = _spawn([sys.executable, "-c", "import time; time.sleep(30)"])
+    try:
+        registry.add(group)
+        assert registry.find_by_pid(proc.pid) is group
+        # 成员以紧凑数组保存，对外仍可按 pid -> create_time 读取
+        assert list(group.members) == [proc.pid] and group.contains(proc.pid)
+
+        proc.kill()
+        proc.wait()
+        registry.refresh()
+        assert len(registry) == 0
+        assert registry.find_by_pid(proc.pid) is None
+        assert registry._by_pid == {} and registry._by_exe == {}
+    finally:
+        if proc.poll() is None:
+            proc.kill()
+            proc.wait()
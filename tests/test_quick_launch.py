@@ -0,0 +1,57 @@
+"""
+快速启动索引测试：静态权重排名随增删和使用次数增量更新，与完全重排结果一致
+"""
+import math
+import random
+
+from quick_launch import QuickLaunchIndex
+
+
+def _full_rank(index: QuickLaunchIndex) -> list:
+    return sorted(index._static, key=lambda i: (-index._static[i], i))
+
+
+def test_record_use_moves_target_up_without_rebuild():
+    uses = {}
+    index = QuickLaunchIndex(lambda target: uses.get(target, 0))
+    for name in ("alpha", "beta", "gamma"):
+        uses[f"/opt/{name}/{name}"] = 1
+        index.add_target(f"/opt/{name}/{name}", from_history=True)
+    assert [e.title for e in index.search("")] == ["alpha", "beta", "gamma"]
+
+    uses["/opt/gamma/gamma"] = 20
+    index.record_use("/opt/gamma/gamma")
+    assert [e.title for e in index.search("")] == ["gamma", "alpha", "beta"]
+
+    # 未在索引中的目标由 record_use 加入
+    index.record_use("/opt/delta/delta")
+    assert "delta" in [e.title for e in index.search("delta")]
+
+
+def test_incremental_ranking_matches_full_rerank():
+    random.seed(7)
+    uses = {}
+    index = QuickLaunchIndex(lambda target: uses.get(target, 0))
+    paths = [f"/usr/bin/tool{i}" for i in range(300)]
+    for i, path in enumerate(paths):
+        uses[path] = random.randint(0, 30)
+        index.add_target(path, hotkey=f"ctrl+alt+{i}" if i % 7 == 0 else None, from_history=i % 2 == 0)
+    for _ in range(500):
+        path = random.choice(paths)
+        action = random.random()
+        if action < 0.5:
+            uses[path] += 1
+            index.record_use(path)
+        elif action < 0.75:
+            index.remove_target_hotkey(path, f"ctrl+alt+{paths.index(path)}")
+        else:
+            index.add_target(path, hotkey="ctrl+shift+x")
+        index.add_workspace("ctrl+alt+w", "工作区")
+        if action < 0.1:
+            index.remove_workspace("ctrl+alt+w")
+
+    for entry_id, entry in index._by_id.items():
+        expected = 10 * math.log1p(uses.get(entry.target, 0)) + (5 if entry.hotkeys else 0)
+        assert index._static[entry_id] == expected
+    assert [i for _, i in index._ranked] == _full_rank(index)
+    assert len(index._ranked) == len(index)
@@ -0,0 +1,49 @@
+"""
+资源采样测试：窗口隐藏导致的暂停在停止、重新启动监听后仍然保持
+"""
+import time
+
+from resource_monitor import ResourceMonitor
+
+
+def _monitor(calls: list) -> ResourceMonitor:
+    monitor = ResourceMonitor(lambda: calls.append(time.monotonic()) or [])
+    monitor.MIN_INTERVAL_SECONDS = 0.02
+    monitor.interval = 0.02
+    return monitor
+
+
+def test_restart_while_hidden_stays_paused():
+    calls = []
+    monitor = _monitor(calls)
+    monitor.start()
+    time.sleep(0.1)
+    monitor.set_paused(True)
+    time.sleep(0.05)
+
+    monitor.stop()
+    monitor.start()
+    sampled_before = len(calls)
+    time.sleep(0.15)
+    try:
+        assert monitor.paused
+        assert len(calls) == sampled_before
+
+        monitor.set_paused(False)
+        time.sleep(0.15)
+        assert not monitor.paused
+        assert len(calls) > sampled_before
+    finally:
+        monitor.stop()
+
+
+def test_start_while_hidden_does_not_sample():
+    calls = []
+    monitor = _monitor(calls)
+    monitor.set_paused(True)
+    monitor.start()
+    time.sleep(0.1)
+    try:
+        assert calls == []
+    finally:
+        monitor.stop()
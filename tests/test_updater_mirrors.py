@@ -0,0 +1,250 @@
+"""
+更新镜像测速与下载切换测试
+
+在本机启动多个 HTTP 服务器模拟镜像：各自注入不同的响应延迟，其中一个在
+传输中途断开连接。验证测速选出最快的镜像，下载中断后切换到下一个镜像时
+用 Range 从断点继续，而不是从第 0 字节重新下载。
+"""
+import hashlib
+import os
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+
+from updater import MirrorSelector, Updater
+
+PAYLOAD = os.urandom(3 * 1024 * 1024)
+VERSION_BODY = b'{"version": "9.9.9"}'
+
+
+class MirrorServer:
+    """
+    本机镜像服务器
+
+    /version.json 返回版本信息，/pyQuickStart.exe 返回 PAYLOAD（支持 Range）。
+    delay 为每个响应头之前的延迟（秒）；drop_after 不为 None 时每个下载响应
+    只发送该字节数就断开连接；ignore_range 为 True 时忽略 Range 总是返回完整文件。
+    requests 记录收到的下载请求的 Range 起点。
+    """
+
+    def __init__(self, delay: float = 0.0, drop_after=None, ignore_range: bool = False):
+        self.delay = delay
+        self.drop_after = drop_after
+        self.ignore_range = ignore_range
+        self.requests = []
+        self.bytes_sent = 0
+        self._lock = threading.Lock()
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):
+                pass
+
+            def do_HEAD(self):
+                server.handle(self, head=True)
+
+            def do_GET(self):
+                server.handle(self, head=False)
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.httpd.daemon_threads = True
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self.httpd.server_address[1]}"
+
+    def mirror(self, name: str) -> dict:
+        return {'name': name, 'version_url': f"{self.base_url}/version.json",
+                'download_url': f"{self.base_url}/pyQuickStart.exe"}
+
+    def close(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def handle(self, request: BaseHTTPRequestHandler, head: bool):
+        time.sleep(self.delay)
+        if request.path == "/version.json":
+            body = VERSION_BODY
+            request.send_response(200)
+            request.send_header("Content-Length", str(len(body)))
+            request.end_headers()
+            if not head:
+                request.wfile.write(body)
+            return
+        if request.path != "/pyQuickStart.exe":
+            request.send_error(404)
+            return
+
+        start, end = 0, len(PAYLOAD) - 1
+        range_header = request.headers.get("Range")
+        match = re.fullmatch(r"bytes=(\d+)-(\d*)", range_header or "")
+        if match and not self.ignore_range:
+            start = int(match.group(1))
+            if match.group(2):
+                end = min(end, int(match.group(2)))
+            request.send_response(206)
+            request.send_header("Content-Range", f"bytes {start}-{end}/{len(PAYLOAD)}")
+        else:
+            request.send_response(200)
+        request.send_header("Accept-Ranges", "bytes")
+        request.send_header("Content-Length", str(end - start + 1))
+        request.end_headers()
+        if head:
+            return
+        with self._lock:
+            self.requests.append(start)
+
+        body = PAYLOAD[start:end + 1]
+        if self.drop_after is not None:
+            body = body[:self.drop_after]
+        request.wfile.write(body)
+        request.wfile.flush()
+        with self._lock:
+            self.bytes_sent += len(body)
+        if self.drop_after is not None:
+            # 声明的长度没有发完就断开
+            request.close_connection = True
+            request.connection.shutdown(2)
+
+
+@pytest.fixture
+def servers():
+    started = []
+
+    def start(**kwargs) -> MirrorServer:
+        server = MirrorServer(**kwargs)
+        started.append(server)
+        return server
+
+    yield start
+    for server in started:
+        server.close()
+
+
+@pytest.fixture
+def updater():
+    instance = Updater()
+    # 不经过环境变量中的代理访问本机服务器
+    instance.session.trust_env = False
+    yield instance
+    instance.session.close()
+
+
+def test_probe_picks_fastest_mirror(servers):
+    slow = servers(delay=0.4)
+    fast = servers(delay=0.02)
+    medium = servers(delay=0.2)
+    selector = MirrorSelector([slow.mirror("slow"), fast.mirror("fast"), medium.mirror("medium")])
+    session = requests.Session()
+    session.trust_env = False
+
+    fastest = selector.probe(session)
+
+    assert fastest['name'] == "fast"
+    assert [mirror['name'] for mirror in selector.ranked()] == ["fast", "medium", "slow"]
+    session.close()
+
+
+def test_failed_mirror_is_ranked_last(servers):
+    fast = servers(delay=0.0)
+    other = servers(delay=0.1)
+    selector = MirrorSelector([fast.mirror("fast"), other.mirror("other"),
+                               {'name': "dead", 'version_url': "http://127.0.0.1:9/version.json"}])
+    session = requests.Session()
+    session.trust_env = False
+
+    assert selector.probe(session)['name'] == "fast"
+    assert selector.ranked()[-1]['name'] == "dead"
+    session.close()
+
+
+def test_stream_download_resumes_on_next_mirror(servers, updater, tmp_path):
+    dropped_at = 1024 * 1024
+    broken = servers(drop_after=dropped_at)
+    healthy = servers(delay=0.05)
+    sources = [{'name': "broken", 'url': broken.mirror("broken")['download_url']},
+               {'name': "healthy", 'url': healthy.mirror("healthy")['download_url']}]
+    temp_file = str(tmp_path / "download.exe")
+
+    updater._download_stream(sources, temp_file)
+
+    with open(temp_file, "rb") as f:
+        assert f.read() == PAYLOAD
+    assert broken.requests == [0]
+    # 第二个镜像从断点继续，只传输剩余部分
+    assert healthy.requests == [dropped_at]
+    assert healthy.bytes_sent == len(PAYLOAD) - dropped_at
+    assert updater.mirror_selector.stats["broken"]["penalty"] > 0
+
+
+def test_segmented_download_resumes_each_segment_on_next_mirror(servers, updater, tmp_path):
+    dropped_after = 256 * 1024
+    broken = servers(drop_after=dropped_after)
+    healthy = servers()
+    sources = [{'name': "broken", 'url': broken.mirror("broken")['download_url']},
+               {'name': "healthy", 'url': healthy.mirror("healthy")['download_url']}]
+    temp_file = str(tmp_path / "download.exe")
+    version_info = {'sha256': hashlib.sha256(PAYLOAD).hexdigest()}
+
+    success, result = updater._download_full(sources, version_info, temp_file)
+
+    assert success, result
+    with open(temp_file, "rb") as f:
+        assert f.read() == PAYLOAD
+    stats = updater.last_download_stats
+    assert stats['segmented']
+    segment_starts = [segment['start'] for segment in stats['segments']]
+    # 每个分段先从中断的镜像开始，再在下一个镜像上从该分段的断点继续
+    assert sorted(broken.requests) == segment_starts
+    assert sorted(healthy.requests) == [start + dropped_after for start in segment_starts]
+    assert healthy.bytes_sent == len(PAYLOAD) - dropped_after * len(segment_starts)
+    for segment in stats['segments']:
+        assert segment['sources'] == ["broken", "healthy"]
+
+
+def test_manifest_request_does_not_hold_cache_lock(servers, updater):
+    slow = servers(delay=0.5)
+    updater.mirror_selector = MirrorSelector([slow.mirror("slow")])
+    updater._cache = {'manifest': {'version': "1.0.0"}, 'fetched_at': time.time()}
+
+    background = threading.Thread(target=updater._fetch_manifest, kwargs={'force': True})
+    background.start()
+    time.sleep(0.1)
+    # 后台检查正在等待镜像响应时，读取缓存不需要等它
+    started = time.perf_counter()
+    assert updater._fetch_manifest()['version'] == "1.0.0"
+    assert time.perf_counter() - started < 0.2
+    background.join()
+    assert updater._fetch_manifest()['version'] == "9.9.9"
+
+
+def test_download_responses_are_closed(servers, updater, tmp_path):
+    broken = servers(drop_after=256 * 1024)
+    no_range = servers(ignore_range=True)
+    healthy = servers()
+    sources = [{'name': "broken", 'url': broken.mirror("broken")['download_url']},
+               {'name': "no_range", 'url': no_range.mirror("no_range")['download_url']},
+               {'name': "healthy", 'url': healthy.mirror("healthy")['download_url']}]
+    responses = []
+    session_get = updater.session.get
+
+    def tracked_get(*args, **kwargs):
+        response = session_get(*args, **kwargs)
+        responses.append(response)
+        return response
+
+    updater.session.get = tracked_get
+    updater._download_segmented(sources, len(PAYLOAD), str(tmp_path / "segmented.exe"))
+    updater._download_stream(sources, str(tmp_path / "stream.exe"))
+
+    # 中断、返回非 206 和完成的连接都已关闭
+    assert responses
+    assert all(response.raw.closed for response in responses)
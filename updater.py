@@ -5,13 +5,157 @@
 import os
 import sys
 import json
+import time
+import random
+import threading
 import requests
 import tempfile
 import shutil
 import subprocess
+from concurrent.futures import ThreadPoolExecutor, as_completed, wait, FIRST_EXCEPTION
 from pathlib import Path
-from typing import Tuple, Optional
+from typing import Callable, List, Tuple, Optional
+from requests.adapters import HTTPAdapter
 from logger import Logger
+from delta_patch import DeltaPatcher, PatchError, file_sha256
+
+
+class MirrorSelector:
+    """
+    更新镜像选择器
+
+    每个镜像格式: {"name": ..., "version_url": ..., "download_url": "...{tag}..."}
+    对各镜像的响应延迟做指数滑动平均，失败时加罚分，罚分随时间衰减，
+    排序时取有效延迟最低的健康镜像。
+    """
+
+    EWMA_ALPHA = 0.3
+    FAILURE_PENALTY_SECONDS = 5.0
+    PENALTY_HALF_LIFE_SECONDS = 1800
+    PROBE_INTERVAL_SECONDS = 1800
+    PROBE_TIMEOUT_SECONDS = 5
+
+    def __init__(self, mirrors: List[dict], stats: Optional[dict] = None):
+        self._lock = threading.Lock()
+        self.mirrors: List[dict] = []
+        self.stats: dict = dict(stats) if isinstance(stats, dict) else {}
+        self.merge(mirrors)
+
+    def merge(self, mirrors) -> int:
+        """合并镜像列表（按名称去重），返回新增数量"""
+        added = 0
+        if not isinstance(mirrors, list):
+            return added
+        with self._lock:
+            known = {mirror['name'] for mirror in self.mirrors}
+            for mirror in mirrors:
+                if not isinstance(mirror, dict) or not mirror.get('version_url'):
+                    continue
+                name = mirror.get('name') or mirror['version_url']
+                if name in known:
+                    continue
+                self.mirrors.append({
+                    'name': name,
+                    'version_url': mirror['version_url'],
+                    'download_url': mirror.get('download_url', ''),
+                })
+                known.add(name)
+                added += 1
+        return added
+
+    def record_success(self, name: str, latency: float):
+        """记录一次成功请求的延迟（秒）"""
+        with self._lock:
+            stat = self.stats.setdefault(name, {})
+            previous = stat.get('latency')
+            if previous is None:
+                stat['latency'] = latency
+            else:
+                stat['latency'] = self.EWMA_ALPHA * latency + (1 - self.EWMA_ALPHA) * previous
+            stat['measured_at'] = time.time()
+
+    def record_failure(self, name: str):
+        """记录一次失败，罚分累加"""
+        with self._lock:
+            stat = self.stats.setdefault(name, {})
+            stat['penalty'] = self._decayed_penalty(stat, time.time()) + self.FAILURE_PENALTY_SECONDS
+            stat['failed_at'] = time.time()
+            stat['measured_at'] = time.time()
+
+    def _decayed_penalty(self, stat: dict, now: float) -> float:
+        penalty = stat.get('penalty', 0.0)
+        if not penalty:
+            return 0.0
+        age = now - stat.get('failed_at', now)
+        return penalty * 0.5 ** (age / self.PENALTY_HALF_LIFE_SECONDS)
+
+    def score(self, name: str, now: Optional[float] = None) -> float:
+        """有效延迟（秒），越小越好；未测速的镜像按探测超时计"""
+        now = time.time() if now is None else now
+        stat = self.stats.get(name, {})
+        latency = stat.get('latency', self.PROBE_TIMEOUT_SECONDS)
+        return latency + self._decayed_penalty(stat, now)
+
+    def ranked(self) -> List[dict]:
+        """按有效延迟排序的镜像列表"""
+        now = time.time()
+        with self._lock:
+            mirrors = list(self.mirrors)
+        return sorted(mirrors, key=lambda mirror: self.score(mirror['name'], now))
+
+    def needs_probe(self) -> bool:
+        """是否有镜像的测速结果已过期"""
+        now = time.time()
+        with self._lock:
+            if len(self.mirrors) < 2:
+                return False
+            return any(now - self.stats.get(mirror['name'], {}).get('measured_at', 0) > self.PROBE_INTERVAL_SECONDS
+                       for mirror in self.mirrors)
+
+    def probe(self, session: requests.Session, logger: Logger = None) -> Optional[dict]:
+        """
+        并发测速所有镜像，返回最快的健康镜像
+
+        以获取 version_url 响应头的时间作为延迟样本，不读取响应体。
+        """
+        mirrors = self.ranked()
+        if not mirrors:
+            return None
+
+        def _probe(mirror: dict) -> float:
+            started = time.perf_counter()
+            response = session.get(mirror['version_url'], stream=True, timeout=self.PROBE_TIMEOUT_SECONDS)
+            try:
+                response.raise_for_status()
+            finally:
+                response.close()
+            return time.perf_counter() - started
+
+        fastest = None
+        with ThreadPoolExecutor(max_workers=len(mirrors), thread_name_prefix="MirrorProbe") as executor:
+            futures = {executor.submit(_probe, mirror): mirror for mirror in mirrors}
+            for future in as_completed(futures):
+                mirror = futures[future]
+                try:
+                    latency = future.result()
+                    self.record_success(mirror['name'], latency)
+                    if fastest is None:
+                        fastest = mirror
+                    if logger:
+                        logger.debug(f"镜像测速: {mirror['name']} {latency * 1000:.0f} ms")
+                except Exception as e:
+                    self.record_failure(mirror['name'])
+                    if logger:
+                        logger.debug(f"镜像测速失败: {mirror['name']}: {e}")
+
+        if logger and fastest:
+            logger.info(f"最快的更新镜像: {fastest['name']}")
+        return fastest
+
+    def snapshot(self) -> dict:
+        """测速统计快照（用于持久化）"""
+        with self._lock:
+            return {name: dict(stat) for name, stat in self.stats.items()}
 
 
 class Updater:
@@ -26,10 +170,50 @@ class Updater:
     
     # 下载URL模板
     DOWNLOAD_URL_TEMPLATE = f"https://gitee.com/{REPO_OWNER}/{REPO_NAME}/releases/download/{{tag}}/pyQuickStart.exe"
+
+    # 版本信息本地缓存（ETag/Last-Modified 条件请求）
+    CACHE_FILE = "update_cache.json"
+    CACHE_TTL_SECONDS = 3600
+
+    # 后台检查调度
+    CHECK_INTERVAL_SECONDS = 6 * 3600
+    CHECK_JITTER_RATIO = 0.1
+    RETRY_BASE_SECONDS = 60
+
+    # 分段并行下载
+    SEGMENT_COUNT = 4
+    SEGMENT_MIN_SIZE = 1024 * 1024
+    SEGMENT_RETRIES = 3
     
-    def __init__(self):
+    def __init__(self, mirrors: Optional[List[dict]] = None):
+        """
+        Args:
+            mirrors: 额外的更新镜像（来自配置文件），与内置的 Gitee 源一起参与测速
+        """
         self.logger = Logger()
         self.current_version = self._load_local_version()
+
+        # 持久会话，复用 TCP/TLS 连接
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=8)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+
+        self._cache_lock = threading.Lock()
+        self._cache = self._load_cache()
+
+        cached_mirrors = self._cache.get('mirrors')
+        self.mirror_selector = MirrorSelector(
+            (mirrors or []) + [self._default_mirror()]
+            + (cached_mirrors if isinstance(cached_mirrors, list) else []),
+            self._cache.get('mirror_stats')
+        )
+
+        self._scheduler_thread = None
+        self._scheduler_stop = threading.Event()
+        self._consecutive_failures = 0
+        self.last_result: Optional[Tuple[bool, Optional[dict]]] = None
+        self.last_download_stats: Optional[dict] = None
         
     def _load_local_version(self) -> str:
         """加载本地版本号"""
@@ -53,56 +237,237 @@ class Updater:
             # 开发环境
             return Path(__file__).parent / 'version.json'
     
-    def check_update(self) -> Tuple[bool, Optional[dict]]:
+    def _default_mirror(self) -> dict:
+        """内置的 Gitee 更新源"""
+        return {
+            'name': 'gitee',
+            'version_url': self.VERSION_URL,
+            'download_url': self.DOWNLOAD_URL_TEMPLATE,
+        }
+
+    def _load_cache(self) -> dict:
+        """加载版本信息缓存"""
+        try:
+            cache_file = Path(self.CACHE_FILE)
+            if cache_file.exists():
+                with open(cache_file, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                if isinstance(data, dict):
+                    return data
+        except Exception as e:
+            self.logger.warning(f"读取更新缓存失败: {e}")
+        return {}
+
+    def _save_cache(self):
+        """保存版本信息缓存（调用方持有 _cache_lock）"""
+        try:
+            self._cache['mirror_stats'] = self.mirror_selector.snapshot()
+            tmp_file = Path(self.CACHE_FILE + '.tmp')
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                json.dump(self._cache, f, ensure_ascii=False, indent=2)
+            os.replace(tmp_file, self.CACHE_FILE)
+        except Exception as e:
+            self.logger.warning(f"保存更新缓存失败: {e}")
+
+    def _fetch_manifest(self, force: bool = False) -> dict:
+        """
+        获取远程 version.json
+
+        缓存未过期时直接返回缓存；过期后按测速排名依次尝试各镜像，
+        对上次成功的镜像带 If-None-Match / If-Modified-Since 重新验证，
+        服务器返回 304 时沿用缓存内容。
+        """
+        with self._cache_lock:
+            cache = self._cache
+            age = time.time() - cache.get('fetched_at', 0)
+            if not force and isinstance(cache.get('manifest'), dict) and age < self.CACHE_TTL_SECONDS:
+                self.logger.debug(f"使用缓存的版本信息 ({int(age)} 秒前获取)")
+                return cache['manifest']
+
+        if self.mirror_selector.needs_probe():
+            self.mirror_selector.probe(self.session, self.logger)
+
+        # 只在读取和替换缓存时持锁，网络请求在锁外进行：
+        # 后台检查正在请求时，手动检查更新不会排在它后面等待各镜像超时
+        with self._cache_lock:
+            cache = dict(self._cache)
+
+        last_error = None
+        for mirror in self.mirror_selector.ranked():
+            version_url = mirror['version_url']
+            headers = {}
+            if isinstance(cache.get('manifest'), dict) and cache.get('source_url') == version_url:
+                if cache.get('etag'):
+                    headers['If-None-Match'] = cache['etag']
+                if cache.get('last_modified'):
+                    headers['If-Modified-Since'] = cache['last_modified']
+
+            try:
+                response = self.session.get(version_url, headers=headers, timeout=10)
+                if response.status_code == 304:
+                    self.mirror_selector.record_success(mirror['name'], response.elapsed.total_seconds())
+                    self.logger.info(f"版本信息未变化 (304, {mirror['name']})，沿用缓存")
+                    with self._cache_lock:
+                        # 请求期间另一次检查可能已换入新内容，只在验证的仍是同一份缓存时续期
+                        if (self._cache.get('etag') == cache.get('etag')
+                                and self._cache.get('source_url') == version_url):
+                            self._cache['fetched_at'] = time.time()
+                            self._save_cache()
+                    return cache['manifest']
+
+                response.raise_for_status()
+                manifest = response.json()
+                if not isinstance(manifest, dict):
+                    raise ValueError("version.json 格式无效")
+            except (requests.RequestException, ValueError) as e:
+                self.mirror_selector.record_failure(mirror['name'])
+                self.logger.warning(f"从镜像 {mirror['name']} 获取版本信息失败: {e}")
+                last_error = e
+                continue
+
+            self.mirror_selector.record_success(mirror['name'], response.elapsed.total_seconds())
+            if self.mirror_selector.merge(manifest.get('mirrors')):
+                self.logger.info("已从 version.json 获取新的更新镜像")
+            with self._cache_lock:
+                self._cache = {
+                    'manifest': manifest,
+                    'source_url': version_url,
+                    'etag': response.headers.get('ETag'),
+                    'last_modified': response.headers.get('Last-Modified'),
+                    'fetched_at': time.time(),
+                    'mirrors': [m for m in manifest.get('mirrors', []) if isinstance(m, dict)]
+                               if isinstance(manifest.get('mirrors'), list) else [],
+                }
+                self._save_cache()
+            return manifest
+
+        if last_error is None:
+            raise requests.RequestException("没有可用的更新镜像")
+        raise last_error
+
+    def check_update(self, force: bool = False) -> Tuple[bool, Optional[dict]]:
         """
         检查是否有新版本
         
+        Args:
+            force: 忽略缓存有效期，立即向服务器重新验证
+
         Returns:
             (has_update, version_info)
             has_update: 是否有更新
             version_info: 版本信息字典，包含 version, download_url, changelog 等
         """
         try:
-            self.logger.info(f"检查更新: 当前版本 {self.current_version}")
-            
-            # 请求版本信息
-            response = requests.get(self.VERSION_URL, timeout=10)
-            response.raise_for_status()
-            
-            remote_info = response.json()
-            remote_version = remote_info.get('version', '1.0.0')
-            
-            self.logger.info(f"远程版本: {remote_version}")
-            
-            # 比较版本号
-            if self._compare_version(remote_version, self.current_version) > 0:
-                # 构建下载URL
-                download_url = remote_info.get('download_url')
-                if not download_url:
-                    # 如果没有指定下载URL，使用默认模板
-                    tag = f"v{remote_version}"
-                    download_url = self.DOWNLOAD_URL_TEMPLATE.format(tag=tag)
-                
-                version_info = {
-                    'version': remote_version,
-                    'download_url': download_url,
-                    'changelog': remote_info.get('changelog', ''),
-                    'build_date': remote_info.get('build_date', ''),
-                    'description': remote_info.get('description', '')
-                }
-                
-                self.logger.info(f"发现新版本: {remote_version}")
-                return True, version_info
-            else:
-                self.logger.info("当前已是最新版本")
-                return False, None
-                
+            return self._check_update(force)
         except requests.RequestException as e:
             self.logger.error(f"检查更新失败（网络错误）: {e}")
             return False, None
         except Exception as e:
             self.logger.error(f"检查更新失败: {e}")
             return False, None
+
+    def _check_update(self, force: bool = False) -> Tuple[bool, Optional[dict]]:
+        """检查更新，失败时抛出异常（供后台调度区分失败与无更新）"""
+        self.logger.info(f"检查更新: 当前版本 {self.current_version}")
+
+        remote_info = self._fetch_manifest(force)
+        remote_version = remote_info.get('version', '1.0.0')
+
+        self.logger.info(f"远程版本: {remote_version}")
+
+        # 比较版本号
+        if self._compare_version(remote_version, self.current_version) > 0:
+            # 构建下载URL
+            download_url = remote_info.get('download_url')
+            if not download_url:
+                # 如果没有指定下载URL，使用默认模板
+                tag = f"v{remote_version}"
+                download_url = self.DOWNLOAD_URL_TEMPLATE.format(tag=tag)
+
+            version_info = {
+                'version': remote_version,
+                'download_url': download_url,
+                'download_sources': self._download_sources(remote_version, download_url),
+                'changelog': remote_info.get('changelog', ''),
+                'build_date': remote_info.get('build_date', ''),
+                'description': remote_info.get('description', ''),
+                'sha256': remote_info.get('sha256', ''),
+                'size': remote_info.get('size'),
+                'patches': remote_info.get('patches', [])
+            }
+
+            self.logger.info(f"发现新版本: {remote_version}")
+            self.last_result = (True, version_info)
+            return True, version_info
+        else:
+            self.logger.info("当前已是最新版本")
+            self.last_result = (False, None)
+            return False, None
+
+    def _download_sources(self, version: str, download_url: str) -> List[dict]:
+        """按镜像排名生成下载地址列表，version.json 指定的地址作为兜底"""
+        tag = f"v{version}"
+        sources = []
+        seen = set()
+        for mirror in self.mirror_selector.ranked():
+            template = mirror.get('download_url')
+            if not template:
+                continue
+            try:
+                url = template.format(tag=tag, version=version)
+            except (KeyError, IndexError, ValueError):
+                continue
+            if url not in seen:
+                sources.append({'name': mirror['name'], 'url': url})
+                seen.add(url)
+        if download_url not in seen:
+            sources.append({'name': 'version.json', 'url': download_url})
+        return sources
+
+    def start_background_checks(self, on_update_found: Callable[[dict], None] = None,
+                                initial_delay: float = 30):
+        """
+        启动后台定时检查
+
+        按 CHECK_INTERVAL_SECONDS 加随机抖动调度，避免大量客户端同时请求；
+        失败时指数退避重试，最长不超过正常检查间隔。
+        """
+        if self._scheduler_thread is not None and self._scheduler_thread.is_alive():
+            return
+
+        self._scheduler_stop.clear()
+
+        def _run():
+            delay = initial_delay * random.uniform(0.5, 1.5)
+            while not self._scheduler_stop.wait(delay):
+                try:
+                    has_update, version_info = self._check_update()
+                    self._consecutive_failures = 0
+                    if has_update and on_update_found:
+                        on_update_found(version_info)
+                    delay = self._jittered(self.CHECK_INTERVAL_SECONDS)
+                except Exception as e:
+                    self._consecutive_failures += 1
+                    backoff = min(self.RETRY_BASE_SECONDS * (2 ** (self._consecutive_failures - 1)),
+                                  self.CHECK_INTERVAL_SECONDS)
+                    delay = self._jittered(backoff)
+                    self.logger.warning(
+                        f"后台检查更新失败 (连续 {self._consecutive_failures} 次): {e}，"
+                        f"{int(delay)} 秒后重试"
+                    )
+
+        self._scheduler_thread = threading.Thread(target=_run, daemon=True, name="UpdateScheduler")
+        self._scheduler_thread.start()
+        self.logger.info("后台更新检查已启动")
+
+    def stop_background_checks(self):
+        """停止后台定时检查"""
+        self._scheduler_stop.set()
+        self._scheduler_thread = None
+
+    def _jittered(self, seconds: float) -> float:
+        """在 ±CHECK_JITTER_RATIO 范围内加随机抖动"""
+        return seconds * random.uniform(1 - self.CHECK_JITTER_RATIO, 1 + self.CHECK_JITTER_RATIO)
     
     def _compare_version(self, v1: str, v2: str) -> int:
         """
@@ -135,7 +500,9 @@ class Updater:
     def download_update(self, version_info: dict, progress_callback=None) -> Tuple[bool, str]:
         """
         下载更新
-        
+
+        优先尝试针对当前版本的增量补丁，失败时自动回退到完整下载。
+
         Args:
             version_info: 版本信息
             progress_callback: 进度回调函数 callback(downloaded, total)
@@ -146,28 +513,107 @@ class Updater:
         download_url = version_info.get('download_url')
         if not download_url:
             return False, "下载URL不存在"
-        
+
+        temp_file = os.path.join(tempfile.gettempdir(), 'pyQuickStart_new.exe')
+
+        patch = self._find_patch(version_info)
+        if patch:
+            success, result = self._download_delta(patch, version_info, temp_file, progress_callback)
+            if success:
+                return True, result
+            self.logger.warning(f"增量更新失败，回退到完整下载: {result}")
+
+        sources = version_info.get('download_sources') or [{'name': 'version.json', 'url': download_url}]
+        return self._download_full(sources, version_info, temp_file, progress_callback)
+
+    def _find_patch(self, version_info: dict) -> Optional[dict]:
+        """查找适用于当前安装版本的增量补丁"""
+        if not getattr(sys, 'frozen', False):
+            # 开发环境没有可打补丁的 exe
+            return None
+        if not version_info.get('sha256'):
+            # 没有完整文件的哈希就无法验证补丁结果
+            return None
+        for patch in version_info.get('patches') or []:
+            if not isinstance(patch, dict):
+                continue
+            if patch.get('from_version') == self.current_version and patch.get('url') and patch.get('sha256'):
+                return patch
+        return None
+
+    def _download_delta(self, patch: dict, version_info: dict, temp_file: str,
+                        progress_callback=None) -> Tuple[bool, str]:
+        """下载增量补丁并流式应用到当前 exe"""
+        patch_url = patch['url']
         try:
-            self.logger.info(f"开始下载: {download_url}")
-            
-            # 创建临时文件
-            temp_dir = tempfile.gettempdir()
-            temp_file = os.path.join(temp_dir, 'pyQuickStart_new.exe')
-            
-            # 下载文件
-            response = requests.get(download_url, stream=True, timeout=30)
-            response.raise_for_status()
-            
-            total_size = int(response.headers.get('content-length', 0))
-            downloaded = 0
-            
-            with open(temp_file, 'wb') as f:
-                for chunk in response.iter_content(chunk_size=8192):
-                    if chunk:
-                        f.write(chunk)
-                        downloaded += len(chunk)
-                        if progress_callback:
-                            progress_callback(downloaded, total_size)
+            self.logger.info(f"开始增量下载: {patch_url} (基于 v{self.current_version})")
+
+            with self.session.get(patch_url, stream=True, timeout=30) as response:
+                response.raise_for_status()
+
+                total_size = int(response.headers.get('content-length', 0) or patch.get('size') or 0)
+                downloaded = 0
+
+                with open(sys.executable, 'rb') as old_file, open(temp_file, 'wb') as out_file:
+                    patcher = DeltaPatcher(old_file, out_file)
+                    for chunk in response.iter_content(chunk_size=8192):
+                        if chunk:
+                            patcher.feed(chunk)
+                            downloaded += len(chunk)
+                            if progress_callback:
+                                progress_callback(downloaded, total_size)
+                    patcher.finish(
+                        expected_patch_sha256=patch.get('sha256'),
+                        expected_output_sha256=version_info.get('sha256'),
+                        expected_output_size=version_info.get('size'),
+                    )
+
+            self.logger.info(
+                f"增量更新完成: 下载 {patcher.patch_bytes // 1024} KB，"
+                f"生成 {patcher.output_bytes // 1024} KB -> {temp_file}"
+            )
+            return True, temp_file
+
+        except (requests.RequestException, PatchError, OSError) as e:
+            self._remove_file(temp_file)
+            return False, str(e)
+        except Exception as e:
+            self.logger.error(f"增量更新出现未预期的错误: {e}", exc_info=True)
+            self._remove_file(temp_file)
+            return False, str(e)
+
+    def _download_full(self, sources: List[dict], version_info: dict, temp_file: str,
+                       progress_callback=None) -> Tuple[bool, str]:
+        """
+        完整下载新版 exe
+
+        sources 为按优先级排列的下载源 [{'name', 'url'}]。服务器支持 Range 时
+        分段并行下载；任一来源中途失败时切换到下一个来源，从已下载位置继续。
+        """
+        try:
+            self.logger.info(f"开始下载: {sources[0]['url']}")
+            started = time.perf_counter()
+
+            total_size, ranged_sources = self._probe_range_support(sources)
+            segments = None
+            if ranged_sources and total_size >= self.SEGMENT_MIN_SIZE * 2:
+                try:
+                    segments = self._download_segmented(ranged_sources, total_size, temp_file, progress_callback)
+                except Exception as e:
+                    self.logger.warning(f"分段下载失败，改用单连接下载: {e}")
+                    segments = None
+            if segments is None:
+                self._download_stream(sources, temp_file, progress_callback)
+
+            elapsed = time.perf_counter() - started
+            size = os.path.getsize(temp_file)
+            self._record_download_stats(size, elapsed, segments)
+
+            expected_sha256 = version_info.get('sha256')
+            if expected_sha256 and file_sha256(temp_file) != expected_sha256.lower():
+                self._remove_file(temp_file)
+                self.logger.error("下载失败: 文件 SHA256 校验失败")
+                return False, "下载文件校验失败，请重试"
             
             self.logger.info(f"下载完成: {temp_file}")
             return True, temp_file
@@ -175,6 +621,191 @@ class Updater:
         except Exception as e:
             self.logger.error(f"下载失败: {e}")
             return False, str(e)
+
+    def _probe_range_support(self, sources: List[dict]) -> Tuple[int, List[dict]]:
+        """
+        探测文件大小和 Range 支持
+
+        Returns:
+            (文件大小, 支持 Range 且大小一致的下载源列表，URL 为跟随重定向后的地址)
+        """
+        total_size = 0
+        ranged = []
+        for source in sources:
+            try:
+                response = self.session.head(source['url'], allow_redirects=True, timeout=10)
+                response.raise_for_status()
+                size = int(response.headers.get('content-length', 0))
+            except (requests.RequestException, ValueError) as e:
+                self.mirror_selector.record_failure(source['name'])
+                self.logger.debug(f"探测下载源失败 {source['name']}: {e}")
+                continue
+            if not total_size:
+                total_size = size
+            if (size == total_size and size > 0
+                    and response.headers.get('accept-ranges', '').lower() == 'bytes'):
+                ranged.append({'name': source['name'], 'url': response.url})
+        return total_size, ranged
+
+    def _download_stream(self, sources: List[dict], temp_file: str, progress_callback=None):
+        """单连接流式下载，来源失败时带 Range 从断点切换到下一个来源"""
+        downloaded = 0
+        total_size = 0
+        last_error = None
+
+        with open(temp_file, 'wb') as f:
+            for source in sources:
+                headers = {'Range': f"bytes={downloaded}-"} if downloaded else {}
+                try:
+                    with self.session.get(source['url'], headers=headers, stream=True, timeout=30) as response:
+                        response.raise_for_status()
+                        if downloaded and response.status_code != 206:
+                            # 来源不支持断点续传，只能从头开始
+                            self.logger.info(f"下载源 {source['name']} 不支持断点续传，从头下载")
+                            f.seek(0)
+                            f.truncate()
+                            downloaded = 0
+                        if not total_size or not downloaded:
+                            total_size = downloaded + int(response.headers.get('content-length', 0))
+
+                        for chunk in response.iter_content(chunk_size=8192):
+                            if chunk:
+                                f.write(chunk)
+                                downloaded += len(chunk)
+                                if progress_callback:
+                                    progress_callback(downloaded, total_size)
+                        if total_size and downloaded < total_size:
+                            raise requests.RequestException(f"连接提前结束 ({downloaded}/{total_size} 字节)")
+                        return
+                except requests.RequestException as e:
+                    self.mirror_selector.record_failure(source['name'])
+                    self.logger.warning(f"下载源 {source['name']} 中断 (已下载 {downloaded} 字节): {e}")
+                    last_error = e
+
+        raise last_error or RuntimeError("没有可用的下载源")
+
+    def _download_segmented(self, sources: List[dict], total_size: int, temp_file: str,
+                            progress_callback=None) -> List[dict]:
+        """
+        分段并行下载
+
+        预分配目标文件，各分段按偏移写入；单个分段失败时切换到下一个下载源，
+        从该分段已下载的位置独立重试。进度回调始终在调用线程中执行。
+
+        Returns:
+            各分段的统计信息列表
+        """
+        segment_count = max(1, min(self.SEGMENT_COUNT, total_size // self.SEGMENT_MIN_SIZE))
+        segment_size = total_size // segment_count
+        max_attempts = self.SEGMENT_RETRIES + len(sources) - 1
+        segments = []
+        for index in range(segment_count):
+            start = index * segment_size
+            end = total_size - 1 if index == segment_count - 1 else start + segment_size - 1
+            segments.append({'index': index, 'start': start, 'end': end,
+                             'downloaded': 0, 'attempts': 0, 'seconds': 0.0, 'sources': []})
+
+        # 预分配文件
+        with open(temp_file, 'wb') as f:
+            f.truncate(total_size)
+
+        progress_lock = threading.Lock()
+        abort = threading.Event()
+
+        def _fetch(segment: dict):
+            segment_started = time.perf_counter()
+            length = segment['end'] - segment['start'] + 1
+            last_error = None
+            source_index = 0
+            while (segment['downloaded'] < length and segment['attempts'] < max_attempts
+                   and not abort.is_set()):
+                segment['attempts'] += 1
+                source = sources[source_index % len(sources)]
+                segment['sources'].append(source['name'])
+                offset = segment['start'] + segment['downloaded']
+                try:
+                    with self.session.get(
+                        source['url'], headers={'Range': f"bytes={offset}-{segment['end']}"},
+                        stream=True, timeout=30
+                    ) as response:
+                        response.raise_for_status()
+                        if response.status_code != 206:
+                            raise requests.RequestException(f"服务器未返回分段内容 (HTTP {response.status_code})")
+                        with open(temp_file, 'r+b') as f:
+                            f.seek(offset)
+                            for chunk in response.iter_content(chunk_size=65536):
+                                if not chunk:
+                                    continue
+                                chunk = chunk[:length - segment['downloaded']]
+                                f.write(chunk)
+                                with progress_lock:
+                                    segment['downloaded'] += len(chunk)
+                                if segment['downloaded'] >= length or abort.is_set():
+                                    break
+                except (requests.RequestException, OSError) as e:
+                    last_error = e
+                    self.mirror_selector.record_failure(source['name'])
+                    self.logger.warning(
+                        f"分段 {segment['index']} 从 {source['name']} 第 {segment['attempts']} 次下载中断 "
+                        f"(已完成 {segment['downloaded']}/{length} 字节): {e}"
+                    )
+                    # 换下一个来源，从断点继续
+                    source_index += 1
+            segment['seconds'] = time.perf_counter() - segment_started
+            if segment['downloaded'] < length:
+                abort.set()
+                raise RuntimeError(f"分段 {segment['index']} 下载失败: {last_error}")
+
+        with ThreadPoolExecutor(max_workers=segment_count, thread_name_prefix="UpdateSegment") as executor:
+            pending = {executor.submit(_fetch, segment) for segment in segments}
+            while pending:
+                done, pending = wait(pending, timeout=0.1, return_when=FIRST_EXCEPTION)
+                for future in done:
+                    future.result()
+                if progress_callback:
+                    with progress_lock:
+                        downloaded = sum(segment['downloaded'] for segment in segments)
+                    progress_callback(downloaded, total_size)
+
+        if os.path.getsize(temp_file) != total_size:
+            raise RuntimeError("分段下载后文件大小不符")
+        return segments
+
+    def _record_download_stats(self, size: int, elapsed: float, segments: Optional[List[dict]]):
+        """记录并输出下载吞吐量统计"""
+        throughput = size / elapsed if elapsed > 0 else 0.0
+        stats = {
+            'bytes': size,
+            'seconds': elapsed,
+            'throughput': throughput,
+            'segmented': segments is not None,
+            'segments': [
+                {key: segment[key] for key in ('index', 'start', 'end', 'attempts', 'seconds', 'sources')}
+                for segment in segments or []
+            ],
+        }
+        self.last_download_stats = stats
+
+        mode = f"{len(segments)} 段并行" if segments else "单连接"
+        self.logger.info(
+            f"下载统计: {size // 1024} KB，用时 {elapsed:.2f} 秒，"
+            f"{throughput / 1024:.1f} KB/s ({mode})"
+        )
+        for segment in stats['segments']:
+            seg_size = segment['end'] - segment['start'] + 1
+            seg_rate = seg_size / segment['seconds'] if segment['seconds'] > 0 else 0.0
+            self.logger.info(
+                f"  分段 {segment['index']}: {seg_size // 1024} KB，{segment['seconds']:.2f} 秒，"
+                f"{seg_rate / 1024:.1f} KB/s，尝试 {segment['attempts']} 次 ({' -> '.join(segment['sources'])})"
+            )
+
+    def _remove_file(self, path: str):
+        """删除临时文件，忽略错误"""
+        try:
+            if os.path.exists(path):
+                os.remove(path)
+        except OSError:
+            pass
     
     def apply_update(self, new_exe_path: str) -> Tuple[bool, str]:
         """
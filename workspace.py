@@ -0,0 +1,206 @@
+"""
+工作区模块
+一个快捷键并发启动多个目标，支持依赖顺序和延迟
+"""
+import time
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from typing import Callable, Dict, List, Optional
+from logger import Logger
+
+BINDING_TYPE_WORKSPACE = "workspace"
+
+
+class WorkspaceTarget:
+    """工作区中的单个目标"""
+
+    __slots__ = ('id', 'path', 'after', 'delay_ms', 'focus_existing')
+
+    def __init__(self, target_id: str, path: str, after: Optional[List[str]] = None,
+                 delay_ms: float = 0, focus_existing: bool = False):
+        self.id = target_id
+        self.path = path
+        self.after = list(after or [])
+        self.delay_ms = max(0.0, float(delay_ms))
+        self.focus_existing = bool(focus_existing)
+
+    def to_config(self) -> Dict:
+        data = {"id": self.id, "path": self.path}
+        if self.after:
+            data["after"] = list(self.after)
+        if self.delay_ms:
+            data["delay_ms"] = self.delay_ms
+        if self.focus_existing:
+            data["focus_existing"] = True
+        return data
+
+
+class Workspace:
+    """
+    一组目标
+
+    配置格式:
+        {"type": "workspace", "name": "早晨",
+         "targets": [{"id": "ide", "path": "..."},
+                     {"path": "...", "after": ["ide"], "delay_ms": 500}]}
+    没有写 id 的目标使用其序号（从 0 开始）作为 id。
+    """
+
+    def __init__(self, name: str, targets: List[WorkspaceTarget], max_workers: int = 0):
+        self.name = name
+        self.targets = targets
+        self.max_workers = max_workers
+        self._validate()
+
+    @classmethod
+    def from_config(cls, data: Dict) -> 'Workspace':
+        """从配置字典创建，格式错误时抛出 ValueError"""
+        raw_targets = data.get("targets")
+        if not isinstance(raw_targets, list) or not raw_targets:
+            raise ValueError("工作区至少需要一个目标")
+        targets = []
+        for i, raw in enumerate(raw_targets):
+            if isinstance(raw, str):
+                raw = {"path": raw}
+            if not isinstance(raw, dict) or not isinstance(raw.get("path"), str):
+                raise ValueError(f"工作区目标 #{i} 缺少 path")
+            after = raw.get("after", [])
+            if isinstance(after, (str, int)):
+                after = [after]
+            try:
+                delay_ms = float(raw.get("delay_ms", 0))
+            except (TypeError, ValueError):
+                raise ValueError(f"工作区目标 #{i} 的 delay_ms 无效")
+            targets.append(WorkspaceTarget(
+                str(raw.get("id", i)), raw["path"], [str(dep) for dep in after],
+                delay_ms, raw.get("focus_existing", False)
+            ))
+        try:
+            max_workers = int(data.get("max_workers", 0))
+        except (TypeError, ValueError):
+            max_workers = 0
+        return cls(str(data.get("name", "")), targets, max_workers)
+
+    def to_config(self) -> Dict:
+        data = {"type": BINDING_TYPE_WORKSPACE, "targets": [t.to_config() for t in self.targets]}
+        if self.name:
+            data["name"] = self.name
+        if self.max_workers:
+            data["max_workers"] = self.max_workers
+        return data
+
+    def describe(self) -> str:
+        """列表中显示的摘要"""
+        title = self.name or "工作区"
+        return f"{title}（{len(self.targets)} 个目标）"
+
+    def _validate(self):
+        """检查 id 重复、未知依赖和循环依赖"""
+        ids = [t.id for t in self.targets]
+        if len(set(ids)) != len(ids):
+            raise ValueError("工作区目标 id 重复")
+        known = set(ids)
+        for target in self.targets:
+            for dep in target.after:
+                if dep not in known:
+                    raise ValueError(f"工作区目标 {target.id} 依赖了不存在的目标 {dep}")
+        # Kahn 拓扑排序检测环
+        remaining = {t.id: set(t.after) for t in self.targets}
+        while remaining:
+            ready = [tid for tid, deps in remaining.items() if not deps]
+            if not ready:
+                raise ValueError(f"工作区目标存在循环依赖: {', '.join(sorted(remaining))}")
+            for tid in ready:
+                del remaining[tid]
+            for deps in remaining.values():
+                deps.difference_update(ready)
+
+
+class WorkspaceLauncher:
+    """
+    用线程池并发启动工作区目标
+
+    目标在其依赖全部启动完成后才提交，delay_ms 从依赖完成（没有依赖时从
+    工作区开始）算起。launch_fn(target, hotkey) 返回启动结果字符串。
+    """
+
+    DEFAULT_MAX_WORKERS = 8
+
+    def __init__(self, launch_fn: Callable[[WorkspaceTarget, object], str]):
+        self.logger = Logger()
+        self._launch_fn = launch_fn
+
+    def run(self, workspace: Workspace, hotkey=None) -> Dict:
+        """启动整个工作区，返回汇总的耗时报告"""
+        started = time.perf_counter()
+        targets = {t.id: t for t in workspace.targets}
+        pending = {t.id: set(t.after) for t in workspace.targets}
+        results: Dict[str, Dict] = {}
+
+        workers = workspace.max_workers or min(self.DEFAULT_MAX_WORKERS, len(targets))
+        with ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="Workspace") as executor:
+            running = {}
+
+            def submit_ready():
+                for tid in [tid for tid, deps in pending.items() if not deps]:
+                    del pending[tid]
+                    target = targets[tid]
+                    dep_done = max((results[dep]['finished_ms'] for dep in target.after), default=0.0)
+                    future = executor.submit(self._run_target, target, hotkey, started, dep_done)
+                    running[future] = tid
+
+            submit_ready()
+            while running:
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    tid = running.pop(future)
+                    results[tid] = future.result()
+                    for deps in pending.values():
+                        deps.discard(tid)
+                submit_ready()
+
+        total_ms = (time.perf_counter() - started) * 1000
+        ordered = [results[t.id] for t in workspace.targets if t.id in results]
+        sequential_ms = sum(r['duration_ms'] + targets[r['id']].delay_ms for r in ordered)
+        report = {
+            'name': workspace.name,
+            'total_ms': total_ms,
+            'sequential_ms': sequential_ms,
+            'targets': ordered,
+        }
+        self._log_report(report)
+        return report
+
+    def _run_target(self, target: WorkspaceTarget, hotkey, started: float, dep_done_ms: float) -> Dict:
+        # 延迟从依赖完成时刻算起
+        wait_until = started + (dep_done_ms + target.delay_ms) / 1000
+        delay = wait_until - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+
+        begin_ms = (time.perf_counter() - started) * 1000
+        try:
+            outcome = self._launch_fn(target, hotkey)
+        except Exception as e:
+            self.logger.error(f"工作区目标启动失败 {target.path}: {e}")
+            outcome = "error"
+        finished_ms = (time.perf_counter() - started) * 1000
+        return {
+            'id': target.id,
+            'path': target.path,
+            'started_ms': begin_ms,
+            'finished_ms': finished_ms,
+            'duration_ms': finished_ms - begin_ms,
+            'outcome': outcome,
+        }
+
+    def _log_report(self, report: Dict):
+        lines = [
+            f"工作区 {report['name'] or ''} 启动完成: 总耗时 {report['total_ms']:.0f} ms"
+            f"（依次启动约需 {report['sequential_ms']:.0f} ms）"
+        ]
+        for r in report['targets']:
+            lines.append(
+                f"  [{r['id']}] {r['path']}: {r['outcome']}，"
+                f"开始 +{r['started_ms']:.0f} ms，用时 {r['duration_ms']:.0f} ms"
+            )
+        self.logger.info("\n".join(lines))